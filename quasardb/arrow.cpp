@@ -0,0 +1,691 @@
+#include "arrow.hpp"
+#include "error.hpp"
+#include "query.hpp"
+#include "traits.hpp"
+#include "utils.hpp"
+#include "convert/value.hpp"
+#include <cassert>
+#include <cstring>
+#include <memory>
+#include <sstream>
+
+namespace qdb::arrow
+{
+
+namespace detail
+{
+
+// Data buffers may only be null when empty; this is what empty buffers point to.
+static std::int64_t const empty_buffer_ = 0;
+
+static inline void const * buffer_of(void const * p) noexcept
+{
+    return p == nullptr ? static_cast<void const *>(&empty_buffer_) : p;
+}
+
+/**
+ * Children are owned by their parent, and are released together with it.
+ */
+static void release_child_schema(ArrowSchema * schema)
+{
+    schema->release = nullptr;
+}
+
+static void release_child_array(ArrowArray * array)
+{
+    array->release = nullptr;
+}
+
+/**
+ * Everything a record batch refers to. Shared by the exported schema and array, which
+ * are released independently.
+ */
+struct exported_batch
+{
+    explicit exported_batch(std::vector<column> && columns_)
+        : columns{std::move(columns_)}
+        , schemas(columns.size())
+        , arrays(columns.size())
+    {
+        for (std::size_t i = 0; i < columns.size(); ++i)
+        {
+            columns[i].export_to(schemas[i], arrays[i]);
+            schema_ptrs.push_back(&schemas[i]);
+            array_ptrs.push_back(&arrays[i]);
+        }
+    }
+
+    std::vector<column> columns;
+
+    std::vector<ArrowSchema> schemas;
+    std::vector<ArrowSchema *> schema_ptrs;
+
+    std::vector<ArrowArray> arrays;
+    std::vector<ArrowArray *> array_ptrs;
+
+    // A struct array does not have any buffers except its (optional) validity bitmap
+    const void * buffers[1] = {nullptr};
+};
+
+using exported_batch_ptr = std::shared_ptr<exported_batch>;
+
+static void release_schema(ArrowSchema * schema)
+{
+    for (std::int64_t i = 0; i < schema->n_children; ++i)
+    {
+        if (schema->children[i]->release != nullptr)
+        {
+            schema->children[i]->release(schema->children[i]);
+        }
+    }
+
+    delete static_cast<exported_batch_ptr *>(schema->private_data);
+    schema->release = nullptr;
+}
+
+static void release_array(ArrowArray * array)
+{
+    for (std::int64_t i = 0; i < array->n_children; ++i)
+    {
+        if (array->children[i]->release != nullptr)
+        {
+            array->children[i]->release(array->children[i]);
+        }
+    }
+
+    delete static_cast<exported_batch_ptr *>(array->private_data);
+    array->release = nullptr;
+}
+
+static py::module_ import_pyarrow()
+{
+    return py::module_::import("pyarrow");
+}
+
+template <typename T, typename From, typename Fn>
+column fixed_width_of(std::string name, std::string format, From const * xs, std::int64_t n, Fn && fn)
+{
+    column ret = column::fixed_width<T>(std::move(name), std::move(format), n);
+
+    for (std::int64_t i = 0; i < n; ++i)
+    {
+        if (traits::is_null(xs[i]))
+        {
+            ret.set_null(i);
+        }
+        else
+        {
+            ret.set<T>(i, fn(xs[i]));
+        }
+    }
+
+    return ret;
+}
+
+static inline std::int64_t timestamp_of(qdb_timespec_t const & x) noexcept
+{
+    return convert::value<qdb_timespec_t, std::int64_t>(x);
+}
+
+/**
+ * Returns the value of a query result point as the type of its column, see
+ * `query_column_types()`: int64 columns hold count values as well, double columns int64 and
+ * count values as well.
+ */
+template <query_column_type_t ColumnType>
+struct query_point;
+
+template <>
+struct query_point<query_column_double>
+{
+    static constexpr char const * format = "g";
+    using value_type                     = double;
+
+    static inline double get(qdb_point_result_t const & x) noexcept
+    {
+        switch (x.type)
+        {
+        case qdb_query_result_int64:
+            return static_cast<double>(x.payload.int64_.value);
+        case qdb_query_result_count:
+            return static_cast<double>(x.payload.count.value);
+        default:
+            return x.payload.double_.value;
+        }
+    }
+};
+
+template <>
+struct query_point<query_column_int64>
+{
+    static constexpr char const * format = "l";
+    using value_type                     = std::int64_t;
+
+    static inline std::int64_t get(qdb_point_result_t const & x) noexcept
+    {
+        return x.type == qdb_query_result_count ? static_cast<std::int64_t>(x.payload.count.value)
+                                                : x.payload.int64_.value;
+    }
+};
+
+template <>
+struct query_point<query_column_timestamp>
+{
+    static constexpr char const * format = "tsn:";
+    using value_type                     = std::int64_t;
+
+    static inline std::int64_t get(qdb_point_result_t const & x) noexcept
+    {
+        return timestamp_of(x.payload.timestamp.value);
+    }
+};
+
+template <query_column_type_t ColumnType>
+column query_fixed_width_of(qdb_query_result_t const & r, qdb_size_t j, std::string name)
+{
+    using point_type = query_point<ColumnType>;
+    using value_type = typename point_type::value_type;
+
+    auto n     = static_cast<std::int64_t>(r.row_count);
+    column ret = column::fixed_width<value_type>(name, point_type::format, n);
+
+    for (std::int64_t i = 0; i < n; ++i)
+    {
+        qdb_point_result_t const & x = r.rows[i][j];
+
+        if (x.type == qdb_query_result_none)
+        {
+            ret.set_null(i);
+        }
+        else
+        {
+            ret.set<value_type>(i, point_type::get(x));
+        }
+    }
+
+    return ret;
+}
+
+template <qdb_query_result_value_type_t ResultType>
+column query_variable_width_of(qdb_query_result_t const & r, qdb_size_t j, std::string name)
+{
+    auto n     = static_cast<std::int64_t>(r.row_count);
+    column ret = column::variable_width(name, (ResultType == qdb_query_result_string ? "U" : "Z"), n);
+
+    for (std::int64_t i = 0; i < n; ++i)
+    {
+        qdb_point_result_t const & x = r.rows[i][j];
+
+        if (x.type == qdb_query_result_none)
+        {
+            ret.set_null(i);
+        }
+        else
+        {
+            if constexpr (ResultType == qdb_query_result_string)
+            {
+                ret.append(i, x.payload.string.content, x.payload.string.content_length);
+            }
+            else
+            {
+                ret.append(i, x.payload.blob.content, x.payload.blob.content_length);
+            }
+        }
+    }
+
+    return ret;
+}
+
+/**
+ * Values of a list column of `n` values in total, as the type of the array result.
+ */
+template <qdb_query_result_value_type_t ResultType>
+column query_list_values(std::int64_t n)
+{
+    if constexpr (ResultType == qdb_query_result_array_int64)
+    {
+        return column::fixed_width<std::int64_t>("item", "l", n);
+    }
+    else if constexpr (ResultType == qdb_query_result_array_double)
+    {
+        return column::fixed_width<double>("item", "g", n);
+    }
+    else if constexpr (ResultType == qdb_query_result_array_timestamp)
+    {
+        return column::fixed_width<std::int64_t>("item", "tsn:", n);
+    }
+    else if constexpr (ResultType == qdb_query_result_array_string)
+    {
+        return column::variable_width("item", "U", n);
+    }
+    else
+    {
+        return column::variable_width("item", "Z", n);
+    }
+}
+
+static inline void set_list_value(column & xs, std::int64_t i, qdb_int_t x) noexcept
+{
+    xs.set<std::int64_t>(i, x);
+}
+
+static inline void set_list_value(column & xs, std::int64_t i, double x) noexcept
+{
+    xs.set<double>(i, x);
+}
+
+static inline void set_list_value(column & xs, std::int64_t i, qdb_timespec_t const & x) noexcept
+{
+    xs.set<std::int64_t>(i, timestamp_of(x));
+}
+
+static inline void set_list_value(column & xs, std::int64_t i, qdb_string_t const & x)
+{
+    xs.append(i, x.data, x.length);
+}
+
+static inline void set_list_value(column & xs, std::int64_t i, qdb_blob_t const & x)
+{
+    xs.append(i, x.content, x.content_length);
+}
+
+template <qdb_query_result_value_type_t ResultType>
+column query_list_of(qdb_query_result_t const & r, qdb_size_t j, std::string name)
+{
+    using array_type = query_array<ResultType>;
+
+    auto n = static_cast<std::int64_t>(r.row_count);
+
+    // The values are allocated up front, which requires their total amount.
+    std::int64_t m = 0;
+    for (std::int64_t i = 0; i < n; ++i)
+    {
+        qdb_point_result_t const & x = r.rows[i][j];
+
+        if (x.type != qdb_query_result_none)
+        {
+            m += static_cast<std::int64_t>(array_type::get(x).size());
+        }
+    }
+
+    column ret      = column::list(name, query_list_values<ResultType>(m), n);
+    column & values = ret.values();
+
+    std::int64_t k = 0;
+    for (std::int64_t i = 0; i < n; ++i)
+    {
+        qdb_point_result_t const & x = r.rows[i][j];
+
+        if (x.type == qdb_query_result_none)
+        {
+            ret.set_null(i);
+        }
+        else
+        {
+            auto xs = array_type::get(x);
+            for (auto const & v : xs)
+            {
+                set_list_value(values, k++, v);
+            }
+
+            ret.append_list(i, static_cast<std::int64_t>(xs.size()));
+        }
+    }
+
+    return ret;
+}
+
+} // namespace detail
+
+/* static */ column column::nulls(std::string name, std::int64_t length)
+{
+    column ret{std::move(name), "n", length};
+    ret.is_null_type_ = true;
+    ret.null_count_   = length;
+    return ret;
+}
+
+/* static */ column column::variable_width(std::string name, std::string format, std::int64_t length)
+{
+    column ret{std::move(name), std::move(format), length};
+    ret.is_variable_width_ = true;
+    ret.offsets_.assign(static_cast<std::size_t>(length) + 1, 0);
+    return ret;
+}
+
+/* static */ column column::list(std::string name, column && values, std::int64_t length)
+{
+    column ret{std::move(name), "+L", length};
+    ret.is_list_ = true;
+    ret.offsets_.assign(static_cast<std::size_t>(length) + 1, 0);
+    ret.children_.push_back(std::move(values));
+    return ret;
+}
+
+void column::append(std::int64_t i, void const * data, std::size_t n)
+{
+    assert(is_variable_width_);
+
+    char const * data_ = static_cast<char const *>(data);
+
+    values_.insert(values_.end(), data_, data_ + n);
+    offsets_[i + 1] = offsets_[i] + static_cast<std::int64_t>(n);
+}
+
+void column::append_list(std::int64_t i, std::int64_t n)
+{
+    assert(is_list_);
+
+    offsets_[i + 1] = offsets_[i] + n;
+}
+
+void column::set_null(std::int64_t i)
+{
+    if (validity_.empty())
+    {
+        // First null value: everything else is valid until proven otherwise.
+        validity_.assign((static_cast<std::size_t>(length_) + 7) / 8, 0xFF);
+    }
+
+    validity_[i / 8] &= static_cast<std::uint8_t>(~(1 << (i % 8)));
+    ++null_count_;
+
+    if (is_variable_width_ || is_list_)
+    {
+        offsets_[i + 1] = offsets_[i];
+    }
+}
+
+void column::export_to(ArrowSchema & schema, ArrowArray & array)
+{
+    schema.format       = format_.c_str();
+    schema.name         = name_.c_str();
+    schema.metadata     = nullptr;
+    schema.flags        = ARROW_FLAG_NULLABLE;
+    schema.n_children   = 0;
+    schema.children     = nullptr;
+    schema.dictionary   = nullptr;
+    schema.release      = &detail::release_child_schema;
+    schema.private_data = nullptr;
+
+    buffers_[0] = validity_.empty() ? nullptr : validity_.data();
+
+    if (is_null_type_)
+    {
+        array.n_buffers = 0;
+    }
+    else if (is_variable_width_)
+    {
+        array.n_buffers = 3;
+        buffers_[1]     = offsets_.data();
+        buffers_[2]     = detail::buffer_of(values_.data());
+    }
+    else if (is_list_)
+    {
+        array.n_buffers = 2;
+        buffers_[1]     = offsets_.data();
+    }
+    else
+    {
+        array.n_buffers = 2;
+        buffers_[1]     = detail::buffer_of(values_.data());
+    }
+
+    array.length       = length_;
+    array.null_count   = null_count_;
+    array.offset       = 0;
+    array.n_children   = 0;
+    array.buffers      = buffers_;
+    array.children     = nullptr;
+    array.dictionary   = nullptr;
+    array.release      = &detail::release_child_array;
+    array.private_data = nullptr;
+
+    if (is_list_)
+    {
+        // The values are owned by this column just like its own buffers.
+        children_.front().export_to(child_schema_, child_array_);
+        child_schema_ptr_ = &child_schema_;
+        child_array_ptr_  = &child_array_;
+
+        schema.n_children = 1;
+        schema.children   = &child_schema_ptr_;
+        array.n_children  = 1;
+        array.children    = &child_array_ptr_;
+    }
+}
+
+py::object record_batch(std::vector<column> && columns, std::int64_t length)
+{
+    py::module_ pyarrow = detail::import_pyarrow();
+
+    auto batch = std::make_shared<detail::exported_batch>(std::move(columns));
+
+    ArrowSchema schema{};
+    schema.format       = "+s";
+    schema.name         = "";
+    schema.metadata     = nullptr;
+    schema.flags        = 0;
+    schema.n_children   = static_cast<std::int64_t>(batch->schema_ptrs.size());
+    schema.children     = batch->schema_ptrs.data();
+    schema.dictionary   = nullptr;
+    schema.release      = &detail::release_schema;
+    schema.private_data = new detail::exported_batch_ptr{batch};
+
+    ArrowArray array{};
+    array.length       = length;
+    array.null_count   = 0;
+    array.offset       = 0;
+    array.n_buffers    = 1;
+    array.n_children   = static_cast<std::int64_t>(batch->array_ptrs.size());
+    array.buffers      = batch->buffers;
+    array.children     = batch->array_ptrs.data();
+    array.dictionary   = nullptr;
+    array.release      = &detail::release_array;
+    array.private_data = new detail::exported_batch_ptr{batch};
+
+    // pyarrow moves the structs: it takes over ownership and marks them as released. If
+    // the import fails, whatever it did not take over is still ours to release.
+    auto release = [&schema, &array]() {
+        if (schema.release != nullptr)
+        {
+            schema.release(&schema);
+        }
+
+        if (array.release != nullptr)
+        {
+            array.release(&array);
+        }
+    };
+
+    try
+    {
+        py::object ret = pyarrow.attr("RecordBatch")
+                             .attr("_import_from_c")(reinterpret_cast<std::uintptr_t>(&array),
+                                 reinterpret_cast<std::uintptr_t>(&schema));
+        release();
+        return ret;
+    }
+    catch (...)
+    {
+        release();
+        throw;
+    }
+}
+
+std::vector<column> columns_of(qdb_bulk_reader_table_data_t const & data)
+{
+    auto n = static_cast<std::int64_t>(data.row_count);
+
+    std::vector<column> ret;
+    ret.reserve(data.column_count + 1);
+
+    // The timestamp index, which never contains null values.
+    {
+        column idx = column::fixed_width<std::int64_t>("$timestamp", "tsn:", n);
+
+        for (std::int64_t i = 0; i < n; ++i)
+        {
+            idx.set<std::int64_t>(i, detail::timestamp_of(data.timestamps[i]));
+        }
+
+        ret.push_back(std::move(idx));
+    }
+
+    auto identity = [](auto const & x) { return x; };
+
+    for (qdb_size_t j = 0; j < data.column_count; ++j)
+    {
+        qdb_exp_batch_push_column_t const & column_ = data.columns[j];
+        std::string name{column_.name};
+
+        switch (column_.data_type)
+        {
+        case qdb_ts_column_int64:
+            ret.push_back(detail::fixed_width_of<std::int64_t>(
+                std::move(name), "l", column_.data.ints, n, identity));
+            break;
+        case qdb_ts_column_double:
+            ret.push_back(detail::fixed_width_of<double>(
+                std::move(name), "g", column_.data.doubles, n, identity));
+            break;
+        case qdb_ts_column_timestamp:
+            ret.push_back(
+                detail::fixed_width_of<std::int64_t>(std::move(name), "tsn:", column_.data.timestamps,
+                    n, [](qdb_timespec_t const & x) { return detail::timestamp_of(x); }));
+            break;
+        case qdb_ts_column_string: {
+            // Strings are UTF-8 already, so they're copied as-is.
+            column xs = column::variable_width(std::move(name), "U", n);
+
+            for (std::int64_t i = 0; i < n; ++i)
+            {
+                qdb_string_t const & x = column_.data.strings[i];
+
+                if (traits::is_null(x))
+                {
+                    xs.set_null(i);
+                }
+                else
+                {
+                    xs.append(i, x.data, x.length);
+                }
+            }
+
+            ret.push_back(std::move(xs));
+            break;
+        }
+        case qdb_ts_column_blob: {
+            column xs = column::variable_width(std::move(name), "Z", n);
+
+            for (std::int64_t i = 0; i < n; ++i)
+            {
+                qdb_blob_t const & x = column_.data.blobs[i];
+
+                if (traits::is_null(x))
+                {
+                    xs.set_null(i);
+                }
+                else
+                {
+                    xs.append(i, x.content, x.content_length);
+                }
+            }
+
+            ret.push_back(std::move(xs));
+            break;
+        }
+        case qdb_ts_column_symbol:
+            // See reader_data::convert(): symbols are exposed as strings by the bulk reader.
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: symbol column type returned from bulk reader");
+
+        case qdb_ts_column_uninitialized:
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: uninitialized column "
+                "type returned from bulk reader");
+        };
+    }
+
+    return ret;
+}
+
+std::vector<column> columns_of(qdb_query_result_t const & r)
+{
+    // Combined over all values of every column, the same way `query_numpy()` does.
+    std::vector<query_column_type_t> column_types = query_column_types(r);
+
+    std::vector<column> ret;
+    ret.reserve(r.column_count);
+
+    for (qdb_size_t j = 0; j < r.column_count; ++j)
+    {
+        std::string name = qdb::to_string(r.column_names[j]);
+
+        switch (column_types[j])
+        {
+#define CASE(t, fn, u)                                       \
+    case t:                                                  \
+        ret.push_back(detail::fn<u>(r, j, std::move(name))); \
+        break;
+
+            CASE(query_column_double, query_fixed_width_of, query_column_double);
+            CASE(query_column_int64, query_fixed_width_of, query_column_int64);
+            CASE(query_column_timestamp, query_fixed_width_of, query_column_timestamp);
+            CASE(query_column_string, query_variable_width_of, qdb_query_result_string);
+            CASE(query_column_blob, query_variable_width_of, qdb_query_result_blob);
+            CASE(query_column_array_int64, query_list_of, qdb_query_result_array_int64);
+            CASE(query_column_array_double, query_list_of, qdb_query_result_array_double);
+            CASE(query_column_array_timestamp, query_list_of, qdb_query_result_array_timestamp);
+            CASE(query_column_array_string, query_list_of, qdb_query_result_array_string);
+            CASE(query_column_array_blob, query_list_of, qdb_query_result_array_blob);
+
+#undef CASE
+
+        case query_column_none:
+            ret.push_back(column::nulls(std::move(name), static_cast<std::int64_t>(r.row_count)));
+            break;
+
+        case query_column_object: {
+            // Arrow columns have a single type: only int64 and double values can be combined.
+            std::stringstream ss;
+            ss << "column '" << name << "' has mixed value types that cannot be combined";
+            throw qdb::incompatible_type_exception(ss.str());
+        }
+        };
+    }
+
+    return ret;
+}
+
+py::object record_batch(qdb_bulk_reader_table_data_t const & data)
+{
+    // Fail early when pyarrow is not available.
+    detail::import_pyarrow();
+
+    std::vector<column> columns;
+
+    {
+        // Building the columns only involves native data.
+        py::gil_scoped_release release{};
+        columns = columns_of(data);
+    }
+
+    return record_batch(std::move(columns), static_cast<std::int64_t>(data.row_count));
+}
+
+py::object record_batch(qdb_query_result_t const & r)
+{
+    detail::import_pyarrow();
+
+    std::vector<column> columns;
+
+    {
+        py::gil_scoped_release release{};
+        columns = columns_of(r);
+    }
+
+    return record_batch(std::move(columns), static_cast<std::int64_t>(r.row_count));
+}
+
+} // namespace qdb::arrow
@@ -0,0 +1,234 @@
+/*
+ *
+ * Official Python API
+ *
+ * Copyright (c) 2009-2021, quasardb SAS. All rights reserved.
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *      notice, this list of conditions and the following disclaimer.
+ *    * Redistributions in binary form must reproduce the above copyright
+ *      notice, this list of conditions and the following disclaimer in the
+ *      documentation and/or other materials provided with the distribution.
+ *    * Neither the name of quasardb nor the names of its contributors may
+ *      be used to endorse or promote products derived from this software
+ *      without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY QUASARDB AND CONTRIBUTORS ``AS IS'' AND ANY
+ * EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+ * WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+ * DISCLAIMED. IN NO EVENT SHALL THE REGENTS AND CONTRIBUTORS BE LIABLE FOR ANY
+ * DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ * ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#pragma once
+
+#include <qdb/query.h>
+#include <qdb/ts.h>
+#include <pybind11/pybind11.h>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+////////////////////////////////////////////////////////////////////////////////
+//
+// ARROW C DATA INTERFACE
+//
+// These structs are part of Arrow's stable ABI, see:
+// https://arrow.apache.org/docs/format/CDataInterface.html
+//
+// This allows us to hand over record batches to pyarrow without linking against
+// Arrow: pyarrow is an optional, runtime-only dependency.
+//
+///////////////////
+
+#ifndef ARROW_C_DATA_INTERFACE
+#    define ARROW_C_DATA_INTERFACE
+
+#    define ARROW_FLAG_DICTIONARY_ORDERED 1
+#    define ARROW_FLAG_NULLABLE 2
+#    define ARROW_FLAG_MAP_KEYS_SORTED 4
+
+struct ArrowSchema
+{
+    // Array type description
+    const char * format;
+    const char * name;
+    const char * metadata;
+    int64_t flags;
+    int64_t n_children;
+    struct ArrowSchema ** children;
+    struct ArrowSchema * dictionary;
+
+    // Release callback
+    void (*release)(struct ArrowSchema *);
+    // Opaque producer-specific data
+    void * private_data;
+};
+
+struct ArrowArray
+{
+    // Array data description
+    int64_t length;
+    int64_t null_count;
+    int64_t offset;
+    int64_t n_buffers;
+    int64_t n_children;
+    const void ** buffers;
+    struct ArrowArray ** children;
+    struct ArrowArray * dictionary;
+
+    // Release callback
+    void (*release)(struct ArrowArray *);
+    // Opaque producer-specific data
+    void * private_data;
+};
+
+#endif // ARROW_C_DATA_INTERFACE
+
+namespace py = pybind11;
+
+namespace qdb::arrow
+{
+
+/**
+ * A single column of a record batch, which owns all of its buffers. Values are set
+ * through the typed builders below; anything not explicitly set is null.
+ */
+class column
+{
+public:
+    column(std::string name, std::string format, std::int64_t length)
+        : name_{std::move(name)}
+        , format_{std::move(format)}
+        , length_{length}
+    {}
+
+    /**
+     * Column of Arrow's null type: all values are null, and it has no buffers.
+     */
+    static column nulls(std::string name, std::int64_t length);
+
+    /**
+     * Column of fixed-width values of type `T`, e.g. int64 or float64.
+     */
+    template <typename T>
+    static column fixed_width(std::string name, std::string format, std::int64_t length)
+    {
+        column ret{std::move(name), std::move(format), length};
+        ret.values_.resize(static_cast<std::size_t>(length) * sizeof(T));
+        return ret;
+    }
+
+    /**
+     * Column of variable-width values, i.e. large (64-bit offsets) utf8 or binary.
+     */
+    static column variable_width(std::string name, std::string format, std::int64_t length);
+
+    /**
+     * Column of lists, i.e. large (64-bit offsets) lists of the values in `values`.
+     */
+    static column list(std::string name, column && values, std::int64_t length);
+
+    template <typename T>
+    inline void set(std::int64_t i, T x) noexcept
+    {
+        reinterpret_cast<T *>(values_.data())[i] = x;
+    }
+
+    /**
+     * Appends the value of the next row, variable width columns are filled in order.
+     */
+    void append(std::int64_t i, void const * data, std::size_t n);
+
+    /**
+     * Sets the list of the next row to the next `n` values, list columns are filled in
+     * order.
+     */
+    void append_list(std::int64_t i, std::int64_t n);
+
+    /**
+     * Values of a list column.
+     */
+    inline column & values() noexcept
+    {
+        return children_.front();
+    }
+
+    void set_null(std::int64_t i);
+
+    inline std::int64_t length() const noexcept
+    {
+        return length_;
+    }
+
+    /**
+     * Fills in the Arrow structs for this column, `out` must not outlive this column.
+     */
+    void export_to(ArrowSchema & schema, ArrowArray & array);
+
+private:
+    std::string name_;
+    std::string format_;
+    std::int64_t length_;
+    std::int64_t null_count_{0};
+
+    bool is_null_type_{false};
+    bool is_variable_width_{false};
+    bool is_list_{false};
+
+    // Validity bitmap, only allocated once a null value is encountered
+    std::vector<std::uint8_t> validity_;
+
+    // Offsets, for variable width and list columns only
+    std::vector<std::int64_t> offsets_;
+
+    // Values of list columns, exported as their only child
+    std::vector<column> children_;
+    ArrowSchema child_schema_{};
+    ArrowArray child_array_{};
+    ArrowSchema * child_schema_ptr_{nullptr};
+    ArrowArray * child_array_ptr_{nullptr};
+
+    // Fixed-width values, or data of variable-width columns
+    std::vector<std::uint8_t> values_;
+
+    // Buffers as exported
+    const void * buffers_[3] = {nullptr, nullptr, nullptr};
+};
+
+/**
+ * Converts columns into a pyarrow.RecordBatch. Requires the GIL, and pyarrow.
+ */
+py::object record_batch(std::vector<column> && columns, std::int64_t length);
+
+/**
+ * Builds the columns of a record batch from a bulk reader batch. Does not touch any
+ * Python object.
+ */
+std::vector<column> columns_of(qdb_bulk_reader_table_data_t const & data);
+
+/**
+ * Builds the columns of a record batch from a query result. Does not touch any Python
+ * object.
+ */
+std::vector<column> columns_of(qdb_query_result_t const & r);
+
+/**
+ * Converts a bulk reader batch into a pyarrow.RecordBatch.
+ */
+py::object record_batch(qdb_bulk_reader_table_data_t const & data);
+
+/**
+ * Converts a query result into a pyarrow.RecordBatch.
+ */
+py::object record_batch(qdb_query_result_t const & r);
+
+} // namespace qdb::arrow
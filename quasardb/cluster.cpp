@@ -159,17 +159,39 @@ void register_cluster(py::module_ & m)
         .def("reader", &qdb::cluster::reader,
             py::arg("table_names"),
             py::kw_only(),
-            py::arg("column_names") = std::vector<std::string>{},
-            py::arg("batch_size")   = std::size_t{0},
-            py::arg("ranges")       = std::vector<py::tuple>{}
+            py::arg("column_names")    = std::vector<std::string>{},
+            py::arg("batch_size")      = std::size_t{0},
+            py::arg("ranges")          = std::vector<py::tuple>{},
+            py::arg("prefetch")        = std::size_t{0},
+            py::arg("zero_copy")       = false,
+            py::arg("strings")         = py::none(),
+            py::arg("max_batch_bytes") = std::size_t{0},
+            py::arg("masked")          = true,
+            py::arg("resume_from")     = py::none(),
+            py::arg("filter")          = py::none(),
+            py::arg("table_column")    = py::none()
             )
         .def("pinned_writer", &qdb::cluster::pinned_writer)
-        .def("writer", &qdb::cluster::writer)
+        .def("writer", &qdb::cluster::writer,
+            py::kw_only(),
+            py::arg("max_pending")     = std::size_t{2},
+            py::arg("staging_threads") = std::size_t{0})
         .def("find", &qdb::cluster::find)
         .def("query", &qdb::cluster::query,
             py::arg("query"),
-            py::arg("blobs") = false)
+            py::arg("blobs")  = false,
+            py::arg("format") = py::none())
         .def("query_numpy", &qdb::cluster::query_numpy,
+            py::arg("query"),
+            py::arg("strings") = py::none(),
+            py::arg("masked")  = true)
+        .def("query_numpy_stream", &qdb::cluster::query_numpy_stream,
+            py::arg("query"),
+            py::kw_only(),
+            py::arg("chunk_rows") = std::size_t{65536},
+            py::arg("strings")    = py::none(),
+            py::arg("masked")     = true)
+        .def("query_arrow", &qdb::cluster::query_arrow,
             py::arg("query"))
         .def("query_continuous_full", &qdb::cluster::query_continuous_full,
             py::arg("query"),
@@ -193,6 +215,8 @@ void register_cluster(py::module_ & m)
         .def("wait_for_compaction", &qdb::cluster::wait_for_compaction)
         .def("endpoints", &qdb::cluster::endpoints)
         .def("validate_query", &qdb::cluster::validate_query)
+        .def("describe_query", &qdb::cluster::describe_query, py::arg("query"))
+        .def("clear_query_descriptions", &qdb::cluster::clear_query_descriptions)
         .def("split_query_range", &qdb::cluster::split_query_range);
 }
 
@@ -60,6 +60,7 @@
 #include <pybind11/stl.h>
 #include <chrono>
 #include <iostream>
+#include <list>
 
 
 namespace qdb
@@ -245,11 +246,20 @@ public:
         std::vector<std::string> const & table_names,  //
         std::vector<std::string> const & column_names, //
         std::size_t batch_size,                        //
-        std::vector<py::tuple> const & ranges)         //
+        std::vector<py::tuple> const & ranges,         //
+        std::size_t prefetch,                          //
+        bool zero_copy,                                //
+        py::object const & strings,                    //
+        std::size_t max_batch_bytes,                   //
+        bool masked,                                   //
+        py::object const & resume_from,                //
+        py::object const & filter,                     //
+        py::object const & table_column)               //
     {
         check_open();
 
-        return make_reader_ptr(_handle, table_names, column_names, batch_size, ranges);
+        return make_reader_ptr(_handle, table_names, column_names, batch_size, ranges, prefetch,
+            zero_copy, strings, max_batch_bytes, masked, resume_from, filter, table_column);
     }
 
     // the batch_inserter_ptr is non-copyable
@@ -261,11 +271,11 @@ public:
     }
 
     // the batch_inserter_ptr is non-copyable
-    qdb::writer_ptr writer()
+    qdb::writer_ptr writer(std::size_t max_pending = 2, std::size_t staging_threads = 0)
     {
         check_open();
 
-        return std::make_unique<qdb::writer>(_handle);
+        return std::make_unique<qdb::writer>(_handle, max_pending, staging_threads);
     }
 
     // the batch_inserter_ptr is non-copyable
@@ -341,18 +351,50 @@ public:
 	return o->run();
     }
 
-    py::object query(const std::string & query_string, const py::object & blobs)
+    py::object query(
+        const std::string & query_string, const py::object & blobs, py::object const & format)
     {
         check_open();
 
+        switch (qdb::query_format_of(format))
+        {
+        case qdb::query_format_tuples:
+            return qdb::tuples_query(_handle, query_string, blobs);
+
+        case qdb::query_format_columns:
+            return qdb::columns_query(_handle, query_string, blobs);
+
+        case qdb::query_format_dicts:
+            break;
+        }
+
         return py::cast(qdb::dict_query(_handle, query_string, blobs));
     }
 
-    py::object query_numpy(const std::string & query_string)
+    py::object query_numpy(const std::string & query_string, py::object const & strings, bool masked)
+    {
+        check_open();
+
+        return py::cast(
+            qdb::numpy_query(_handle, query_string, convert::strings_mode_of(strings), masked));
+    }
+
+    std::shared_ptr<qdb::numpy_query_stream> query_numpy_stream(const std::string & query_string,
+        std::size_t chunk_rows,
+        py::object const & strings,
+        bool masked)
     {
         check_open();
 
-        return py::cast(qdb::numpy_query(_handle, query_string));
+        return std::make_shared<qdb::numpy_query_stream>(
+            _handle, query_string, chunk_rows, convert::strings_mode_of(strings), masked);
+    }
+
+    py::object query_arrow(const std::string & query_string)
+    {
+        check_open();
+
+        return qdb::arrow_query(_handle, query_string);
     }
 
     std::shared_ptr<qdb::query_continuous> query_continuous(qdb_query_continuous_mode_type_t mode,
@@ -512,6 +554,59 @@ public:
         return py::cast(qdb::numpy_query(_handle, query));
     }
 
+    /**
+     * Returns the name, column type and numpy dtype of every column of a query, for
+     * planning dtypes without reading its results. Descriptions of the most recently
+     * described queries are remembered per query text, unless the type of a column could
+     * not be determined.
+     */
+    py::object describe_query(const std::string & query_string)
+    {
+        check_open();
+
+        // Only ever accessed while holding the GIL. Describing the query releases it though,
+        // so the cache may have changed by the time we remember the description.
+        auto pos = _query_descriptions_index.find(query_string);
+        if (pos != _query_descriptions_index.end())
+        {
+            // Most recently used descriptions are at the front.
+            _query_descriptions.splice(_query_descriptions.begin(), _query_descriptions, pos->second);
+            return py::cast(pos->second->second);
+        }
+
+        qdb::query_description_t ret = qdb::describe_query(_handle, query_string);
+
+        // A column that is null in the probed row has no type yet: don't remember it, so
+        // that a later call can still determine it.
+        bool complete = std::all_of(
+            ret.begin(), ret.end(), [](auto const & x) { return !std::get<2>(x).is_none(); });
+
+        // Another thread may have described the same query in the meantime.
+        if (complete && _query_descriptions_index.contains(query_string) == false)
+        {
+            _query_descriptions.emplace_front(query_string, ret);
+            _query_descriptions_index.emplace(query_string, _query_descriptions.begin());
+
+            if (_query_descriptions.size() > max_query_descriptions)
+            {
+                _query_descriptions_index.erase(_query_descriptions.back().first);
+                _query_descriptions.pop_back();
+            }
+        }
+
+        return py::cast(ret);
+    }
+
+    /**
+     * Forgets all remembered query descriptions, e.g. after tables were dropped or
+     * recreated with another schema.
+     */
+    void clear_query_descriptions()
+    {
+        _query_descriptions_index.clear();
+        _query_descriptions.clear();
+    }
+
     py::object split_query_range(std::chrono::system_clock::time_point start, std::chrono::system_clock::time_point end, std::chrono::milliseconds delta)
     {
         std::vector<std::pair<std::chrono::system_clock::time_point, std::chrono::system_clock::time_point>> ranges;
@@ -533,6 +628,13 @@ private:
     handle_ptr _handle;
     pybind11::object _json_loads;
 
+    // Remembered query descriptions, most recently used first
+    static constexpr std::size_t max_query_descriptions = 256;
+    std::list<std::pair<std::string, qdb::query_description_t>> _query_descriptions;
+    std::unordered_map<std::string,
+        std::list<std::pair<std::string, qdb::query_description_t>>::iterator>
+        _query_descriptions_index;
+
     qdb::logger _logger;
 };
 
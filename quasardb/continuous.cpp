@@ -13,6 +13,8 @@ query_continuous::query_continuous(qdb::handle_ptr h, const py::object & bools)
     , _previous_watermark{0}
     , _watermark{0}
     , _last_error{qdb_e_uninitialized}
+    , _stopped{false}
+    , _results{nullptr}
 {}
 
 query_continuous::~query_continuous()
@@ -25,9 +27,14 @@ void query_continuous::run(qdb_query_continuous_mode_type_t mode,
     std::chrono::milliseconds pace,
     const std::string & query_string)
 {
-    qdb::qdb_throw_if_error(
-        *_handle, qdb_query_continuous(*_handle, query_string.c_str(), mode,
-                      static_cast<unsigned>(pace.count()), _callback, this, &_cont_handle));
+    qdb_error_t err;
+    {
+        py::gil_scoped_release release{};
+        err = qdb_query_continuous(*_handle, query_string.c_str(), mode,
+            static_cast<unsigned>(pace.count()), _callback, this, &_cont_handle);
+    }
+
+    qdb::qdb_throw_if_error(*_handle, err);
 }
 
 void query_continuous::release_results()
@@ -51,33 +58,33 @@ int query_continuous::continuous_callback(void * p, qdb_error_t err, const qdb_q
 {
     auto pthis = static_cast<query_continuous *>(p);
 
+    bool wake_async = false;
+
     try
     {
         std::unique_lock<std::mutex> lock{pthis->_results_mutex};
 
         ++pthis->_watermark;
 
+        // signal the error, if processing end, we will get a qdb_e_interrupted which is handled
+        // in the results function
         pthis->_last_error = err;
-        if (QDB_FAILURE(pthis->_last_error))
+        if (QDB_SUCCESS(pthis->_last_error))
         {
-            // signal the error, if processing end, we will get a qdb_e_interrupted which is handled
-            // in the results function
-            lock.unlock();
-            pthis->_results_cond.notify_all();
-            return 0;
+            // copy the results using the API convenience function
+            // there are two traps to avoid
+            // 1. we are within the context of a thread owned by the quasardb C API, calling Python
+            // functions could results in deadlocks
+            // 2. the results are valid only in the context of the callback, if we want to work on
+            // them outside we need to copy them
+            pthis->_last_error = pthis->copy_results(res);
+            if (QDB_FAILURE(pthis->_last_error))
+            {
+                pthis->release_results();
+            }
         }
 
-        // copy the results using the API convenience function
-        // there are two traps to avoid
-        // 1. we are within the context of a thread owned by the quasardb C API, calling Python
-        // functions could results in deadlocks
-        // 2. the results are valid only in the context of the callback, if we want to work on them
-        // outside we need to copy them
-        pthis->_last_error = pthis->copy_results(res);
-        if (QDB_FAILURE(pthis->_last_error))
-        {
-            pthis->release_results();
-        }
+        wake_async = !pthis->_async_waiters.empty();
     }
     catch (std::system_error const & e)
     {
@@ -95,6 +102,20 @@ int query_continuous::continuous_callback(void * p, qdb_error_t err, const qdb_q
 
     pthis->_results_cond.notify_all();
 
+    if (wake_async)
+    {
+        try
+        {
+            pthis->wake_async_waiters();
+        }
+        catch (std::exception const & e)
+        {
+            std::cerr << "Internal error: unexpected exception caught while waking up asynchronous "
+                         "continuous query consumers: "
+                      << e.what() << std::endl;
+        }
+    }
+
     return 0;
 }
 
@@ -103,7 +124,11 @@ dict_query_result_t query_continuous::unsafe_results()
     // when we return from the condition variable we own the mutex
     _previous_watermark.store(_watermark.load());
 
-    if (_last_error == qdb_e_interrupted) throw py::stop_iteration{};
+    if (_stopped || _last_error == qdb_e_interrupted)
+    {
+        _stopped = true;
+        throw py::stop_iteration{};
+    }
 
     // throw an error, user may decide to resume iteration
     qdb::qdb_throw_if_error(*_handle, _last_error);
@@ -116,21 +141,30 @@ dict_query_result_t query_continuous::unsafe_results()
     return res;
 }
 
-dict_query_result_t query_continuous::results()
+void query_continuous::wait_for_results()
 {
-    try
-    {
-        std::unique_lock<std::mutex> lock{_results_mutex};
+    // waiting for the next results can take an arbitrary amount of time, let the other Python
+    // threads run in the meantime
+    py::gil_scoped_release release{};
+
+    std::unique_lock<std::mutex> lock{_results_mutex};
 
-        // you need an additional mechanism to check if you need to do something with the results
-        // because condition variables can have spurious calls
-        while (_watermark == _previous_watermark)
+    // you need an additional mechanism to check if you need to do something with the results
+    // because condition variables can have spurious calls
+    while (!_stopped && _watermark == _previous_watermark)
+    {
+        // entering the condition variables releases the mutex
+        // the callback can update the values when needed
+        // every second we are going to check if the user didn't do CTRL-C
+        if (_results_cond.wait_for(lock, std::chrono::seconds{1}) == std::cv_status::timeout)
         {
-            // entering the condition variables releases the mutex
-            // the callback can update the values when needed
-            // every second we are going to check if the user didn't do CTRL-C
-            if (_results_cond.wait_for(lock, std::chrono::seconds{1}) == std::cv_status::timeout)
+            // checking for signals requires the GIL, never wait for it while holding the mutex:
+            // Python threads always acquire the GIL first, and the mutex second
+            lock.unlock();
+
             {
+                py::gil_scoped_acquire acquire{};
+
                 // if we don't do this, it will be impossible to interrupt the Python program while
                 // we wait for results
                 if (PyErr_CheckSignals() != 0)
@@ -138,9 +172,38 @@ dict_query_result_t query_continuous::results()
                     throw py::error_already_set();
                 }
             }
+
+            lock.lock();
         }
+    }
+}
 
-        return unsafe_results();
+dict_query_result_t query_continuous::results()
+{
+    try
+    {
+        while (true)
+        {
+            wait_for_results();
+
+            std::unique_lock<std::mutex> lock{_results_mutex};
+
+            // another thread may have consumed the results while we were reacquiring the GIL
+            if (_stopped || _watermark != _previous_watermark)
+            {
+                return unsafe_results();
+            }
+        }
+    }
+    catch (py::error_already_set const &)
+    {
+        // typically a KeyboardInterrupt
+        throw;
+    }
+    catch (py::stop_iteration const &)
+    {
+        // the continuous query has been stopped
+        throw;
     }
     catch (std::system_error const & e)
     {
@@ -164,7 +227,7 @@ dict_query_result_t query_continuous::probe_results()
         std::unique_lock<std::mutex> lock{_results_mutex};
 
         // check if there's a new value
-        if (_watermark == _previous_watermark)
+        if (!_stopped && _watermark == _previous_watermark)
         {
             // nope return empty, don't wait, don't acquire the condition variable
             return dict_query_result_t{};
@@ -187,12 +250,115 @@ dict_query_result_t query_continuous::probe_results()
     }
 }
 
+py::object query_continuous::async_results()
+{
+    py::object loop   = py::module_::import("asyncio").attr("get_running_loop")();
+    py::object future = loop.attr("create_future")();
+
+    resolve_async_waiter(loop, future);
+
+    return future;
+}
+
+void query_continuous::resolve_async_waiter(py::object loop, py::object future)
+{
+    // the consumer may have given up waiting, e.g. the task was cancelled
+    if (future.attr("done")().cast<bool>()) return;
+
+    py::object res;
+    py::object exc;
+
+    {
+        std::unique_lock<std::mutex> lock{_results_mutex};
+
+        if (!_stopped && _watermark == _previous_watermark)
+        {
+            // nothing new yet, the callback will wake us up
+            _async_waiters.emplace_back(std::move(loop), std::move(future));
+            return;
+        }
+
+        try
+        {
+            // going through the Python call machinery converts our exceptions to Python ones,
+            // which we can then forward to the future
+            res = py::cpp_function{[this]() { return unsafe_results(); }}();
+        }
+        catch (py::error_already_set const & e)
+        {
+            exc = e.matches(PyExc_StopIteration)
+                      ? py::reinterpret_borrow<py::object>(PyExc_StopAsyncIteration)
+                      : e.value();
+        }
+    }
+
+    if (exc)
+    {
+        future.attr("set_exception")(exc);
+    }
+    else
+    {
+        future.attr("set_result")(res);
+    }
+}
+
+void query_continuous::wake_async_waiters()
+{
+    // typically invoked from a thread owned by the quasardb C API, which means we must acquire the
+    // GIL before we touch any Python object
+    py::gil_scoped_acquire acquire{};
+
+    std::vector<async_waiter_t> waiters;
+    {
+        std::unique_lock<std::mutex> lock{_results_mutex};
+        waiters.swap(_async_waiters);
+    }
+
+    auto self = weak_from_this().lock();
+    if (!self) return;
+
+    for (auto const & waiter : waiters)
+    {
+        try
+        {
+            // futures are not thread-safe, resolve them from within their event loop
+            waiter.first.attr("call_soon_threadsafe")(py::cpp_function{
+                [self, waiter]() { self->resolve_async_waiter(waiter.first, waiter.second); }});
+        }
+        catch (py::error_already_set const & e)
+        {
+            // most likely the event loop has been closed in the meantime
+            _logger.warn("unable to wake up asynchronous continuous query consumer: %s", e.what());
+        }
+    }
+}
+
 void query_continuous::stop()
 {
     if (_handle && _cont_handle)
     {
-        qdb_release(*_handle, _cont_handle);
+        {
+            // the callback may be waiting for the GIL to wake up asynchronous consumers
+            py::gil_scoped_release release{};
+            qdb_release(*_handle, _cont_handle);
+        }
         _cont_handle = nullptr;
+
+        // no more results will come: let whoever is still waiting know
+        bool wake_async = false;
+        {
+            std::unique_lock<std::mutex> lock{_results_mutex};
+            _last_error = qdb_e_interrupted;
+            _stopped    = true;
+            ++_watermark;
+            wake_async = !_async_waiters.empty();
+        }
+        _results_cond.notify_all();
+
+        if (wake_async)
+        {
+            wake_async_waiters();
+        }
     }
 }
 
@@ -35,6 +35,9 @@
 #include <atomic>
 #include <condition_variable>
 #include <memory>
+#include <mutex>
+#include <utility>
+#include <vector>
 
 namespace py = pybind11;
 
@@ -59,6 +62,13 @@ private:
 
 private:
     dict_query_result_t unsafe_results();
+    void wait_for_results();
+
+    // an asyncio consumer waiting for the next results: the event loop and the future to resolve
+    using async_waiter_t = std::pair<py::object, py::object>;
+
+    void resolve_async_waiter(py::object loop, py::object future);
+    void wake_async_waiters();
 
 public:
     // returns the results (blocking)
@@ -68,6 +78,9 @@ public:
     // in that case you would poll probe_results(), the cost is low because it doesn't result in a
     // remote call just acquiring the mutex and see if results have been updated
     dict_query_result_t probe_results();
+    // returns an asyncio future resolved with the next results, woken up from the callback thread
+    // so that a single event loop can wait on many continuous queries without any polling
+    py::object async_results();
     void stop();
 
 private:
@@ -84,8 +97,14 @@ private:
     std::atomic<size_t> _previous_watermark;
     std::atomic<size_t> _watermark;
     qdb_error_t _last_error;
+    // protected by _results_mutex, set once the end of the results has been reached: every
+    // subsequent call then ends the iteration right away instead of waiting for results
+    bool _stopped;
 
     qdb_query_result_t * _results;
+
+    // protected by _results_mutex, only touched with the GIL held except for checking emptiness
+    std::vector<async_waiter_t> _async_waiters;
 };
 
 template <typename Module>
@@ -105,7 +124,11 @@ static inline void register_continuous(Module & m)
 
         // required interface to use query_continuous as an iterator
         .def("__iter__", [](const std::shared_ptr<qdb::query_continuous> & cont) { return cont; })
-        .def("__next__", &qdb::query_continuous::results);
+        .def("__next__", &qdb::query_continuous::results)
+
+        // required interface to use query_continuous as an asynchronous iterator
+        .def("__aiter__", [](const std::shared_ptr<qdb::query_continuous> & cont) { return cont; })
+        .def("__anext__", &qdb::query_continuous::async_results);
 }
 
 } // namespace qdb
@@ -44,9 +44,14 @@
 #include <range/v3/range/conversion.hpp>
 #include <range/v3/range/traits.hpp>
 #include <range/v3/view/common.hpp>
+#include <range/v3/view/counted.hpp>
 #include <range/v3/view/transform.hpp>
 #include <range/v3/view/zip.hpp>
 #include <cstring>
+#include <string_view>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
 
 namespace qdb::convert::detail
 {
@@ -241,6 +246,22 @@ static inline constexpr void array(py::array const & xs, std::vector<To> & dst)
     array<From, To>(xs, ranges::begin(dst));
 }
 
+// numpy -> qdb
+// input:  native view of a np.ndarray, does not require the GIL
+// output: OutputRange
+template <concepts::dtype From, concepts::qdb_primitive To>
+static inline constexpr void array(detail::array_view const & xs, std::vector<To> & dst)
+{
+    dst.resize(xs.size); // <- important!
+
+    if (xs.size == 0) [[unlikely]]
+    {
+        return;
+    };
+
+    ranges::copy(detail::to_range<From>(xs) | detail::convert_array<From, To>{}(), ranges::begin(dst));
+}
+
 // numpy -> qdb
 // input:  np.ndarray
 // returns: vector
@@ -296,4 +317,110 @@ static inline qdb::masked_array masked_array(R && xs)
     return qdb::masked_array(xs_, qdb::masked_array::masked_null<To>(xs_));
 }
 
+// qdb -> numpy, without copying
+// input:   pointer to `n` qdb primitives, with the exact same memory layout as `To`
+// returns: read-only masked array that refers to `xs` directly, and keeps `base` alive
+//          for as long as it (or any view of it) exists.
+template <concepts::qdb_primitive From, concepts::dtype To>
+    requires(std::is_same_v<From, typename To::value_type>)
+static inline qdb::masked_array masked_array_view(From const * xs, std::size_t n, py::handle base)
+{
+    if (n == 0) [[unlikely]]
+    {
+        return {};
+    };
+
+    py::array xs_{To::dtype(), {static_cast<py::ssize_t>(n)}, xs, base};
+
+    // The memory belongs to the C API: don't let anyone write to it.
+    py::detail::array_proxy(xs_.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+
+    return qdb::masked_array(xs_, qdb::masked_array::masked_null<To>(xs_));
+}
+
+// native -> numpy, without copying
+// input:   vector of values with the exact same memory layout as `To`, or of values of
+//          the same size that already hold the bit patterns of `To`
+// returns: array that takes over the memory of `xs`, which is freed once the array (or
+//          any view of it) is garbage collected.
+template <concepts::dtype To, typename T = typename To::value_type>
+    requires(sizeof(T) == sizeof(typename To::value_type))
+static inline py::array owned_array(std::vector<T> && xs)
+{
+    using vector_type = std::vector<T>;
+
+    auto * xs_ = new vector_type{std::move(xs)};
+    py::capsule owner{xs_, [](void * p) { delete static_cast<vector_type *>(p); }};
+
+    return py::array{To::dtype(), {static_cast<py::ssize_t>(xs_->size())}, xs_->data(), owner};
+}
+
+// qdb -> numpy, dictionary-encoded
+// input:   range of qdb strings
+// returns: tuple of (codes, categories), where `codes` is a masked int32 array with
+//          the offset of each value in `categories`, an array of unique strings in
+//          order of appearance. Null values are masked, and their code is -1. When
+//          `masked` is false, `codes` is a plain array instead.
+template <ranges::sized_range R>
+    requires(concepts::input_range_t<R, qdb_string_t>)
+static inline py::tuple categorical(R && xs, bool masked = true)
+{
+    using code_type = traits::int32_dtype::value_type;
+
+    py::ssize_t n = static_cast<py::ssize_t>(ranges::size(xs));
+
+    py::array codes{traits::int32_dtype::dtype(), py::array::ShapeContainer{n}};
+    py::array mask = qdb::numpy::array::initialize<bool>(n, false);
+
+    std::vector<qdb_string_t> categories;
+
+    {
+        // Only native data is involved from here on.
+        py::gil_scoped_release release{};
+
+        code_type * codes_ = static_cast<code_type *>(codes.mutable_data());
+        bool * mask_       = static_cast<bool *>(mask.mutable_data());
+
+        std::unordered_map<std::string_view, code_type> index;
+
+        for (qdb_string_t const & x : xs)
+        {
+            if (traits::is_null(x))
+            {
+                *codes_ = -1;
+                *mask_  = true;
+            }
+            else
+            {
+                auto [it, inserted] = index.try_emplace(
+                    std::string_view{x.data, x.length}, static_cast<code_type>(categories.size()));
+
+                if (inserted)
+                {
+                    categories.push_back(x);
+                }
+
+                *codes_ = it->second;
+            }
+
+            ++codes_;
+            ++mask_;
+        }
+    }
+
+    py::array categories_ =
+        categories.empty()
+            // Everything is null, but keep the dtype consistent with non-empty categories.
+            ? py::array{traits::unicode_dtype::dtype(1), py::array::ShapeContainer{0}}
+            : array<qdb_string_t, traits::unicode_dtype>(
+                  ranges::views::counted(categories.data(), categories.size()));
+
+    if (masked == false)
+    {
+        return py::make_tuple(codes, categories_);
+    }
+
+    return py::make_tuple(qdb::masked_array{codes, mask}, categories_);
+}
+
 }; // namespace qdb::convert
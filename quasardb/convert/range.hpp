@@ -82,40 +82,68 @@ requires(concepts::variable_width_dtype<DType>) struct clean_stride
     };
 };
 
+/**
+ * Native description of the memory of a one-dimensional numpy array. Iterating over it does not
+ * touch any Python object, which makes it safe to use without holding the GIL, as long as the
+ * array it was created from is kept alive.
+ */
+struct array_view
+{
+    void const * data;
+
+    // Number of items
+    py::ssize_t size;
+
+    // Number of bytes of a single item
+    py::ssize_t item_size;
+
+    // Number of bytes between two consecutive items
+    py::ssize_t stride_size;
+
+    /**
+     * Requires the GIL.
+     */
+    static inline array_view of(py::array const & xs)
+    {
+        // Numpy can sometimes use larger strides, e.g. pack int64 in a container with
+        // 128-byte strides. In these case, we need to increase the size of our step.
+        //
+        // Related ticket: SC-11057
+        py::ssize_t stride_size{0};
+        switch (xs.ndim())
+        {
+            // This can happen in case an array contains only a single number, then it will
+            // not have any dimensions. In this case, it's best to just use the itemsize as
+            // the stride size, because we'll not have to forward the iterator anyway.
+            [[unlikely]] case 0 : stride_size = xs.itemsize();
+            break;
+
+            // Default case: use stride size of the first (and only) dimension. Most of the
+            //               time this will be identical to the itemsize.
+            [[likely]] case 1 : stride_size = xs.strides(0);
+            break;
+        default:
+            throw qdb::incompatible_type_exception{
+                "Multi-dimensional arrays are not supported. Eexpected 0 or 1 dimensions, got: "
+                + std::to_string(xs.ndim())};
+        };
+
+        return array_view{xs.data(), xs.size(), xs.itemsize(), stride_size};
+    }
+};
+
 template <concepts::dtype DType>
-requires(concepts::fixed_width_dtype<DType>) inline decltype(auto) to_range(py::array const & xs)
+requires(concepts::fixed_width_dtype<DType>) inline decltype(auto) to_range(array_view const & xs)
 {
     // Lowest-level codepoint representation inside numpy, e.g. wchar_t for unicode
     // or short for int16.
     using value_type       = typename DType::value_type;
-    value_type const * xs_ = xs.unchecked<value_type>().data();
-
-    // Numpy can sometimes use larger strides, e.g. pack int64 in a container with
-    // 128-byte strides. In these case, we need to increase the size of our step.
-    //
-    // Related ticket: SC-11057
-    py::ssize_t stride_size{0};
-    switch (xs.ndim())
-    {
-        // This can happen in case an array contains only a single number, then it will
-        // not have any dimensions. In this case, it's best to just use the itemsize as
-        // the stride size, because we'll not have to forward the iterator anyway.
-        [[unlikely]] case 0 : stride_size = xs.itemsize();
-        break;
-
-        // Default case: use stride size of the first (and only) dimension. Most of the
-        //               time this will be identical to the itemsize.
-        [[likely]] case 1 : stride_size = xs.strides(0);
-        break;
-    default:
-        throw qdb::incompatible_type_exception{
-            "Multi-dimensional arrays are not supported. Eexpected 0 or 1 dimensions, got: "
-            + std::to_string(xs.ndim())};
-    };
+    value_type const * xs_ = static_cast<value_type const *>(xs.data);
 
+    py::ssize_t stride_size = xs.stride_size;
     assert(stride_size > 0);
 
-    py::ssize_t item_size = xs.itemsize();
+    py::ssize_t item_size = xs.item_size;
 
     // Sanity check; stride_size is number of bytes per item for a whole "step", item_size
     // is the number of bytes per item. As such, stride_size should always be a multiple
@@ -125,12 +153,18 @@ requires(concepts::fixed_width_dtype<DType>) inline decltype(auto) to_range(py::
     // The number of "steps" of <value_type> we need to take per iteration.
     py::ssize_t step_size = stride_size / item_size;
 
-    return ranges::views::stride(ranges::views::counted(xs_, (xs.size() * step_size)), step_size);
+    return ranges::views::stride(ranges::views::counted(xs_, (xs.size * step_size)), step_size);
+};
+
+template <concepts::dtype DType>
+requires(concepts::fixed_width_dtype<DType>) inline decltype(auto) to_range(py::array const & xs)
+{
+    return to_range<DType>(array_view::of(xs));
 };
 
 // Variable length encoding: split into chunks of <itemsize() / codepoint_size>
 template <concepts::dtype DType>
-requires(concepts::variable_width_dtype<DType>) inline decltype(auto) to_range(py::array const & xs)
+requires(concepts::variable_width_dtype<DType>) inline decltype(auto) to_range(array_view const & xs)
 {
     using stride_type = typename DType::stride_type;
     using value_type  = typename stride_type::value_type;
@@ -171,10 +205,11 @@ requires(concepts::variable_width_dtype<DType>) inline decltype(auto) to_range(p
     //
     // No memory is copied, the emitted data still refers to the same numpy array
     // data under-the-hood.
-    py::ssize_t stride_size = DType::stride_size(xs.itemsize());
+    py::ssize_t stride_size = DType::stride_size(xs.item_size);
 
     // First. let's gather a view of "all" bytes in the dataset: xs.size() repres
-    auto all_bytes = ranges::views::counted(xs.unchecked<value_type>().data(), xs.size() * stride_size);
+    auto all_bytes =
+        ranges::views::counted(static_cast<value_type const *>(xs.data), xs.size * stride_size);
 
     // Now, "split" these in strides
     auto strides = ranges::chunk_view(all_bytes, stride_size);
@@ -182,6 +217,12 @@ requires(concepts::variable_width_dtype<DType>) inline decltype(auto) to_range(p
     return ranges::views::transform(strides, clean_stride<DType>{});
 };
 
+template <concepts::dtype DType>
+requires(concepts::variable_width_dtype<DType>) inline decltype(auto) to_range(py::array const & xs)
+{
+    return to_range<DType>(array_view::of(xs));
+};
+
 /**
  * Converts range R to np.ndarray of dtype DType. Copies underlying data.
  */
@@ -0,0 +1,73 @@
+/*
+ *
+ * Official Python API
+ *
+ * Copyright (c) 2009-2022, quasardb SAS. All rights reserved.
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *      notice, this list of conditions and the following disclaimer.
+ *    * Redistributions in binary form must reproduce the above copyright
+ *      notice, this list of conditions and the following disclaimer in the
+ *      documentation and/or other materials provided with the distribution.
+ *    * Neither the name of quasardb nor the names of its contributors may
+ *      be used to endorse or promote products derived from this software
+ *      without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY QUASARDB AND CONTRIBUTORS ``AS IS'' AND ANY
+ * EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+ * WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+ * DISCLAIMED. IN NO EVENT SHALL THE REGENTS AND CONTRIBUTORS BE LIABLE FOR ANY
+ * DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ * ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#pragma once
+
+#include "../error.hpp"
+#include <pybind11/pybind11.h>
+#include <string>
+
+namespace qdb::convert
+{
+
+namespace py = pybind11;
+
+// How string columns are returned to the user.
+enum strings_mode_t
+{
+    // As arrays with one value per row
+    strings_mode_default,
+
+    // Dictionary-encoded, see `convert::categorical()`
+    strings_mode_categorical
+};
+
+static inline strings_mode_t strings_mode_of(py::object const & strings)
+{
+    if (strings.is_none())
+    {
+        return strings_mode_default;
+    }
+
+    std::string strings_ = py::cast<std::string>(strings);
+
+    if (strings_ == "categorical")
+    {
+        return strings_mode_categorical;
+    }
+
+    std::string error_msg = "Invalid argument provided for `strings`: expected "
+                            "None or 'categorical', got: ";
+    error_msg += strings_;
+
+    throw qdb::invalid_argument_exception{error_msg};
+}
+
+}; // namespace qdb::convert
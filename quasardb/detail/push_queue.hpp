@@ -0,0 +1,177 @@
+/*
+ *
+ * Official Python API
+ *
+ * Copyright (c) 2009-2021, quasardb SAS. All rights reserved.
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *      notice, this list of conditions and the following disclaimer.
+ *    * Redistributions in binary form must reproduce the above copyright
+ *      notice, this list of conditions and the following disclaimer in the
+ *      documentation and/or other materials provided with the distribution.
+ *    * Neither the name of quasardb nor the names of its contributors may
+ *      be used to endorse or promote products derived from this software
+ *      without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY QUASARDB AND CONTRIBUTORS ``AS IS'' AND ANY
+ * EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+ * WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+ * DISCLAIMED. IN NO EVENT SHALL THE REGENTS AND CONTRIBUTORS BE LIABLE FOR ANY
+ * DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ * ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#pragma once
+
+#include <cassert>
+#include <condition_variable>
+#include <cstddef>
+#include <deque>
+#include <functional>
+#include <mutex>
+#include <thread>
+
+namespace qdb::detail
+{
+
+/**
+ * Bounded queue of pushes, executed in order by a single background thread.
+ *
+ * None of these functions touch any Python object, and all of them may block: callers are
+ * expected to release the GIL before invoking them. Likewise, the jobs are executed without
+ * the GIL.
+ */
+class push_queue
+{
+public:
+    using job_type = std::function<void()>;
+
+public:
+    explicit push_queue(std::size_t capacity)
+        : capacity_{capacity == 0 ? 1 : capacity}
+    {}
+
+    push_queue(push_queue const &)             = delete;
+    push_queue & operator=(push_queue const &) = delete;
+
+    ~push_queue()
+    {
+        close();
+    }
+
+    /**
+     * Enqueues a job, blocks while the queue is full. Returns false if the queue has been closed,
+     * in which case the job is not executed.
+     */
+    bool put(job_type job)
+    {
+        std::unique_lock<std::mutex> lock{lock_};
+
+        cond_.wait(lock, [this] { return closed_ || queue_.size() < capacity_; });
+
+        if (closed_) [[unlikely]]
+        {
+            return false;
+        }
+
+        if (thread_.joinable() == false) [[unlikely]]
+        {
+            // Lazily start the thread, most writers never push in the background.
+            thread_ = std::thread{&push_queue::run, this};
+        }
+
+        queue_.push_back(std::move(job));
+        cond_.notify_all();
+
+        return true;
+    }
+
+    /**
+     * Blocks until all enqueued jobs have been executed.
+     */
+    void flush()
+    {
+        std::unique_lock<std::mutex> lock{lock_};
+
+        cond_.wait(lock, [this] { return queue_.empty() && busy_ == false; });
+    }
+
+    /**
+     * Executes all enqueued jobs and stops the background thread. Jobs can no longer be
+     * enqueued afterwards.
+     */
+    void close()
+    {
+        {
+            std::unique_lock<std::mutex> lock{lock_};
+            closed_ = true;
+        }
+
+        cond_.notify_all();
+
+        if (thread_.joinable())
+        {
+            thread_.join();
+        }
+    }
+
+    inline std::size_t capacity() const noexcept
+    {
+        return capacity_;
+    }
+
+private:
+    void run()
+    {
+        std::unique_lock<std::mutex> lock{lock_};
+
+        while (true)
+        {
+            cond_.wait(lock, [this] { return closed_ || queue_.empty() == false; });
+
+            if (queue_.empty())
+            {
+                // Closed, and nothing left to push.
+                assert(closed_ == true);
+                break;
+            }
+
+            job_type job = std::move(queue_.front());
+            queue_.pop_front();
+            busy_ = true;
+
+            // A slot just freed up, wake up any producer waiting for it.
+            cond_.notify_all();
+
+            lock.unlock();
+            job();
+            job = nullptr;
+            lock.lock();
+
+            busy_ = false;
+            cond_.notify_all();
+        }
+    }
+
+private:
+    std::size_t capacity_;
+
+    std::mutex lock_;
+    std::condition_variable cond_;
+    std::deque<job_type> queue_;
+
+    // True while a job is being executed by the background thread
+    bool busy_{false};
+    bool closed_{false};
+
+    std::thread thread_;
+};
+
+} // namespace qdb::detail
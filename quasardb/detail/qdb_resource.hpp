@@ -64,6 +64,11 @@ public:
     qdb_resource(qdb_resource const &)             = delete;
     qdb_resource & operator=(qdb_resource const &) = delete;
 
+    qdb_resource(qdb_resource && other) noexcept
+        : h_(other.h_)
+        , p_(other.release())
+    {}
+
     ~qdb_resource()
     {
         if (p_ != nullptr)
@@ -119,6 +124,17 @@ public:
         return *p_;
     }
 
+    /**
+     * Gives up ownership of the pointer, which the caller is responsible for releasing
+     * from now on.
+     */
+    ValueType * release() noexcept
+    {
+        ValueType * ret = p_;
+        p_              = nullptr;
+        return ret;
+    }
+
 private:
     qdb_handle_t h_;
     ValueType * p_;
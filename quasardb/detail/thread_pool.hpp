@@ -0,0 +1,254 @@
+/*
+ *
+ * Official Python API
+ *
+ * Copyright (c) 2009-2021, quasardb SAS. All rights reserved.
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *      notice, this list of conditions and the following disclaimer.
+ *    * Redistributions in binary form must reproduce the above copyright
+ *      notice, this list of conditions and the following disclaimer in the
+ *      documentation and/or other materials provided with the distribution.
+ *    * Neither the name of quasardb nor the names of its contributors may
+ *      be used to endorse or promote products derived from this software
+ *      without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY QUASARDB AND CONTRIBUTORS ``AS IS'' AND ANY
+ * EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+ * WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+ * DISCLAIMED. IN NO EVENT SHALL THE REGENTS AND CONTRIBUTORS BE LIABLE FOR ANY
+ * DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+ * (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+ * LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ * ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+ * SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+#pragma once
+
+#include <algorithm>
+#include <atomic>
+#include <cassert>
+#include <condition_variable>
+#include <cstddef>
+#include <exception>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace qdb::detail
+{
+
+/**
+ * Fixed-size pool of native threads, used to spread CPU-bound work (e.g. column conversions)
+ * over multiple cores.
+ *
+ * None of these functions touch any Python object and all of them may block: callers are
+ * expected to release the GIL before invoking them.
+ */
+class thread_pool
+{
+public:
+    using task_type = std::function<void()>;
+
+public:
+    /**
+     * `parallelism` is the total number of threads working on a batch of tasks, including the
+     * calling thread. 0 means one thread per CPU.
+     */
+    explicit thread_pool(std::size_t parallelism = 0)
+        : parallelism_{parallelism == 0 ? default_parallelism() : parallelism}
+    {}
+
+    thread_pool(thread_pool const &)             = delete;
+    thread_pool & operator=(thread_pool const &) = delete;
+
+    ~thread_pool()
+    {
+        {
+            std::unique_lock<std::mutex> lock{lock_};
+            stop_ = true;
+        }
+
+        cond_.notify_all();
+
+        for (std::thread & t : threads_)
+        {
+            t.join();
+        }
+    }
+
+    static inline std::size_t default_parallelism() noexcept
+    {
+        return std::max<std::size_t>(std::thread::hardware_concurrency(), 1);
+    }
+
+    inline std::size_t parallelism() const noexcept
+    {
+        return parallelism_;
+    }
+
+    /**
+     * Executes all tasks, and blocks until all of them have completed. The calling thread
+     * takes part in the work. If any task throws, the first exception is rethrown once all
+     * tasks have completed.
+     *
+     * A single batch of tasks is executed at a time: concurrent callers wait for their turn.
+     */
+    void run(std::vector<task_type> & tasks)
+    {
+        if (parallelism_ == 1 || tasks.size() <= 1)
+        {
+            // Not worth waking up any threads.
+            for (task_type & task : tasks)
+            {
+                task();
+            }
+
+            return;
+        }
+
+        std::unique_lock<std::mutex> run_lock{run_lock_};
+
+        {
+            std::unique_lock<std::mutex> lock{lock_};
+
+            if (threads_.empty()) [[unlikely]]
+            {
+                // Lazily start the threads, most pools are never used.
+                for (std::size_t i = 1; i < parallelism_; ++i)
+                {
+                    threads_.emplace_back(&thread_pool::worker, this);
+                }
+            }
+
+            tasks_     = &tasks;
+            next_      = 0;
+            remaining_ = tasks.size();
+            error_     = nullptr;
+            ++generation_;
+        }
+
+        cond_.notify_all();
+
+        drain(tasks);
+
+        std::exception_ptr error{nullptr};
+
+        {
+            std::unique_lock<std::mutex> lock{lock_};
+
+            // Wait for all tasks to complete, as well as for all threads that picked up this
+            // batch to let go of it.
+            done_.wait(lock, [this] { return remaining_ == 0 && active_ == 0; });
+
+            tasks_ = nullptr;
+            std::swap(error, error_);
+        }
+
+        if (error) [[unlikely]]
+        {
+            std::rethrow_exception(error);
+        }
+    }
+
+private:
+    void worker()
+    {
+        std::unique_lock<std::mutex> lock{lock_};
+        std::size_t generation{0};
+
+        while (true)
+        {
+            cond_.wait(lock, [this, generation] { return stop_ || generation_ != generation; });
+
+            if (stop_)
+            {
+                return;
+            }
+
+            generation = generation_;
+
+            if (tasks_ == nullptr)
+            {
+                // We woke up too late, this batch has already been completed.
+                continue;
+            }
+
+            std::vector<task_type> & tasks = *tasks_;
+            ++active_;
+
+            lock.unlock();
+            drain(tasks);
+            lock.lock();
+
+            --active_;
+            done_.notify_all();
+        }
+    }
+
+    /**
+     * Executes tasks of the current batch until there are none left.
+     */
+    void drain(std::vector<task_type> & tasks)
+    {
+        while (true)
+        {
+            std::size_t i = next_.fetch_add(1);
+
+            if (i >= tasks.size())
+            {
+                return;
+            }
+
+            try
+            {
+                tasks[i]();
+            }
+            catch (...)
+            {
+                std::unique_lock<std::mutex> lock{lock_};
+
+                if (error_ == nullptr)
+                {
+                    error_ = std::current_exception();
+                }
+            }
+
+            if (--remaining_ == 0)
+            {
+                // Take the lock to make sure the wake-up is not lost.
+                std::unique_lock<std::mutex> lock{lock_};
+                done_.notify_all();
+            }
+        }
+    }
+
+private:
+    std::size_t parallelism_;
+    std::vector<std::thread> threads_;
+
+    // Serializes batches
+    std::mutex run_lock_;
+
+    std::mutex lock_;
+    std::condition_variable cond_;
+    std::condition_variable done_;
+
+    bool stop_{false};
+
+    // Current batch of tasks
+    std::vector<task_type> * tasks_{nullptr};
+    std::size_t generation_{0};
+    std::atomic<std::size_t> next_{0};
+    std::atomic<std::size_t> remaining_{0};
+    std::size_t active_{0};
+    std::exception_ptr error_{nullptr};
+};
+
+} // namespace qdb::detail
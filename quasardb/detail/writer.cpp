@@ -5,6 +5,8 @@
 #include "numpy.hpp"
 #include "retry.hpp"
 #include "traits.hpp"
+#include <set>
+#include <string>
 
 namespace qdb::detail
 {
@@ -18,19 +20,25 @@ namespace qdb::detail
 // to support additional dtypes for existing column types (e.g. to also support
 // py::str objects for string columns).
 //
+// The setters do not convert anything themselves: they schedule the conversion
+// in `staging_tasks`, which runs them in parallel once the GIL is released.
+//
 ///////////////////
 
 template <qdb_ts_column_type_t ColumnType, concepts::dtype Dtype>
 struct column_setter;
 
-#define COLUMN_SETTER_DECL(CTYPE, DTYPE, VALUE_TYPE)                                        \
-    template <>                                                                             \
-    struct column_setter<CTYPE, DTYPE>                                                      \
-    {                                                                                       \
-        inline void operator()(qdb::masked_array const & xs, std::vector<VALUE_TYPE> & dst) \
-        {                                                                                   \
-            convert::masked_array<DTYPE, VALUE_TYPE>(xs, dst);                              \
-        }                                                                                   \
+#define COLUMN_SETTER_DECL(CTYPE, DTYPE, VALUE_TYPE)                                            \
+    template <>                                                                                 \
+    struct column_setter<CTYPE, DTYPE>                                                          \
+    {                                                                                           \
+        inline void operator()(                                                                 \
+            qdb::masked_array const & xs, std::vector<VALUE_TYPE> & dst, staging_tasks & tasks) \
+        {                                                                                       \
+            tasks.add(xs.filled<DTYPE>(), [&dst](convert::detail::array_view const & view) {    \
+                convert::array<DTYPE, VALUE_TYPE>(view, dst);                                   \
+            });                                                                                 \
+        }                                                                                       \
     };
 
 // np.dtype('int64') -> qdb_int_t column
@@ -53,7 +61,17 @@ COLUMN_SETTER_DECL(qdb_ts_column_timestamp, traits::datetime64_ns_dtype, qdb_tim
 COLUMN_SETTER_DECL(qdb_ts_column_string, traits::unicode_dtype, qdb_string_t);
 
 // np.dtype('object') -> qdb_blob_t column
-COLUMN_SETTER_DECL(qdb_ts_column_blob, traits::pyobject_dtype, qdb_blob_t);
+//
+// Reading Python objects requires the GIL, so these are converted right away.
+template <>
+struct column_setter<qdb_ts_column_blob, traits::pyobject_dtype>
+{
+    inline void operator()(
+        qdb::masked_array const & xs, std::vector<qdb_blob_t> & dst, staging_tasks & /* tasks */)
+    {
+        convert::masked_array<traits::pyobject_dtype, qdb_blob_t>(xs, dst);
+    }
+};
 
 // np.dtype('S') -> qdb_blob_t column
 COLUMN_SETTER_DECL(qdb_ts_column_blob, traits::bytestring_dtype, qdb_blob_t);
@@ -61,11 +79,13 @@ COLUMN_SETTER_DECL(qdb_ts_column_blob, traits::bytestring_dtype, qdb_blob_t);
 #undef COLUMN_SETTER_DECL
 
 template <qdb_ts_column_type_t ColumnType>
-inline void set_column_dispatch(
-    std::size_t index, qdb::masked_array const & xs, std::vector<any_column> & columns)
+inline void set_column_dispatch(std::size_t index,
+    qdb::masked_array const & xs,
+    std::vector<any_column> & columns,
+    staging_tasks & tasks)
 {
     dispatch::by_dtype<detail::column_setter, ColumnType>(
-        xs.dtype(), xs, detail::access_column<ColumnType>(columns, index));
+        xs.dtype(), xs, detail::access_column<ColumnType>(columns, index), tasks);
 };
 
 template <qdb_ts_column_type_t T, typename AnyColumnType>
@@ -143,37 +163,40 @@ template <>
 struct fill_column_dispatch<qdb_ts_column_symbol> : fill_column_dispatch<qdb_ts_column_string>
 {};
 
-void staged_table::set_index(py::array const & xs)
+void staged_table::set_index(py::array const & xs, staging_tasks & tasks)
 {
-    convert::array<traits::datetime64_ns_dtype, qdb_timespec_t>(
-        numpy::array::ensure<traits::datetime64_ns_dtype>(xs), _index);
+    tasks.add(numpy::array::ensure<traits::datetime64_ns_dtype>(xs),
+        [this](convert::detail::array_view const & view) {
+            convert::array<traits::datetime64_ns_dtype, qdb_timespec_t>(view, _index);
+        });
 }
 
-void staged_table::set_blob_column(std::size_t index, const masked_array & xs)
+void staged_table::set_blob_column(std::size_t index, const masked_array & xs, staging_tasks & tasks)
 {
-    detail::set_column_dispatch<qdb_ts_column_blob>(index, xs, _columns);
+    detail::set_column_dispatch<qdb_ts_column_blob>(index, xs, _columns, tasks);
 }
 
-void staged_table::set_string_column(std::size_t index, const masked_array & xs)
+void staged_table::set_string_column(std::size_t index, const masked_array & xs, staging_tasks & tasks)
 {
-    detail::set_column_dispatch<qdb_ts_column_string>(index, xs, _columns);
+    detail::set_column_dispatch<qdb_ts_column_string>(index, xs, _columns, tasks);
 }
 
-void staged_table::set_int64_column(std::size_t index, const masked_array_t<traits::int64_dtype> & xs)
+void staged_table::set_int64_column(
+    std::size_t index, const masked_array_t<traits::int64_dtype> & xs, staging_tasks & tasks)
 {
-    detail::set_column_dispatch<qdb_ts_column_int64>(index, xs, _columns);
+    detail::set_column_dispatch<qdb_ts_column_int64>(index, xs, _columns, tasks);
 }
 
 void staged_table::set_double_column(
-    std::size_t index, const masked_array_t<traits::float64_dtype> & xs)
+    std::size_t index, const masked_array_t<traits::float64_dtype> & xs, staging_tasks & tasks)
 {
-    detail::set_column_dispatch<qdb_ts_column_double>(index, xs, _columns);
+    detail::set_column_dispatch<qdb_ts_column_double>(index, xs, _columns, tasks);
 }
 
 void staged_table::set_timestamp_column(
-    std::size_t index, const masked_array_t<traits::datetime64_ns_dtype> & xs)
+    std::size_t index, const masked_array_t<traits::datetime64_ns_dtype> & xs, staging_tasks & tasks)
 {
-    detail::set_column_dispatch<qdb_ts_column_timestamp>(index, xs, _columns);
+    detail::set_column_dispatch<qdb_ts_column_timestamp>(index, xs, _columns, tasks);
 }
 
 std::vector<qdb_exp_batch_push_column_t> const & staged_table::prepare_columns()
@@ -367,7 +390,8 @@ void staged_table::prepare_batch(qdb_exp_batch_push_mode_t mode,
     throw qdb::invalid_argument_exception{error_msg};
 };
 
-/* static */ staged_tables staged_tables::index(detail::writer_data const & data)
+/* static */ staged_tables staged_tables::index(
+    detail::writer_data const & data, detail::thread_pool & pool)
 {
     // XXX(leon): this function could potentially be moved to e.g. a free
     // function as it doesn't really depend upon anything in writer, but
@@ -375,6 +399,10 @@ void staged_table::prepare_batch(qdb_exp_batch_push_mode_t mode,
     // bit messy.
 
     detail::staged_tables ret;
+    detail::staging_tasks tasks;
+
+    // Tables for which conversions are scheduled in `tasks`.
+    std::set<std::string> scheduled;
 
     for (detail::writer_data::value_type const & table_data : data.xs())
     {
@@ -390,9 +418,19 @@ void staged_table::prepare_batch(qdb_exp_batch_push_mode_t mode,
                 "data must be provided for every column of the table."};
         }
 
+        // The same table may occur multiple times, in which case the later data overwrites
+        // the earlier. The pending conversions would write into the same buffers, so they
+        // have to complete first.
+        if (scheduled.insert(table.get_name()).second == false) [[unlikely]]
+        {
+            tasks.run(pool);
+            scheduled.clear();
+            scheduled.insert(table.get_name());
+        }
+
         detail::staged_table & staged_table = ret.get_or_create(table);
 
-        staged_table.set_index(index);
+        staged_table.set_index(index, tasks);
 
         for (std::size_t i = 0; i < column_data.size(); ++i)
         {
@@ -404,23 +442,23 @@ void staged_table::prepare_batch(qdb_exp_batch_push_mode_t mode,
                 {
                 case qdb_ts_column_double:
                     staged_table.set_double_column(
-                        i, x.cast<qdb::masked_array_t<traits::float64_dtype>>());
+                        i, x.cast<qdb::masked_array_t<traits::float64_dtype>>(), tasks);
                     break;
                 case qdb_ts_column_blob:
-                    staged_table.set_blob_column(i, x.cast<qdb::masked_array>());
+                    staged_table.set_blob_column(i, x.cast<qdb::masked_array>(), tasks);
                     break;
                 case qdb_ts_column_int64:
                     staged_table.set_int64_column(
-                        i, x.cast<qdb::masked_array_t<traits::int64_dtype>>());
+                        i, x.cast<qdb::masked_array_t<traits::int64_dtype>>(), tasks);
                     break;
                 case qdb_ts_column_timestamp:
                     staged_table.set_timestamp_column(
-                        i, x.cast<qdb::masked_array_t<traits::datetime64_ns_dtype>>());
+                        i, x.cast<qdb::masked_array_t<traits::datetime64_ns_dtype>>(), tasks);
                     break;
                 case qdb_ts_column_string:
                     /* FALLTHROUGH */
                 case qdb_ts_column_symbol:
-                    staged_table.set_string_column(i, x.cast<qdb::masked_array>());
+                    staged_table.set_string_column(i, x.cast<qdb::masked_array>(), tasks);
                     break;
                 case qdb_ts_column_uninitialized:
                     // Likely a corruption
@@ -435,6 +473,8 @@ void staged_table::prepare_batch(qdb_exp_batch_push_mode_t mode,
         }
     }
 
+    tasks.run(pool);
+
     return ret;
 }
 }; // namespace qdb::detail
@@ -31,12 +31,17 @@
 #pragma once
 
 #include "../concepts.hpp"
+#include "../convert/range.hpp"
 #include "../convert/value.hpp"
 #include "../dispatch.hpp"
 #include "../error.hpp"
 #include "../logger.hpp"
+#include "../object_tracker.hpp"
 #include "../table.hpp"
 #include "retry.hpp"
+#include "thread_pool.hpp"
+#include <functional>
+#include <memory>
 #include <variant>
 #include <vector>
 
@@ -154,6 +159,73 @@ struct clear_column
     }
 };
 
+/**
+ * Column conversions that have been prepared with the GIL held, and that can then be executed
+ * without it, in parallel. Keeps the numpy arrays they read from alive.
+ */
+class staging_tasks
+{
+public:
+    using task_type = std::function<void()>;
+
+public:
+    /**
+     * Pins `xs`, and schedules `fn` to be invoked with a native view of its data. Requires the
+     * GIL.
+     */
+    template <typename Fn>
+    void add(py::array xs, Fn && fn)
+    {
+        convert::detail::array_view view = convert::detail::array_view::of(xs);
+
+        _arrays.push_back(std::move(xs));
+        _tasks.push_back([view, fn = std::forward<Fn>(fn)]() { fn(view); });
+    }
+
+    /**
+     * Executes all tasks on the pool, with the GIL released. Requires the GIL.
+     */
+    void run(detail::thread_pool & pool)
+    {
+        if (_tasks.empty())
+        {
+            return;
+        }
+
+        // The object tracker is thread-local: every task tracks its allocations (e.g. converted
+        // strings) in its own repository, which we hand over to the calling thread's afterwards.
+        auto repos = std::make_unique<object_tracker::scoped_repository[]>(_tasks.size());
+
+        std::vector<task_type> tasks;
+        tasks.reserve(_tasks.size());
+
+        for (std::size_t i = 0; i < _tasks.size(); ++i)
+        {
+            tasks.push_back([&repo = repos[i], &task = _tasks[i]]() {
+                object_tracker::scoped_capture capture{repo};
+                task();
+            });
+        }
+
+        {
+            py::gil_scoped_release release{};
+            pool.run(tasks);
+        }
+
+        for (std::size_t i = 0; i < _tasks.size(); ++i)
+        {
+            repos[i].release_into_scope();
+        }
+
+        _tasks.clear();
+        _arrays.clear();
+    }
+
+private:
+    std::vector<py::array> _arrays;
+    std::vector<task_type> _tasks;
+};
+
 class staged_table
 {
 public:
@@ -174,13 +246,18 @@ public:
         clear();
     }
 
-    void set_index(py::array const & timestamps);
-    void set_blob_column(std::size_t index, const masked_array & xs);
-    void set_string_column(std::size_t index, const masked_array & xs);
-    void set_double_column(std::size_t index, masked_array_t<traits::float64_dtype> const & xs);
-    void set_int64_column(std::size_t index, masked_array_t<traits::int64_dtype> const & xs);
-    void set_timestamp_column(
-        std::size_t index, masked_array_t<traits::datetime64_ns_dtype> const & xs);
+    // The setters below schedule the actual conversion of the data in `tasks`, they are only
+    // staged once these have been run.
+    void set_index(py::array const & timestamps, staging_tasks & tasks);
+    void set_blob_column(std::size_t index, const masked_array & xs, staging_tasks & tasks);
+    void set_string_column(std::size_t index, const masked_array & xs, staging_tasks & tasks);
+    void set_double_column(
+        std::size_t index, masked_array_t<traits::float64_dtype> const & xs, staging_tasks & tasks);
+    void set_int64_column(
+        std::size_t index, masked_array_t<traits::int64_dtype> const & xs, staging_tasks & tasks);
+    void set_timestamp_column(std::size_t index,
+        masked_array_t<traits::datetime64_ns_dtype> const & xs,
+        staging_tasks & tasks);
 
     std::vector<qdb_exp_batch_push_column_t> const & prepare_columns();
 
@@ -343,9 +420,10 @@ public:
 
 public:
     /**
-     * Free function that takes indexes all writer data into a staged_table object.
+     * Free function that takes indexes all writer data into a staged_table object. The column
+     * conversions are spread over `pool`.
      */
-    static staged_tables index(writer_data const & data);
+    static staged_tables index(writer_data const & data, detail::thread_pool & pool);
 
 public:
     inline container_type::size_type size() const
@@ -272,6 +272,56 @@ struct no_op
 
 } // namespace detail
 
+// Throws the exception matching `err` with the provided error message. Useful when the error
+// context was captured on a different thread than the one reporting the error, as
+// `qdb_get_last_error()` only reports the last error of the calling thread.
+[[noreturn]] inline void qdb_throw_error(qdb_error_t err, std::string const & msg)
+{
+    switch (err)
+    {
+
+    case qdb_e_invalid_query:
+        throw qdb::invalid_query_exception{msg};
+
+    case qdb_e_out_of_bounds:
+        throw qdb::out_of_bounds_exception{msg};
+
+    case qdb_e_not_connected:
+    case qdb_e_invalid_handle:
+        throw qdb::invalid_handle_exception{};
+
+    case qdb_e_alias_already_exists:
+        throw qdb::alias_already_exists_exception{msg};
+
+    case qdb_e_alias_not_found:
+        throw qdb::alias_not_found_exception{msg};
+
+    case qdb_e_network_inbuf_too_small:
+        throw qdb::input_buffer_too_small_exception{};
+
+    case qdb_e_incompatible_type:
+        throw qdb::incompatible_type_exception{msg};
+
+    case qdb_e_not_implemented:
+        throw qdb::not_implemented_exception{msg};
+
+    case qdb_e_internal_local:
+        throw qdb::internal_local_exception{msg};
+
+    case qdb_e_invalid_argument:
+        throw qdb::invalid_argument_exception{msg};
+
+    case qdb_e_try_again:
+        throw qdb::try_again_exception{msg};
+
+    case qdb_e_async_pipe_full:
+        throw qdb::async_pipeline_full_exception{msg};
+
+    default:
+        throw qdb::exception{err, msg};
+    };
+}
+
 // Allow a callable to be run just before the throw, thus making nice clean-up possible
 // (such as calls to `qdb_release`)
 // `pre_throw` defaults to a `no_op` functor that does nothing.
@@ -321,51 +371,7 @@ inline void qdb_throw_if_error(
 
         pre_throw();
 
-        std::string msg_data_{msg_.get()->data};
-
-        switch (err)
-        {
-
-        case qdb_e_invalid_query:
-            throw qdb::invalid_query_exception{msg_data_};
-
-        case qdb_e_out_of_bounds:
-            throw qdb::out_of_bounds_exception{msg_data_};
-
-        case qdb_e_not_connected:
-        case qdb_e_invalid_handle:
-            throw qdb::invalid_handle_exception{};
-
-        case qdb_e_alias_already_exists:
-            throw qdb::alias_already_exists_exception{msg_data_};
-
-        case qdb_e_alias_not_found:
-            throw qdb::alias_not_found_exception{msg_data_};
-
-        case qdb_e_network_inbuf_too_small:
-            throw qdb::input_buffer_too_small_exception{};
-
-        case qdb_e_incompatible_type:
-            throw qdb::incompatible_type_exception{msg_data_};
-
-        case qdb_e_not_implemented:
-            throw qdb::not_implemented_exception{msg_data_};
-
-        case qdb_e_internal_local:
-            throw qdb::internal_local_exception{msg_data_};
-
-        case qdb_e_invalid_argument:
-            throw qdb::invalid_argument_exception{msg_data_};
-
-        case qdb_e_try_again:
-            throw qdb::try_again_exception{msg_data_};
-
-        case qdb_e_async_pipe_full:
-            throw qdb::async_pipeline_full_exception{msg_data_};
-
-        default:
-            throw qdb::exception{err_, msg_data_};
-        };
+        qdb_throw_error(err, std::string{msg_.get()->data});
     }
 }
 
@@ -193,3 +193,4 @@ def extend_writer(x: Any) -> None:
     x.push_fast = _wrap_fn(x.push_fast, _legacy_push)
     x.push_async = _wrap_fn(x.push_async, _legacy_push)
     x.push_truncate = _wrap_fn(x.push_truncate, _legacy_push)
+    x.push_nowait = _wrap_fn(x.push_nowait, _legacy_push)
@@ -38,6 +38,33 @@ def _get_transactions_since(
     return conn.query(q)
 
 
+def _get_last_transaction(conn: Cluster, table_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve the most recent transaction logged into the firehose for a table, if any.
+    """
+    q = "SELECT $timestamp, transaction_id, begin, end FROM \"{}\" WHERE table = '{}' ORDER BY $timestamp DESC LIMIT 1".format(
+        FIREHOSE_TABLE, table_name
+    )
+
+    xs = conn.query(q)
+    return xs[0] if len(xs) > 0 else None
+
+
+def _init_latest(conn: Cluster, table_name: str) -> Dict[str, Any]:
+    """
+    Initialize our internal state past the most recent transaction of a table, without
+    going through the entire history of the table.
+    """
+    state = _init()
+
+    last = _get_last_transaction(conn, table_name)
+    if last is not None:
+        state["last"] = last
+        state["seen"].add(last["transaction_id"])
+
+    return state
+
+
 def _get_transaction_data(
     conn: Cluster, table_name: str, begin: str, end: str
 ) -> List[Dict[str, Any]]:
@@ -48,17 +75,13 @@ def _get_transaction_data(
     return conn.query(q)
 
 
-def _get_next(
+def _new_transactions(
     conn: Cluster, table_name: str, state: Dict[str, Any]
-) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-
-    # Our flow to retrieve new data is as follows:
-    # 1. Based on the state's last processed transaction, retrieve all transactions
-    #    that are logged into the firehose since then.
-    # 2. For each of the transactions, verify we haven't seen it before
-    # 3. For each of the transactions, pull in all data
-    # 4. Concatenate all this data (in order of quasardb transaction)
-
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve the transactions logged into the firehose since the state's last processed
+    transaction, that we haven't seen before, and advance the state past them.
+    """
     txs = _get_transactions_since(conn, table_name, state["last"])
 
     xs: List[Dict[str, Any]] = []
@@ -72,15 +95,7 @@ def _get_next(
             state["seen"] = set()
 
         if txid not in state["seen"]:
-            xs = xs + _get_transaction_data(
-                conn,
-                table_name,
-                tx["begin"],
-                # The firehose logs transaction `end` span as
-                # end inclusive, while our bulk reader and/or query
-                # language are end exclusive.
-                tx["end"] + np.timedelta64(1, "ns"),
-            )
+            xs.append(tx)
 
             # Because it is possible that multiple firehose changes are stored with the
             # exact same $timestamp, we also keep track of the actually seen
@@ -89,6 +104,32 @@ def _get_next(
 
         state["last"] = tx
 
+    return xs
+
+
+def _get_next(
+    conn: Cluster, table_name: str, state: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+
+    # Our flow to retrieve new data is as follows:
+    # 1. Based on the state's last processed transaction, retrieve all transactions
+    #    that are logged into the firehose since then.
+    # 2. For each of the transactions, verify we haven't seen it before
+    # 3. For each of the transactions, pull in all data
+    # 4. Concatenate all this data (in order of quasardb transaction)
+
+    xs: List[Dict[str, Any]] = []
+    for tx in _new_transactions(conn, table_name, state):
+        xs = xs + _get_transaction_data(
+            conn,
+            table_name,
+            tx["begin"],
+            # The firehose logs transaction `end` span as
+            # end inclusive, while our bulk reader and/or query
+            # language are end exclusive.
+            tx["end"] + np.timedelta64(1, "ns"),
+        )
+
     return (state, xs)
 
 
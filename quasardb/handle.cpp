@@ -1,5 +1,6 @@
 #include "handle.hpp"
 #include "metrics.hpp"
+#include <utility>
 
 namespace qdb
 {
@@ -16,14 +17,55 @@ void handle::connect(const std::string & uri)
 
 void handle::close()
 {
-    if (handle_ != nullptr)
+    qdb_handle_t h{nullptr};
+
+    {
+        std::lock_guard<std::mutex> guard{pins_lock_};
+        std::swap(h, handle_);
+
+        if (h != nullptr && pins_ > 0)
+        {
+            // Closing releases all memory of the handle, including what pinned arrays
+            // still point to.
+            closing_ = h;
+            return;
+        }
+    }
+
+    if (h != nullptr)
     {
         metrics::scoped_capture{"qdb_close"};
-        qdb_close(handle_);
-        handle_ = nullptr;
+        qdb_close(h);
     }
 
     assert(handle_ == nullptr);
 }
 
+void handle::pin()
+{
+    std::lock_guard<std::mutex> guard{pins_lock_};
+    ++pins_;
+}
+
+void handle::unpin()
+{
+    qdb_handle_t h{nullptr};
+
+    {
+        std::lock_guard<std::mutex> guard{pins_lock_};
+        assert(pins_ > 0);
+
+        if (--pins_ == 0)
+        {
+            std::swap(h, closing_);
+        }
+    }
+
+    if (h != nullptr)
+    {
+        metrics::scoped_capture{"qdb_close"};
+        qdb_close(h);
+    }
+}
+
 }; // namespace qdb
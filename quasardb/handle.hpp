@@ -32,7 +32,9 @@
 
 #include "error.hpp"
 #include <qdb/client.h>
+#include <cstddef>
 #include <memory>
+#include <mutex>
 #include <string>
 
 namespace qdb
@@ -61,8 +63,25 @@ public:
         return handle_;
     }
 
+    /**
+     * Closes the connection. If memory of the handle is still pinned, the handle is closed
+     * right away as far as the API is concerned, but releasing its memory is deferred until
+     * the last pin is released.
+     */
     void close();
 
+    /**
+     * Keeps the memory allocated by the handle alive, even after the handle is closed. Used
+     * by arrays that are views over memory returned by the C API.
+     */
+    void pin();
+
+    /**
+     * Releases a pin obtained through `pin()`, and completes a deferred close once no pins
+     * are left.
+     */
+    void unpin();
+
     constexpr inline bool is_open() const
     {
         return handle_ != nullptr;
@@ -86,6 +105,12 @@ public:
 
 private:
     qdb_handle_t handle_{nullptr};
+
+    std::mutex pins_lock_;
+    std::size_t pins_{0};
+
+    // The handle of a close deferred until all pins are released
+    qdb_handle_t closing_{nullptr};
 };
 
 using handle_ptr = std::shared_ptr<handle>;
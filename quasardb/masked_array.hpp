@@ -38,6 +38,7 @@
 #include <range/v3/algorithm/for_each.hpp>
 #include <range/v3/view/chunk.hpp>
 #include <range/v3/view/counted.hpp>
+#include <algorithm>
 
 namespace qdb::detail
 {
@@ -183,20 +184,27 @@ public:
 
     inline mask(mask const & o) noexcept
         : xs_{o.xs_}
-        , probe_{o.probe_} {};
+        , probe_{o.probe_}
+        , size_{o.size_}
+        , lazy_{o.lazy_} {};
 
     inline mask(mask && o) noexcept
         : xs_{std::move(o.xs_)}
-        , probe_{std::move(o.probe_)} {};
+        , probe_{std::move(o.probe_)}
+        , size_{o.size_}
+        , lazy_{o.lazy_} {};
 
     inline mask(py::array const & xs, detail::mask_probe_t probe) noexcept
         : xs_{xs}
-        , probe_{probe} {};
+        , probe_{probe}
+        , size_{xs.size()} {};
 
     inline mask & operator=(mask const & o) noexcept
     {
         xs_    = o.xs_;
         probe_ = o.probe_;
+        size_  = o.size_;
+        lazy_  = o.lazy_;
         return *this;
     };
 
@@ -219,6 +227,8 @@ public:
 
         xs_    = xs;
         probe_ = probe;
+        size_  = xs.size();
+        lazy_  = false;
         return true;
     }
     /**
@@ -242,26 +252,51 @@ public:
         return mask{numpy::array::initialize(n, detail::bool_of_probe<p>()), p};
     };
 
+    /**
+     * Initialize a mask of size `n` with nothing masked, without allocating the underlying
+     * array: it's only allocated if it's actually accessed. Most columns do not contain
+     * any null values, in which case the mask is never needed.
+     */
+    static inline mask lazy_none(py::ssize_t n) noexcept
+    {
+        mask ret{};
+        ret.probe_ = detail::mask_all_false;
+        ret.size_  = n;
+        ret.lazy_  = true;
+        return ret;
+    };
+
     /**
      * Returns amount of elemenbts in the mask.
      */
     py::ssize_t size() const noexcept
     {
-        return xs_.size();
+        return size_;
+    };
+
+    /**
+     * Returns true if the mask array has not been allocated (yet).
+     */
+    bool is_lazy() const noexcept
+    {
+        return lazy_;
     };
 
-    py::array const & array() const noexcept
+    py::array const & array() const
     {
+        materialize();
         return xs_;
     };
 
-    bool const * data() const noexcept
+    bool const * data() const
     {
+        materialize();
         return xs_.unchecked<bool>().data();
     };
 
-    bool * mutable_data() noexcept
+    bool * mutable_data()
     {
+        materialize();
         return xs_.mutable_unchecked<bool>().mutable_data();
     };
 
@@ -271,8 +306,23 @@ public:
     };
 
 private:
-    py::array xs_;
+    /**
+     * Allocates the array of a lazy mask. Requires the GIL.
+     */
+    inline void materialize() const
+    {
+        if (lazy_) [[unlikely]]
+        {
+            xs_   = numpy::array::initialize(size_, false);
+            lazy_ = false;
+        }
+    };
+
+private:
+    mutable py::array xs_;
     detail::mask_probe_t probe_;
+    py::ssize_t size_{0};
+    mutable bool lazy_{false};
 };
 
 /**
@@ -290,7 +340,7 @@ public:
 
     // Initialize a masked array with everything open
     explicit masked_array(py::array arr)
-        : masked_array(arr, qdb::mask::of_probe<detail::mask_all_false>(arr.size()))
+        : masked_array(arr, qdb::mask::lazy_none(arr.size()))
     {}
 
     // Initialized from an array and a mask array. Mask array should be with dtype bool.
@@ -321,15 +371,38 @@ public:
     /**
      * Cast this masked array to an actual numpy.ma.MaskedArray. This invokes
      * a python function and can be slow.
+     *
+     * When nothing is masked, the MaskedArray is created with `nomask` rather than
+     * an array of False values, which avoids allocating the mask and keeps numpy.ma
+     * on its fast paths.
      */
     py::handle cast(py::return_value_policy policy) const
     {
         py::module numpy_ma = py::module::import("numpy.ma");
         py::object init     = numpy_ma.attr("masked_array");
 
+        if (mask_.probe() == detail::mask_all_false)
+        {
+            return init(arr_, py::arg("mask") = numpy_ma.attr("nomask")).inc_ref();
+        }
+
         return init(arr_, mask_.array()).inc_ref();
     }
 
+    /**
+     * Returns a numpy.ma.MaskedArray when `masked` is true, or the plain data otherwise,
+     * in which case nulls are represented by the dtype's null value (NaN, NaT, etc).
+     */
+    py::object to_object(bool masked) const
+    {
+        if (masked == false)
+        {
+            return arr_;
+        }
+
+        return py::reinterpret_steal<py::object>(cast(py::return_value_policy::move));
+    }
+
     py::array data() const
     {
         return arr_;
@@ -347,7 +420,17 @@ public:
         {
             // This is an actual numpy.ma.array
             logger_.debug("loading masked array from numpy.ma.MaskedArray object");
-            return load(src.attr("data"), src.attr("mask"));
+
+            py::object src_mask = src.attr("mask");
+
+            if (src_mask.is(py::module::import("numpy.ma").attr("nomask")))
+            {
+                // Nothing is masked, which is also what we return for arrays without nulls.
+                py::array src_ = src.attr("data").cast<py::array>();
+                return load(src_, mask::lazy_none(src_.size()));
+            }
+
+            return load(src.attr("data"), src_mask);
         }
         else if (py::isinstance<py::array>(src))
         {
@@ -502,9 +585,6 @@ public:
     {
         using value_type = typename Dtype::value_type;
 
-        py::array_t<bool> ret{ShapeContainer{xs.size()}};
-        bool * p_ret = static_cast<bool *>(ret.mutable_data());
-
         // The step_size is `1` for all fixed-width dtypes, but in case
         // of variable width dtypes, is, well, variable.
         py::ssize_t step_size = Dtype::stride_size(xs.itemsize());
@@ -512,14 +592,37 @@ public:
         value_type const * begin = static_cast<value_type const *>(xs.data());
         value_type const * end   = begin + (xs.size() * step_size);
 
-        // TODO(leon): [perf] we should be able to determine the mask_probe_t while
-        //             we iterate over this array.
-        for (value_type const * cur = begin; cur != end; cur += step_size, ++p_ret)
+        // Look for the first null value: if there is none, which is the common case, we
+        // don't need to allocate a mask at all.
+        value_type const * first = begin;
+        while (first != end && Dtype::is_null(*first) == false)
+        {
+            first += step_size;
+        }
+
+        if (first == end)
+        {
+            return mask::lazy_none(xs.size());
+        }
+
+        py::array_t<bool> ret{ShapeContainer{xs.size()}};
+        bool * p_ret = static_cast<bool *>(ret.mutable_data());
+
+        // Everything before the first null is visible, which also means we know the probe
+        // as we go.
+        std::size_t offset = static_cast<std::size_t>((first - begin) / step_size);
+        std::fill_n(p_ret, offset, false);
+        p_ret += offset;
+
+        bool any_visible = (offset > 0);
+
+        for (value_type const * cur = first; cur != end; cur += step_size, ++p_ret)
         {
             *p_ret = Dtype::is_null(*cur);
+            any_visible |= !*p_ret;
         };
 
-        return mask::of_array(py::cast<py::array>(ret));
+        return qdb::mask{ret, any_visible ? detail::mask_mixed : detail::mask_all_true};
     }
 
 protected:
@@ -4,37 +4,43 @@
 namespace qdb
 {
 
-static metrics_container_t metrics_totals_ = metrics_container_t{};
-static std::mutex metrics_lock_            = std::mutex{};
-
-metrics::scoped_capture::~scoped_capture()
+static metrics_container_t metrics_totals_   = metrics_container_t{};
+static metrics_container_t metrics_counters_ = metrics_container_t{};
+static std::mutex metrics_lock_              = std::mutex{};
+
+/**
+ * Adds `n` to the value of `name` in `xs`.
+ */
+static void add_to(metrics_container_t & xs, std::string const & name, std::uint64_t n)
 {
-    using std::chrono::nanoseconds;
+    metrics_container_t::iterator pos = xs.lower_bound(name);
 
-    time_point_t stop = clock_t::now();
+    if (pos == xs.end() || pos->first != name) [[unlikely]]
+    {
+        pos = xs.emplace_hint(pos, name, 0);
 
-    auto duration = std::chrono::duration_cast<nanoseconds>(stop - start_);
+        assert(pos->second == 0);
+    }
 
-    metrics::record(test_id_, duration.count());
+    assert(pos->first == name);
+    pos->second += n;
 }
 
-metrics::measure::measure()
-    : start_{metrics::totals()}
-{}
-
-metrics_container_t metrics::measure::get() const
+/**
+ * Returns how much every metric increased since `start`.
+ */
+static metrics_container_t difference(
+    metrics_container_t const & start, metrics_container_t const & cur)
 {
-    metrics_container_t cur = metrics::totals();
-
     metrics_container_t ret{};
 
     for (auto i : cur)
     {
         assert(ret.find(i.first) == ret.end());
 
-        metrics_container_t::const_iterator prev = start_.find(i.first);
+        metrics_container_t::const_iterator prev = start.find(i.first);
 
-        if (prev == start_.end())
+        if (prev == start.end())
         {
             // Previously, metric didn't exist yet, as such it's entirely new
             // and all accumulated time was within the scope.
@@ -53,23 +59,44 @@ metrics_container_t metrics::measure::get() const
     };
 
     return ret;
-};
+}
 
-/* static */ void metrics::record(std::string const & test_id, std::uint64_t nsec)
+metrics::scoped_capture::~scoped_capture()
 {
-    std::lock_guard<std::mutex> guard(metrics_lock_);
+    using std::chrono::nanoseconds;
 
-    metrics_container_t::iterator pos = metrics_totals_.lower_bound(test_id);
+    time_point_t stop = clock_t::now();
 
-    if (pos == metrics_totals_.end() || pos->first != test_id) [[unlikely]]
-    {
-        pos = metrics_totals_.emplace_hint(pos, test_id, 0);
+    auto duration = std::chrono::duration_cast<nanoseconds>(stop - start_);
 
-        assert(pos->second == 0);
-    }
+    metrics::record(test_id_, duration.count());
+}
+
+metrics::measure::measure()
+    : start_{metrics::totals()}
+    , counters_start_{metrics::counters()}
+{}
 
-    assert(pos->first == test_id);
-    pos->second += nsec;
+metrics_container_t metrics::measure::get() const
+{
+    return difference(start_, metrics::totals());
+};
+
+metrics_container_t metrics::measure::get_counters() const
+{
+    return difference(counters_start_, metrics::counters());
+};
+
+/* static */ void metrics::record(std::string const & test_id, std::uint64_t nsec)
+{
+    std::lock_guard<std::mutex> guard(metrics_lock_);
+    add_to(metrics_totals_, test_id, nsec);
+}
+
+/* static */ void metrics::increment(std::string const & name, std::uint64_t n)
+{
+    std::lock_guard<std::mutex> guard(metrics_lock_);
+    add_to(metrics_counters_, name, n);
 }
 
 /* static */ metrics_container_t metrics::totals()
@@ -78,10 +105,17 @@ metrics_container_t metrics::measure::get() const
     return metrics_totals_;
 }
 
+/* static */ metrics_container_t metrics::counters()
+{
+    std::lock_guard<std::mutex> guard(metrics_lock_);
+    return metrics_counters_;
+}
+
 /* static */ void metrics::clear()
 {
     std::lock_guard<std::mutex> guard(metrics_lock_);
     metrics_totals_.clear();
+    metrics_counters_.clear();
 }
 
 void register_metrics(py::module_ & m)
@@ -89,7 +123,9 @@ void register_metrics(py::module_ & m)
 
     py::module_ metrics_module =
         m.def_submodule("metrics", "Keep track of low-level performance metrics")
+            .def("increment", &qdb::metrics::increment, py::arg("name"), py::arg("n") = 1)
             .def("totals", &qdb::metrics::totals)
+            .def("counters", &qdb::metrics::counters)
             .def("clear", &qdb::metrics::clear);
 
     auto metrics_measure = py::class_<qdb::metrics::measure>(
@@ -97,7 +133,8 @@ void register_metrics(py::module_ & m)
                                .def(py::init())
                                .def("__enter__", &qdb::metrics::measure::enter)
                                .def("__exit__", &qdb::metrics::measure::exit)
-                               .def("get", &qdb::metrics::measure::get);
+                               .def("get", &qdb::metrics::measure::get)
+                               .def("get_counters", &qdb::metrics::measure::get_counters);
 };
 
 }; // namespace qdb
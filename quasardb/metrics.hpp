@@ -89,8 +89,14 @@ public:
 
         metrics_container_t get() const;
 
+        /**
+         * Counters incremented within the scope, see `metrics::increment()`.
+         */
+        metrics_container_t get_counters() const;
+
     private:
         metrics_container_t start_;
+        metrics_container_t counters_start_;
     };
 
 public:
@@ -99,9 +105,19 @@ public:
     ~metrics() noexcept {};
 
 public:
+    /**
+     * Adds `nsec` to the total time of a metric.
+     */
     static void record(std::string const & test_id, std::uint64_t nsec);
 
+    /**
+     * Adds `n` to a counter, such as the hits and misses of the query cache. Counters are
+     * kept apart from the timings, so they never end up being summed as durations.
+     */
+    static void increment(std::string const & name, std::uint64_t n = 1);
+
     static metrics_container_t totals();
+    static metrics_container_t counters();
     static void clear();
 
 private:
@@ -31,29 +31,43 @@ from __future__ import annotations
 import logging
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Dict,
     Iterable,
     Iterator,
     List,
+    Literal,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
     Type,
     Union,
+    overload,
 )
 
 import quasardb
 import quasardb.table_cache as table_cache
-from quasardb.quasardb import Cluster, Table, Writer
-from quasardb.typing import DType, MaskedArrayAny, NDArrayAny, NDArrayTime, RangeSet
+from quasardb.pool import Pool, SessionWrapper
+from quasardb.query_cache import QueryCache
+from quasardb.quasardb import Cluster, Reader, Table, Writer
+from quasardb.typing import (
+    DType,
+    MaskedArrayAny,
+    NDArrayAny,
+    NDArrayTime,
+    Range,
+    RangeSet,
+)
 
 logger = logging.getLogger("quasardb.numpy")
 
 
 TableLike = Union[str, Table]
 IndexedMaskedArrays = Tuple[NDArrayTime, Dict[str, MaskedArrayAny]]
+TableMaskedArrays = Tuple[str, NDArrayTime, Dict[str, MaskedArrayAny]]
 
 
 class NumpyRequired(ImportError):
@@ -76,6 +90,24 @@ except ImportError as err:
     ) from err
 
 
+class ArrowRequired(ImportError):
+    """
+    Exception raised when trying to read data as Arrow record batches, but
+    pyarrow has not been installed.
+    """
+
+    pass
+
+
+def _ensure_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as err:
+        raise ArrowRequired(
+            "The pyarrow library is required to read data as Arrow record batches"
+        ) from err
+
+
 class IncompatibleDtypeError(TypeError):
     """
     Exception raised when a provided dtype is not the expected dtype.
@@ -129,6 +161,61 @@ class InvalidDataCardinalityError(ValueError):
         )
 
 
+class Categorical(NamedTuple):
+    """
+    Dictionary-encoded string column, as returned when reading with
+    `strings="categorical"`.
+
+    `codes` is a masked int32 array with, for every row, the offset of its value in
+    `categories`. Null values are masked, and their code is -1. When read with
+    `masked=False`, `codes` is a plain int32 array instead.
+    """
+
+    codes: MaskedArrayAny
+    categories: NDArrayAny
+
+    @property
+    def size(self) -> int:
+        return self.codes.size
+
+
+class ListColumn(NamedTuple):
+    """
+    Column of array values, as returned by `query()` when a query returns arrays. Rather
+    than one Python object per row, the values of all rows are stored flattened.
+
+    `offsets` is an int64 array with one entry more than there are rows: the values of
+    row `i` are `values[offsets[i]:offsets[i + 1]]`. `values` is an int64, float64 or
+    datetime64[ns] array. For arrays of strings and blobs, `values` is itself a
+    `ListColumn` over a uint8 array of the bytes of every value, utf-8 encoded for
+    strings.
+
+    `mask` is a boolean array which is True for null rows, which are empty. When read
+    with `masked=False`, it is None instead.
+    """
+
+    offsets: NDArrayAny
+    values: Union[NDArrayAny, "ListColumn"]
+    mask: Optional[NDArrayAny]
+
+    @property
+    def size(self) -> int:
+        return self.offsets.size - 1
+
+
+def _ensure_column(x: Any) -> Any:
+    # Categorical columns are returned as plain (codes, categories) tuples, and array
+    # columns as plain (offsets, values, mask) tuples by the native reader and query APIs.
+    if isinstance(x, tuple):
+        if len(x) == 3:
+            (offsets, values, mask) = x
+            return ListColumn(offsets, _ensure_column(values), mask)
+
+        return Categorical(*x)
+
+    return x
+
+
 # Based on QuasarDB column types, which dtype do we accept?
 # First entry will always be the 'preferred' dtype, other ones
 # those that we can natively convert in native code.
@@ -597,11 +684,36 @@ def ensure_ma(
     return _ensure_ma(xs, dtype)
 
 
-def _concat_masked(xs: List[MaskedArrayAny]) -> MaskedArrayAny:
+def _concat_list_columns(xs: List[ListColumn]) -> ListColumn:
+    # The offsets of every column start at 0: shift them past the values of the
+    # columns before it.
+    offsets = [xs[0].offsets]
+    n = xs[0].values.size
+    for x in xs[1:]:
+        offsets.append(x.offsets[1:] + n)
+        n += x.values.size
+
+    mask = None
+    if xs[0].mask is not None:
+        mask = np.concatenate([x.mask for x in xs])
+
+    return ListColumn(
+        np.concatenate(offsets), _concat_masked([x.values for x in xs]), mask
+    )
+
+
+def _concat_masked(xs: List[Any]) -> Any:
     if len(xs) == 0:
         return ma.masked_array(np.array([]))
     if len(xs) == 1:
         return xs[0]
+    if isinstance(xs[0], ListColumn):
+        return _concat_list_columns(xs)
+    if isinstance(xs[0], Categorical):
+        raise TypeError("Unable to concatenate categorical columns")
+    if not any(ma.isMA(x) for x in xs):
+        # Read with masked=False, keep them plain arrays.
+        return np.concatenate(xs)
 
     return ma.concatenate(xs)
 
@@ -610,7 +722,11 @@ def _reader_batch_to_arrays(batch: Dict[str, MaskedArrayAny]) -> IndexedMaskedAr
     assert "$timestamp" in batch
 
     idx = batch["$timestamp"]
-    xs = {cname: values for (cname, values) in batch.items() if cname != "$timestamp"}
+    xs = {
+        cname: _ensure_column(values)
+        for (cname, values) in batch.items()
+        if cname != "$timestamp"
+    }
 
     return idx, xs
 
@@ -638,14 +754,270 @@ def _concat_array_batches(xs: Iterable[IndexedMaskedArrays]) -> IndexedMaskedArr
     }
 
 
-def read_arrays(
+def _normalize_ranges(ranges: RangeSet) -> List[Range]:
+    """
+    Sorts ranges and merges the overlapping ones, so that they can be split
+    into independent slices.
+    """
+    xs = sorted(
+        (
+            np.datetime64(start).astype("datetime64[ns]"),
+            np.datetime64(end).astype("datetime64[ns]"),
+        )
+        for (start, end) in ranges
+    )
+    ret: List[Range] = []
+
+    for start, end in xs:
+        if start >= end:
+            continue
+
+        if ret and start <= ret[-1][1]:
+            ret[-1] = (ret[-1][0], max(ret[-1][1], end))
+        else:
+            ret.append((start, end))
+
+    return ret
+
+
+def _table_range(conn: Cluster, table_name: str) -> Optional[Range]:
+    """
+    Returns the range spanning all data of a table, or None if the table is empty.
+    """
+    q = 'SELECT $timestamp FROM "{}" ORDER BY $timestamp {} LIMIT 1'
+
+    first = conn.query(q.format(table_name, "ASC"))
+    last = conn.query(q.format(table_name, "DESC"))
+
+    if len(first) == 0 or len(last) == 0:
+        return None
+
+    return (
+        np.datetime64(first[0]["$timestamp"], "ns"),
+        np.datetime64(last[0]["$timestamp"], "ns") + np.timedelta64(1, "ns"),
+    )
+
+
+def _split_ranges(
+    ranges: List[Range], shard_size: np.timedelta64, max_slices: int
+) -> List[Range]:
+    """
+    Splits (normalized) ranges into at most roughly `max_slices` slices. Slices never cross
+    a shard boundary, unless adjacent shards have been combined into a single slice.
+    """
+    shards: List[Range] = []
+
+    for start, end in ranges:
+        boundary = start - (start - np.datetime64(0, "ns")) % shard_size
+
+        while boundary < end:
+            shards.append((max(start, boundary), min(end, boundary + shard_size)))
+            boundary += shard_size
+
+    if len(shards) <= max_slices:
+        return shards
+
+    # Too many shards: group adjacent shards of the same range together.
+    per_slice = -(-len(shards) // max_slices)
+    groups: List[List[Range]] = []
+
+    for start, end in shards:
+        if groups and len(groups[-1]) < per_slice and groups[-1][-1][1] == start:
+            groups[-1].append((start, end))
+        else:
+            groups.append([(start, end)])
+
+    return [(xs[0][0], xs[-1][1]) for xs in groups]
+
+
+def _stream_arrays_parallel(
     conn: Cluster,
     tables: List[TableLike],
     *,
+    parallel: int,
+    pool: Pool,
+    ranges: Optional[RangeSet] = None,
+    **kwargs: Any,
+) -> Iterator[IndexedMaskedArrays]:
+    """
+    Reads every table in independent slices, split along the table's shard boundaries, with
+    up to `parallel` readers at the same time, each on a connection of its own acquired
+    from `pool`. Yields one set of arrays per slice, in the same order as a sequential read
+    would.
+    """
+    slices: List[Tuple[str, Range]] = []
+
+    for table in tables:
+        if isinstance(table, str):
+            table_name = table
+            table_ = table_cache.lookup(table_name, conn)
+        else:
+            table_name = table.get_name()
+            table_ = table
+
+        if ranges is None:
+            table_range = _table_range(conn, table_name)
+            table_ranges = [] if table_range is None else [table_range]
+        else:
+            table_ranges = _normalize_ranges(ranges)
+
+        shard_size = np.timedelta64(table_.get_shard_size()).astype("timedelta64[ns]")
+
+        # A few slices per reader, so that a dense slice doesn't hold up the others.
+        for slice_ in _split_ranges(table_ranges, shard_size, parallel * 4):
+            slices.append((table_name, slice_))
+
+    logger.debug(
+        "reading %d tables in %d slices, parallel: %d",
+        len(tables),
+        len(slices),
+        parallel,
+    )
+
+    def _read_slice(x: Tuple[str, Range]) -> IndexedMaskedArrays:
+        (table_name, slice_) = x
+
+        with pool.connect() as conn_:
+            return _read_all_arrays(conn_, [table_name], ranges=[slice_], **kwargs)
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        yield from executor.map(_read_slice, slices)
+
+
+def _reader_kwargs(
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int],
+    column_names: Optional[Sequence[str]],
+    ranges: Optional[RangeSet],
+    prefetch: int,
+    max_batch_bytes: int = 0,
+    table_column: Optional[str] = None,
+) -> Dict[str, Any]:
+    # Sanitize batch_size
+    if batch_size is None:
+        batch_size = 2**16
+    elif not isinstance(batch_size, int):
+        raise TypeError(
+            "batch_size should be an integer, but got: {} with value {}".format(
+                type(batch_size), str(batch_size)
+            )
+        )
+
+    if not isinstance(prefetch, int) or prefetch < 0:
+        raise TypeError(
+            "prefetch should be a non-negative integer, but got: {} with value {}".format(
+                type(prefetch), str(prefetch)
+            )
+        )
+
+    if not isinstance(max_batch_bytes, int) or max_batch_bytes < 0:
+        raise TypeError(
+            "max_batch_bytes should be a non-negative integer, but got: {} with value {}".format(
+                type(max_batch_bytes), str(max_batch_bytes)
+            )
+        )
+
+    kwargs: Dict[str, Any] = {
+        "batch_size": batch_size,
+        "prefetch": prefetch,
+        "max_batch_bytes": max_batch_bytes,
+        "table_column": table_column,
+    }
+
+    if column_names:
+        kwargs["column_names"] = column_names
+
+    if ranges:
+        kwargs["ranges"] = ranges
+
+    coerce_table_name_fn = lambda x: x if isinstance(x, str) else x.get_name()
+    kwargs["table_names"] = [coerce_table_name_fn(x) for x in tables]
+    return kwargs
+
+
+def _read_all_arrays(
+    conn: Union[Cluster, SessionWrapper],
+    tables: List[TableLike],
+    *,
     batch_size: Optional[int] = 2**16,
     column_names: Optional[Sequence[str]] = None,
     ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    masked: bool = True,
+    table_column: Optional[str] = None,
 ) -> IndexedMaskedArrays:
+    """
+    Drains a reader natively into one array per column, rather than concatenating
+    the arrays of every batch.
+    """
+    kwargs = _reader_kwargs(
+        tables,
+        batch_size=batch_size,
+        column_names=column_names,
+        ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+        table_column=table_column,
+    )
+    kwargs["masked"] = masked
+
+    with conn.reader(**kwargs) as reader:
+        return _reader_batch_to_arrays(reader.read_all())
+
+
+@overload
+def read_arrays(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    parallel: int = 1,
+    pool: Optional[Pool] = None,
+    masked: bool = True,
+    table_column: Optional[str] = None,
+    out: None = None,
+) -> IndexedMaskedArrays: ...
+
+
+@overload
+def read_arrays(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    parallel: int = 1,
+    pool: Optional[Pool] = None,
+    masked: bool = True,
+    table_column: Optional[str] = None,
+    out: Dict[str, Any],
+) -> int: ...
+
+
+def read_arrays(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    parallel: int = 1,
+    pool: Optional[Pool] = None,
+    masked: bool = True,
+    table_column: Optional[str] = None,
+    out: Optional[Dict[str, Any]] = None,
+) -> Union[IndexedMaskedArrays, int]:
     """
     Read any number of columns from tables as numpy masked arrays.
 
@@ -670,12 +1042,56 @@ def read_arrays(
       Time ranges to read.
       If None, the full available range is read.
 
+    prefetch: int
+      Amount of batches to fetch ahead of time in a background thread, while the
+      current batch is being converted. Defaults to 0, which fetches batches on demand.
+
+    max_batch_bytes: int
+      Approximate upper bound on the size of a single batch in bytes. When set, the
+      amount of rows per batch is derived from the size of the rows read so far, rather
+      than from `batch_size`, which keeps memory usage flat for both narrow and wide
+      tables. Defaults to 0, which always fetches `batch_size` rows.
+
+    parallel: int
+      Amount of readers to run at the same time. When larger than 1, the ranges are
+      split along the shard boundaries of each table, and the slices are read
+      concurrently, each on a connection acquired from `pool`. Rows are returned in
+      the same order as a sequential read. Defaults to 1.
+
+    pool: optional quasardb.pool.Pool
+      Pool to acquire the connections of the readers from, required when `parallel` is
+      larger than 1. With a `SingletonPool`, which keeps one connection per thread,
+      `parallel` readers use `parallel` connections. `conn` is then only used to look
+      up the tables and their ranges.
+
+    masked: bool
+      If False, columns are returned as plain numpy arrays rather than masked arrays,
+      with nulls represented by NaN, NaT, the minimum int64 value or None. This avoids
+      scanning columns for nulls altogether. Defaults to True; columns without any
+      nulls are always returned with `numpy.ma.nomask` rather than a full mask.
+
+    table_column: optional str
+      How the `$table` column is returned. Defaults to None, which returns the name of
+      the table of every row. If "codes", returns int32 codes instead, which are the
+      positions of the tables in `tables`. If "omit", leaves the column out entirely.
+      "codes" is only supported when `parallel` is 1.
+
+    out: optional dict[str, numpy.ndarray | tuple[numpy.ndarray, numpy.ndarray]]
+      Preallocated arrays to read into, keyed by column name, and optionally
+      `$timestamp` for the index. Every batch is written in place at the running
+      offset, rather than returning new arrays. Values can be a single array, or a
+      tuple of (values, validity) where validity is a bool array that is set to True
+      for every non-null value. int64, double and timestamp columns require int64,
+      float64 and datetime64[ns] arrays, string and blob columns require object arrays.
+      Only supported when `parallel` is 1.
+
     Returns:
     --------
 
     tuple[numpy.ndarray, dict[str, numpy.ma.MaskedArray]]
       A pair consisting of the shared timestamp index and a mapping of column
-      names to masked arrays.
+      names to masked arrays. When `out` is provided, the amount of rows written
+      instead.
 
     Examples:
     ---------
@@ -694,13 +1110,82 @@ def read_arrays(
     ... )
     >>> opens = cols["open"]
     >>> closes = cols["close"]
+
+    Read a multi-year range with 8 concurrent readers:
+
+    >>> with quasardb.pool.SingletonPool(uri="qdb://127.0.0.1:2836") as pool:
+    ...     idx, cols = qdbnp.read_arrays(
+    ...         conn, [my_table], ranges=[(start, end)], parallel=8, pool=pool
+    ...     )
+
+    Read into preallocated arrays:
+
+    >>> closes = np.empty(1_000_000, dtype=np.float64)
+    >>> valid = np.empty(1_000_000, dtype=np.bool_)
+    >>> n = qdbnp.read_arrays(conn, [my_table], out={"close": (closes, valid)})
     """
-    xs = stream_arrays(
+    if not isinstance(parallel, int) or parallel < 1:
+        raise ValueError(
+            "parallel should be a positive integer, but got: {} with value {}".format(
+                type(parallel), str(parallel)
+            )
+        )
+
+    if parallel > 1 and pool is None:
+        # Readers sharing a single connection would be serialized by it.
+        raise ValueError("a pool is required when parallel is larger than 1")
+
+    if table_column == "codes" and parallel != 1:
+        # Every slice is read by its own reader, which numbers its tables from 0.
+        raise ValueError('table_column="codes" is only supported when parallel is 1')
+
+    if out is not None:
+        if parallel != 1:
+            raise ValueError("out is only supported when parallel is 1")
+
+        # Don't fetch columns that have nowhere to go
+        if not column_names:
+            column_names = [x for x in out if x != "$timestamp"]
+
+        kwargs = _reader_kwargs(
+            tables,
+            batch_size=batch_size,
+            column_names=column_names,
+            ranges=ranges,
+            prefetch=prefetch,
+            max_batch_bytes=max_batch_bytes,
+            table_column=table_column,
+        )
+
+        with conn.reader(**kwargs) as reader:
+            return reader.read_into(out)
+
+    if parallel == 1:
+        return _read_all_arrays(
+            conn,
+            tables,
+            batch_size=batch_size,
+            column_names=column_names,
+            ranges=ranges,
+            prefetch=prefetch,
+            max_batch_bytes=max_batch_bytes,
+            masked=masked,
+            table_column=table_column,
+        )
+
+    assert pool is not None
+    xs = _stream_arrays_parallel(
         conn,
         tables,
+        parallel=parallel,
+        pool=pool,
+        ranges=ranges,
         batch_size=batch_size,
         column_names=column_names,
-        ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+        masked=masked,
+        table_column=table_column,
     )
 
     try:
@@ -713,6 +1198,43 @@ def read_arrays(
         return np.array([], dtype=np.dtype("datetime64[ns]")), {}
 
 
+def _slice_column(x: Any, start: int, end: int) -> Any:
+    if isinstance(x, Categorical):
+        return Categorical(x.codes[start:end], x.categories)
+
+    return x[start:end]
+
+
+def _group_by_table(
+    table_names: List[str], idx: NDArrayTime, xs: Dict[str, Any]
+) -> Iterator[TableMaskedArrays]:
+    """
+    Splits a batch read with `table_column="codes"` into the rows of every table. The
+    rows of a table are always contiguous within a batch, and the returned arrays are
+    views over the batch.
+    """
+    codes = xs.pop("$table")
+
+    if len(codes) == 0:
+        return
+
+    # Offsets at which the next table starts
+    bounds = (np.flatnonzero(codes[1:] != codes[:-1]) + 1).tolist()
+
+    for start, end in zip([0] + bounds, bounds + [len(codes)]):
+        yield (
+            table_names[codes[start]],
+            idx[start:end],
+            {cname: _slice_column(values, start, end) for cname, values in xs.items()},
+        )
+
+
+def _update_checkpoint(checkpoint: Optional[Dict[str, Any]], reader: Reader) -> None:
+    if checkpoint is not None:
+        checkpoint.update(reader.checkpoint() or {})
+
+
+@overload
 def stream_arrays(
     conn: Cluster,
     tables: List[TableLike],
@@ -720,35 +1242,176 @@ def stream_arrays(
     batch_size: Optional[int] = 2**16,
     column_names: Optional[Sequence[str]] = None,
     ranges: Optional[RangeSet] = None,
-) -> Iterator[IndexedMaskedArrays]:
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    zero_copy: bool = False,
+    strings: Optional[str] = None,
+    masked: bool = True,
+    resume_from: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    filter: Optional[List[Tuple[str, str, Any]]] = None,
+    table_column: Optional[str] = None,
+    group_by_table: Literal[False] = False,
+) -> Iterator[IndexedMaskedArrays]: ...
+
+
+@overload
+def stream_arrays(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    zero_copy: bool = False,
+    strings: Optional[str] = None,
+    masked: bool = True,
+    resume_from: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    filter: Optional[List[Tuple[str, str, Any]]] = None,
+    table_column: Optional[str] = None,
+    group_by_table: Literal[True],
+) -> Iterator[TableMaskedArrays]: ...
+
+
+def stream_arrays(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    zero_copy: bool = False,
+    strings: Optional[str] = None,
+    masked: bool = True,
+    resume_from: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    filter: Optional[List[Tuple[str, str, Any]]] = None,
+    table_column: Optional[str] = None,
+    group_by_table: bool = False,
+) -> Iterator[Union[IndexedMaskedArrays, TableMaskedArrays]]:
     """
     Read one or more tables as numpy masked arrays. Returns a generator with
     indexed batches of size `batch_size`, which is useful when traversing a
     large dataset which does not fit into memory.
+
+    When `strings` is "categorical", string columns are returned dictionary-encoded
+    as `Categorical` tuples of int32 codes and an array of unique values per batch,
+    rather than as a unicode array with one value per row.
+
+    When `prefetch` is larger than 0, up to that many batches are fetched in a
+    background thread while the caller is processing the current batch.
+
+    When `max_batch_bytes` is larger than 0, batches are sized to roughly that many
+    bytes, based on the size of the rows read so far, rather than to `batch_size`
+    rows. The first batch is capped at 1024 rows to measure the rows.
+
+    When `zero_copy` is True, int64 and double columns are views over the batch as
+    returned by the QuasarDB client rather than copies. These arrays are read-only,
+    and the batch is kept alive until the last of them is garbage collected, even if
+    the connection is closed in the meantime.
+
+    When `masked` is False, columns are returned as plain numpy arrays rather than
+    masked arrays, with nulls represented by NaN, NaT, the minimum int64 value or
+    None. Masked columns without nulls are returned with `numpy.ma.nomask`.
+
+    When `checkpoint` is a dict, it is updated in place with the position up to
+    which batches have been consumed: every time the next batch is requested, and
+    once more when the stream is exhausted. Providing a copy of it as `resume_from`
+    to a later call over the same tables and ranges only reads the remaining rows,
+    which allows restarting a long extraction after a failure.
+
+    When `filter` is set, only the rows matching all of its `(column, op, value)`
+    predicates are returned, where `op` is one of "==", "!=", "<", "<=", ">", ">=",
+    "in" and "not in". Rows are filtered before they are converted to numpy, and
+    null values never match. For example, `filter=[("price", ">", 100.0)]`.
+
+    `table_column` decides how the `$table` column is returned: by default as the
+    name of the table of every row, as int32 codes which are the positions of the
+    tables in `tables` with "codes", or not at all with "omit".
+
+    When `group_by_table` is True, yields `(table_name, idx, columns)` tuples
+    rather than `(idx, columns)`, with the rows of a single table each, and
+    without a `$table` column. Tables are told apart using codes, so no table
+    name is ever materialized per row. A table can span multiple batches, in
+    which case it is yielded multiple times, in order.
     """
-    # Sanitize batch_size
-    if batch_size is None:
-        batch_size = 2**16
-    elif not isinstance(batch_size, int):
-        raise TypeError(
-            "batch_size should be an integer, but got: {} with value {}".format(
-                type(batch_size), str(batch_size)
+    if group_by_table:
+        if table_column not in (None, "codes"):
+            raise ValueError(
+                "group_by_table requires table_column to be None or 'codes', got: {}".format(
+                    table_column
+                )
             )
-        )
 
-    kwargs: Dict[str, Any] = {"batch_size": batch_size}
+        table_column = "codes"
 
-    if column_names:
-        kwargs["column_names"] = column_names
-
-    if ranges:
-        kwargs["ranges"] = ranges
+    kwargs = _reader_kwargs(
+        tables,
+        batch_size=batch_size,
+        column_names=column_names,
+        ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+        table_column=table_column,
+    )
+    kwargs["zero_copy"] = zero_copy
+    kwargs["strings"] = strings
+    kwargs["masked"] = masked
+    kwargs["resume_from"] = resume_from
+    kwargs["filter"] = filter
 
-    coerce_table_name_fn = lambda x: x if isinstance(x, str) else x.get_name()
-    kwargs["table_names"] = [coerce_table_name_fn(x) for x in tables]
     with conn.reader(**kwargs) as reader:
+        table_names = reader.get_table_names()
+
         for batch in reader:
-            yield _reader_batch_to_arrays(batch)
+            _update_checkpoint(checkpoint, reader)
+
+            if group_by_table:
+                yield from _group_by_table(table_names, *_reader_batch_to_arrays(batch))
+            else:
+                yield _reader_batch_to_arrays(batch)
+
+        _update_checkpoint(checkpoint, reader)
+
+
+def stream_arrow(
+    conn: Cluster,
+    tables: List[TableLike],
+    *,
+    batch_size: Optional[int] = 2**16,
+    column_names: Optional[Sequence[str]] = None,
+    ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+) -> Iterator[Any]:
+    """
+    Read one or more tables as `pyarrow.RecordBatch` objects. Returns a generator
+    with batches of size `batch_size`, like `stream_arrays`.
+
+    Every batch has a `$timestamp` column followed by the columns returned by the
+    reader. Nulls are encoded in Arrow validity bitmaps, strings are returned as
+    `large_string` and blobs as `large_binary`.
+
+    Requires pyarrow, which is not a dependency of quasardb itself.
+    """
+    _ensure_pyarrow()
+
+    kwargs = _reader_kwargs(
+        tables,
+        batch_size=batch_size,
+        column_names=column_names,
+        ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+    )
+
+    with conn.reader(**kwargs) as reader:
+        yield from reader.arrow_batches()
 
 
 def write_arrays(
@@ -1089,12 +1752,13 @@ def _xform_query_results(
             )
         )
 
-    assert isinstance(xs, list)
+    # The results may be shared, e.g. when they come from a cache: leave them untouched.
     idx = xs[index][1]
-    del xs[index]
+    xs = [x for (i, x) in enumerate(xs) if i != index]
 
     # Our index *must* be a masked array, and there should be no
     # masked items: we cannot not have an index for a certain row.
+    idx_: NDArrayAny = idx
     if ma.isMA(idx):
         if ma.count_masked(idx) > 0:
             raise ValueError(
@@ -1102,12 +1766,12 @@ def _xform_query_results(
             )
 
         assert isinstance(idx.data, np.ndarray)
-        idx = idx.data
+        idx_ = idx.data
 
     if dict:
-        return idx, {x[0]: x[1] for x in xs}
+        return idx_, {x[0]: x[1] for x in xs}
     else:
-        return idx, [x[1] for x in xs]
+        return idx_, [x[1] for x in xs]
 
 
 def query(
@@ -1115,6 +1779,9 @@ def query(
     query: str,
     index: Optional[Union[str, int]] = None,
     dict: bool = False,
+    strings: Optional[str] = None,
+    masked: bool = True,
+    cache: Optional[QueryCache] = None,
 ) -> Tuple[NDArrayAny, Union[Dict[str, MaskedArrayAny], List[MaskedArrayAny]]]:
     """
     Execute a query and return the results as numpy arrays. The shape of the return value
@@ -1126,6 +1793,9 @@ def query(
     If `dict` is True, constructs a dict[str, np.array] where the key is the column name.
     Otherwise, it returns a list of all the individual data arrays.
 
+    Columns of array values are returned as `ListColumn` tuples, with the values of all
+    rows flattened into a single array.
+
 
 
     Parameters:
@@ -1145,8 +1815,237 @@ def query(
       If true, returns data arrays as a dict, otherwise a list of np.arrays.
       Defaults to False.
 
+    strings : optional[str]
+      If "categorical", string columns are returned dictionary-encoded, as `Categorical`
+      tuples of int32 codes and an array of unique values. Defaults to None, which
+      returns one Python string per row.
+
+    masked : bool
+      If False, columns are returned as plain numpy arrays rather than masked arrays,
+      with nulls represented by NaN, NaT, the minimum int64 value or None.
+      Defaults to True.
+
+    cache : optional[quasardb.query_cache.QueryCache]
+      If provided, results are looked up in and stored into this cache. Cached arrays are
+      shared between callers and must not be modified. Defaults to None.
+
     """
 
-    xs = cluster.query_numpy(query)
+    def _query() -> List[Tuple[str, Any]]:
+        return [
+            (cname, _ensure_column(values))
+            for (cname, values) in cluster.query_numpy(
+                query, strings=strings, masked=masked
+            )
+        ]
+
+    if cache is None:
+        xs = _query()
+    else:
+        xs = cache.cached(cluster, query, _query, variant=("numpy", strings, masked))
 
     return _xform_query_results(xs, index, dict)
+
+
+def stream_query(
+    cluster: quasardb.Cluster,
+    query: str,
+    chunk_rows: int = 2**16,
+    index: Optional[Union[str, int]] = None,
+    dict: bool = False,
+    strings: Optional[str] = None,
+    masked: bool = True,
+) -> Iterator[
+    Tuple[NDArrayAny, Union[Dict[str, MaskedArrayAny], List[MaskedArrayAny]]]
+]:
+    """
+    Execute a query and yield the results in chunks of at most `chunk_rows` rows. Each
+    chunk has the same shape as the return value of `query()`:
+
+      tuple[index, dict | list[np.array]]
+
+    Only one chunk is converted to numpy at a time, which bounds the memory used by the
+    converted arrays for large result sets. The query itself is still executed in full
+    before the first chunk is returned.
+
+    Parameters:
+    -----------
+
+    cluster : quasardb.Cluster
+      Active connection to the QuasarDB cluster
+
+    query : str
+      The query to execute.
+
+    chunk_rows : int
+      Maximum number of rows per chunk. Defaults to 65536.
+
+    index : optional[str | int]
+      If provided, resolves column and uses that as the index. If None, a row number
+      index is generated which keeps counting across chunks.
+
+    dict : bool
+      If true, returns data arrays as a dict, otherwise a list of np.arrays.
+      Defaults to False.
+
+    strings : optional[str]
+      If "categorical", string columns are returned dictionary-encoded. Categories are
+      computed per chunk. Defaults to None.
+
+    masked : bool
+      If False, columns are returned as plain numpy arrays rather than masked arrays.
+      Defaults to True.
+    """
+    if chunk_rows <= 0:
+        raise ValueError(
+            "chunk_rows must be a positive number, got: {}".format(chunk_rows)
+        )
+
+    stream = cluster.query_numpy_stream(
+        query, chunk_rows=chunk_rows, strings=strings, masked=masked
+    )
+
+    offset = 0
+    try:
+        for chunk in stream:
+            xs = [(cname, _ensure_column(values)) for (cname, values) in chunk]
+            n = xs[0][1].size if len(xs) > 0 else 0
+
+            if index is None and len(xs) > 0:
+                xs = [("$index", ma.masked_array(np.arange(offset, offset + n)))] + xs
+                yield _xform_query_results(xs, "$index", dict)
+            else:
+                yield _xform_query_results(xs, index, dict)
+
+            offset += n
+    finally:
+        stream.close()
+
+
+def _split_query_range(start: Any, end: Any, delta: Any) -> List[Range]:
+    """
+    Same slices as `Cluster.split_query_range()`, in nanoseconds rather than the
+    microsecond resolution of Python datetimes.
+    """
+    start_ = np.datetime64(start, "ns")
+    end_ = np.datetime64(end, "ns")
+    delta_ = np.timedelta64(delta).astype("timedelta64[ns]")
+
+    if delta_ <= np.timedelta64(0, "ns"):
+        raise ValueError("delta must be a positive duration, got: {}".format(delta))
+
+    ret: List[Range] = []
+    while start_ < end_:
+        next_ = min(start_ + delta_, end_)
+        ret.append((start_, next_))
+        start_ = next_
+
+    return ret
+
+
+def query_parallel(
+    conn: Union[Cluster, Pool],
+    template: str,
+    start: Any,
+    end: Any,
+    delta: Any,
+    *,
+    workers: int = 4,
+    index: Optional[Union[str, int]] = None,
+    dict: bool = False,
+    masked: bool = True,
+) -> Tuple[NDArrayAny, Union[Dict[str, MaskedArrayAny], List[MaskedArrayAny]]]:
+    """
+    Splits `[start, end)` into slices of `delta`, runs the query of every slice with up
+    to `workers` queries at the same time, each on a connection of its own, and merges
+    the results in range order. The return value has the same shape as `query()`.
+
+    Aggregations are computed per slice, e.g. `count(...)` returns one row per slice,
+    which can then be summed.
+
+    Parameters:
+    -----------
+
+    conn : quasardb.Cluster | quasardb.pool.Pool
+      Pool to acquire the connections from. With a `SingletonPool`, which keeps one
+      connection per thread, `workers` queries use `workers` connections. A single
+      connection is only accepted when `workers` is 1, as it would serialize the queries.
+
+    template : str
+      The query to execute, with `{start}` and `{end}` placeholders for the range of the
+      slice, e.g. `select count(close) from "stocks" in range({start}, {end})`.
+
+    start, end : datetime | numpy.datetime64
+      Time range to query, end exclusive.
+
+    delta : timedelta | numpy.timedelta64
+      Length of every slice. The last slice is shorter when the range is not a multiple
+      of `delta`.
+
+    workers : int
+      Maximum amount of queries running at the same time. Defaults to 4.
+
+    index, dict, masked
+      As with `query()`. When `index` is None, the generated row numbers run across all
+      slices. Columns of array values are returned as a single `ListColumn` for all
+      slices.
+
+    Examples:
+    ---------
+
+    >>> idx, (counts,) = qdbnp.query_parallel(
+    ...     pool,
+    ...     'select count(close) from "stocks" in range({start}, {end})',
+    ...     np.datetime64("2023-01-01"),
+    ...     np.datetime64("2024-01-01"),
+    ...     np.timedelta64(7, "D"),
+    ...     workers=8,
+    ... )
+    >>> total = counts.sum()
+    """
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError(
+            "workers should be a positive integer, but got: {} with value {}".format(
+                type(workers), str(workers)
+            )
+        )
+
+    if workers > 1 and not isinstance(conn, Pool):
+        raise ValueError("a pool is required when workers is larger than 1")
+
+    slices = _split_query_range(start, end, delta)
+    queries = [template.format(start=start_, end=end_) for (start_, end_) in slices]
+
+    logger.debug("querying %d slices, workers: %d: %s", len(queries), workers, template)
+
+    def _query_slice(q: str) -> List[Tuple[str, Any]]:
+        # The query itself runs without the GIL, so slices run concurrently.
+        if isinstance(conn, Pool):
+            with conn.connect() as conn_:
+                xs = conn_.query_numpy(q, masked=masked)
+        else:
+            xs = conn.query_numpy(q, masked=masked)
+
+        return [(cname, _ensure_column(values)) for (cname, values) in xs]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [xs for xs in executor.map(_query_slice, queries) if len(xs) > 0]
+
+    if len(results) == 0:
+        return _xform_query_results([], index, dict)
+
+    cnames = [cname for (cname, _) in results[0]]
+    for xs in results[1:]:
+        if [cname for (cname, _) in xs] != cnames:
+            raise ValueError(
+                "Slices returned different columns: {} and {}".format(
+                    cnames, [cname for (cname, _) in xs]
+                )
+            )
+
+    merged = [
+        (cname, _concat_masked([xs[i][1] for xs in results]))
+        for (i, cname) in enumerate(cnames)
+    ]
+
+    return _xform_query_results(merged, index, dict)
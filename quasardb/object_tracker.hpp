@@ -3,6 +3,7 @@
 #include <any>
 #include <cassert>
 #include <iostream>
+#include <iterator>
 #include <memory>
 #include <stack>
 #include <typeindex>
@@ -101,7 +102,10 @@ public:
 public:
     [[nodiscard]] static inline repository & instance() noexcept
     {
-        static repository instance_;
+        // Thread-local, because the writer releases the GIL while pushing: multiple threads
+        // may have a scope claimed at the same time, and they must not swap each other's
+        // objects in and out.
+        static thread_local repository instance_;
         // If this assertion fails it implies a component tries to have its objects
         // tracked but there is no collector being able to track these yet.
         //
@@ -122,6 +126,20 @@ public:
         std::swap(instance().xs_, x.xs_);
     };
 
+    /**
+     * Moves all tracked objects of another repository into the global scope.
+     *
+     * Used by `scoped_repository` to hand over objects that were tracked by another thread.
+     */
+    static inline void adopt(repository & x)
+    {
+        container_t & xs = instance().xs_;
+
+        xs.insert(
+            xs.end(), std::make_move_iterator(x.xs_.begin()), std::make_move_iterator(x.xs_.end()));
+        x.xs_.clear();
+    };
+
 public:
     // Delegate functions
 
@@ -211,6 +229,15 @@ public:
         repository::swap(repo_);
     };
 
+    /**
+     * Hands over all tracked objects to the repository currently in scope, e.g. after
+     * conversions were done on other threads, which track their objects in their own scope.
+     */
+    inline void release_into_scope()
+    {
+        repository::adopt(repo_);
+    };
+
 private:
     repository repo_;
 };
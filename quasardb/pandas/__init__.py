@@ -30,12 +30,14 @@ from __future__ import annotations
 
 import logging
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import quasardb
 import quasardb.numpy as qdbnp
 import quasardb.table_cache as table_cache
+from quasardb.query_cache import QueryCache
 from quasardb.quasardb import Cluster, Table, Writer
 from quasardb.typing import DType, MaskedArrayAny, Range, RangeSet
 
@@ -62,6 +64,26 @@ except ImportError:
     raise PandasRequired("The pandas library is required to handle pandas data formats")
 
 
+class WriteDataframesError(Exception):
+    """
+    Exception raised by `write_dataframes` when writing in parallel, and the data of
+    one or more tables could not be written.
+
+    `errors` maps the name of each of these tables to the error it encountered, and
+    `tables` lists the tables that were written successfully.
+    """
+
+    def __init__(self, errors: Dict[str, BaseException], tables: List[Table]):
+        super().__init__(
+            "Unable to write {} out of {} tables, first error: {}".format(
+                len(errors), len(errors) + len(tables), next(iter(errors.values()))
+            )
+        )
+
+        self.errors = errors
+        self.tables = tables
+
+
 # Constant mapping of numpy dtype to QuasarDB column type
 # TODO(leon): support this natively in qdb C api ? we have everything we need
 #             to understand dtypes.
@@ -90,12 +112,32 @@ _dtype_map: Dict[Any, quasardb.ColumnType] = {
 TableLike = Union[str, Table]
 
 
+def _categorical_to_pandas(xs: qdbnp.Categorical) -> pd.Categorical:
+    # Null values already have code -1: no per-row strings are materialized.
+    codes = np.asarray(ma.getdata(xs.codes), dtype=np.int32)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(xs.categories))
+
+
+def _categoricals_to_pandas(xs: Dict[str, Any]) -> Dict[str, Any]:
+    # Dictionary-encoded columns map directly onto pd.Categorical.
+    return {
+        cname: (
+            _categorical_to_pandas(values)
+            if isinstance(values, qdbnp.Categorical)
+            else values
+        )
+        for cname, values in xs.items()
+    }
+
+
 def query(
     cluster: Cluster,
     query: str,
     index: Optional[str] = None,
     blobs: bool = False,
     numpy: bool = True,
+    strings: Optional[str] = None,
+    cache: Optional[QueryCache] = None,
 ) -> pd.DataFrame:
     """
     Execute *query* and return the result as a pandas DataFrame.
@@ -112,6 +154,12 @@ def query(
         Column to use as index.  When None a synthetic index is created and
         named "$index".
 
+    strings : str | None, default None
+        If "categorical", string columns are returned as pd.Categorical.
+
+    cache : quasardb.query_cache.QueryCache | None, default None
+        If provided, results are looked up in and stored into this cache.
+
     blobs, numpy
         DEPRECATED - no longer used.  Supplying a non-default value raises a
         DeprecationWarning and the argument is ignored.
@@ -134,12 +182,15 @@ def query(
     # ------------------------------------------------------------------------------
 
     logger.debug("querying and returning as DataFrame: %s", query)
-    index_vals, m = qdbnp.query(cluster, query, index=index, dict=True)
+    index_vals, m = qdbnp.query(
+        cluster, query, index=index, dict=True, strings=strings, cache=cache
+    )
 
     index_name = "$index" if index is None else index
     index_obj = pd.Index(index_vals, name=index_name)
 
-    return pd.DataFrame(m, index=index_obj)
+    assert isinstance(m, dict)
+    return pd.DataFrame(_categoricals_to_pandas(m), index=index_obj)
 
 
 def stream_dataframes(
@@ -149,6 +200,13 @@ def stream_dataframes(
     batch_size: Optional[int] = 2**16,
     column_names: Optional[List[str]] = None,
     ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    strings: Optional[str] = None,
+    resume_from: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    filter: Optional[List[Tuple[str, str, Any]]] = None,
+    table_column: Optional[str] = None,
 ) -> Iterator[pd.DataFrame]:
     """
     Read a Pandas Dataframe from a QuasarDB Timeseries table. Returns a generator with dataframes of size `batch_size`, which is useful
@@ -177,6 +235,40 @@ def stream_dataframes(
       A list of time ranges to read, represented as tuples of Numpy datetime64[ns] objects.
       Defaults to the entire table.
 
+    prefetch : int
+      Amount of batches to fetch ahead of time in a background thread, while the current
+      dataframe is being processed. Defaults to 0, which fetches batches on demand.
+
+    max_batch_bytes : int
+      Approximate upper bound on the size of a single batch in bytes. When set, the amount of
+      rows per dataframe is derived from the size of the rows read so far instead of
+      `batch_size`. Defaults to 0, which always reads `batch_size` rows.
+
+    strings : optional str
+      If "categorical", string columns are returned as pd.Categorical, built from the
+      dictionary-encoded values of every batch. Defaults to None, which returns one
+      string per row.
+
+    resume_from : optional dict
+      Checkpoint as collected through `checkpoint` by an earlier, interrupted stream over the
+      same tables and ranges. Only the rows after the checkpoint are read.
+
+    checkpoint : optional dict
+      If provided, updated in place with the position up to which dataframes have been
+      consumed, every time the next dataframe is requested and once more at the end of the
+      stream.
+
+    filter : optional list
+      Predicates as `(column, op, value)` tuples, such as `[("price", ">", 100.0)]`, which rows
+      must all match to be returned. Supported operators are "==", "!=", "<", "<=", ">", ">=",
+      "in" and "not in". Rows are filtered before they are converted, and null values never
+      match. Defaults to None, which returns all rows.
+
+    table_column : optional str
+      How the `$table` column is returned. Defaults to None, which returns the table name of
+      every row. If "codes", returns int32 codes instead, which are positions in `tables`.
+      If "omit", leaves the column out.
+
     """
     for idx, xs in qdbnp.stream_arrays(
         conn,
@@ -184,8 +276,18 @@ def stream_dataframes(
         batch_size=batch_size,
         column_names=column_names,
         ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+        strings=strings,
+        resume_from=resume_from,
+        checkpoint=checkpoint,
+        filter=filter,
+        table_column=table_column,
     ):
-        yield pd.DataFrame(xs, index=pd.Index(idx, copy=False, name="$timestamp"))
+        yield pd.DataFrame(
+            _categoricals_to_pandas(xs),
+            index=pd.Index(idx, copy=False, name="$timestamp"),
+        )
 
 
 def stream_dataframe(
@@ -195,25 +297,33 @@ def stream_dataframe(
     batch_size: Optional[int] = 2**16,
     column_names: Optional[List[str]] = None,
     ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
+    max_batch_bytes: int = 0,
+    strings: Optional[str] = None,
+    resume_from: Optional[Dict[str, Any]] = None,
+    checkpoint: Optional[Dict[str, Any]] = None,
+    filter: Optional[List[Tuple[str, str, Any]]] = None,
 ) -> Iterator[pd.DataFrame]:
     """
     Read a single table and return a stream of dataframes. This is a convenience function that wraps around
     `stream_dataframes`.
     """
-    # For backwards compatibility, we drop the `$table` column returned: this is not strictly
+    # For backwards compatibility, we leave out the `$table` column: this is not strictly
     # necessary, but it also is somewhat reasonable to drop it when we're reading from a single
-    # table, which is the case here.
-    clean_df_fn = lambda df: df.drop(columns=["$table"])
-
-    return (
-        clean_df_fn(df)
-        for df in stream_dataframes(
-            conn,
-            [table],
-            batch_size=batch_size,
-            column_names=column_names,
-            ranges=ranges,
-        )
+    # table, which is the case here. The reader never materializes it to begin with.
+    return stream_dataframes(
+        conn,
+        [table],
+        batch_size=batch_size,
+        column_names=column_names,
+        ranges=ranges,
+        prefetch=prefetch,
+        max_batch_bytes=max_batch_bytes,
+        strings=strings,
+        resume_from=resume_from,
+        checkpoint=checkpoint,
+        filter=filter,
+        table_column="omit",
     )
 
 
@@ -224,10 +334,11 @@ def read_dataframe(
     batch_size: Optional[int] = 2**16,
     column_names: Optional[List[str]] = None,
     ranges: Optional[RangeSet] = None,
+    prefetch: int = 0,
 ) -> pd.DataFrame:
     """
-    Read a Pandas Dataframe from a QuasarDB Timeseries table. Wraps around stream_dataframes(), and
-    returns everything as a single dataframe. batch_size is always explicitly set to 0.
+    Read a Pandas Dataframe from a QuasarDB Timeseries table. Reads all batches natively into
+    one array per column, and returns everything as a single dataframe.
 
 
     Parameters:
@@ -251,25 +362,22 @@ def read_dataframe(
         )
         batch_size = 2**16
 
-    # Note that this is *lazy*, dfs is a generator, not a list -- as such, dataframes will be
-    # fetched on-demand, which means that an error could occur in the middle of processing
-    # dataframes.
-    dfs = stream_dataframe(
-        conn, table, batch_size=batch_size, column_names=column_names, ranges=ranges
+    idx, xs = qdbnp.read_arrays(
+        conn,
+        [table],
+        batch_size=batch_size,
+        column_names=column_names,
+        ranges=ranges,
+        prefetch=prefetch,
+        # For backwards compatibility, we leave out the `$table` column, see `stream_dataframe`.
+        table_column="omit",
     )
 
-    # if result of stream_dataframe is empty this could result in ValueError on pd.concat()
-    # as stream_dataframe is a generator there is no easy way to check for this condition without evaluation
-    # the most simple way is to catch the ValueError and return an empty DataFrame
-    try:
-        return pd.concat(dfs, copy=False)  #  type: ignore[call-overload]
-    except ValueError as e:
-        logger.error(
-            "Error while concatenating dataframes. This can happen if result set is empty. Returning empty dataframe. Error: %s",
-            e,
-        )
+    if len(idx) == 0:
         return pd.DataFrame()
 
+    return pd.DataFrame(xs, index=pd.Index(idx, copy=False, name="$timestamp"))
+
 
 def _extract_columns(
     df: pd.DataFrame, cinfos: List[Tuple[str, quasardb.ColumnType]]
@@ -295,6 +403,113 @@ def _extract_columns(
     return ret
 
 
+def _dataframe_to_arrays(
+    table: Table,
+    df: pd.DataFrame,
+    *,
+    create: bool,
+    shard_size: Optional[timedelta],
+) -> Tuple[Table, Dict[str, MaskedArrayAny]]:
+    logger.debug("quasardb.pandas.write_dataframe, create = %s", create)
+    assert isinstance(df, pd.DataFrame)
+
+    # Create table if requested
+    if create:
+        _create_table_from_df(df, table, shard_size)
+
+    cinfos = [(x.name, x.type) for x in table.list_columns()]
+
+    if not df.index.is_monotonic_increasing:
+        logger.warning(
+            "dataframe index is unsorted, resorting dataframe based on index"
+        )
+        df = df.sort_index().reindex()
+
+    # We pass everything else to our qdbnp.write_arrays function, as generally speaking
+    # it is (much) more sensible to deal with numpy arrays than Pandas dataframes:
+    # pandas has the bad habit of wanting to cast data to different types if your data
+    # is sparse, most notably forcing sparse integer arrays to floating points.
+
+    data = _extract_columns(df, cinfos)
+    data["$timestamp"] = ma.masked_array(
+        df.index.to_numpy(copy=False, dtype="datetime64[ns]")
+    )  # We cast to masked_array to enforce typing compliance
+
+    return (table, data)
+
+
+def _write_dataframes_parallel(
+    dfs: List[Tuple[Table, pd.DataFrame]],
+    cluster: quasardb.Cluster,
+    *,
+    parallel: int,
+    create: bool,
+    shard_size: Optional[timedelta],
+    **kwargs: Any,
+) -> List[Table]:
+    # Tables are written in groups, every group is converted and pushed with its own
+    # writer. A few groups per worker keeps the workers busy when some tables are
+    # larger than others.
+    #
+    # Only the pushes actually run in parallel, as they release the GIL: converting the
+    # dataframes into arrays is Python code, and is serialized by the GIL between the
+    # workers. It does overlap with the pushes of the other groups though.
+    group_size = max(1, -(-len(dfs) // (parallel * 4)))
+    groups = [dfs[i : i + group_size] for i in range(0, len(dfs), group_size)]
+
+    def _write_group(
+        group: List[Tuple[Table, pd.DataFrame]],
+    ) -> Tuple[List[Table], Dict[str, BaseException]]:
+        data_by_table = []
+        errors: Dict[str, BaseException] = {}
+
+        for table, df in group:
+            try:
+                data_by_table.append(
+                    _dataframe_to_arrays(
+                        table, df, create=create, shard_size=shard_size
+                    )
+                )
+            except Exception as e:
+                errors[table.get_name()] = e
+
+        if len(data_by_table) == 0:
+            return ([], errors)
+
+        try:
+            tables = qdbnp.write_arrays(
+                data_by_table, cluster, table=None, index=None, **kwargs
+            )
+        except Exception as e:
+            # A push is atomic for all tables of the group.
+            for table, _ in data_by_table:
+                errors[table.get_name()] = e
+
+            return ([], errors)
+
+        return (tables, errors)
+
+    logger.debug(
+        "writing %d dataframes in %d groups, parallel: %d",
+        len(dfs),
+        len(groups),
+        parallel,
+    )
+
+    ret: List[Table] = []
+    errors: Dict[str, BaseException] = {}
+
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        for tables_, errors_ in executor.map(_write_group, groups):
+            ret.extend(tables_)
+            errors.update(errors_)
+
+    if errors:
+        raise WriteDataframesError(errors, ret)
+
+    return ret
+
+
 def write_dataframes(
     dfs: Union[
         Dict[TableLike, pd.DataFrame],
@@ -319,6 +534,7 @@ def write_dataframes(
     writer: Optional[Writer] = None,
     write_through: bool = True,
     retries: Union[int, quasardb.RetryOptions] = 3,
+    parallel: int = 1,
     **kwargs: Any,
 ) -> List[Table]:
     """
@@ -341,8 +557,29 @@ def write_dataframes(
 
     shard_size: optional datetime.timedelta
       The shard size of the timeseries you wish to create when `create` is True.
+
+    parallel: optional int
+      Amount of worker threads pushing the dataframes. When larger than 1, the tables
+      are split into groups that are each pushed separately, with their own writer, so
+      a push is no longer atomic for all tables. Only the pushes run in parallel: the
+      dataframes are still converted one at a time, as the conversion holds the GIL,
+      so this mostly helps when pushing dominates. Errors are collected per table and
+      raised together as a `WriteDataframesError` once all groups have been written.
+      Defaults to 1.
     """
 
+    if not isinstance(parallel, int) or parallel < 1:
+        raise ValueError(
+            "Invalid argument: parallel should be a positive integer, got: {}".format(
+                parallel
+            )
+        )
+
+    if parallel > 1 and writer is not None:
+        raise ValueError(
+            "Invalid argument: a writer cannot be shared when writing in parallel"
+        )
+
     # If dfs is a dict, we convert it to a list of tuples.
     if isinstance(dfs, dict):
         dfs = list(dfs.items())
@@ -358,37 +595,34 @@ def write_dataframes(
 
         dfs_.append((table, df))
 
-    data_by_table = []
-
-    for table, df in dfs_:
-        logger.debug("quasardb.pandas.write_dataframe, create = %s", create)
-        assert isinstance(df, pd.DataFrame)
-
-        # Create table if requested
-        if create:
-            _create_table_from_df(df, table, shard_size)
-
-        cinfos = [(x.name, x.type) for x in table.list_columns()]
-
-        if not df.index.is_monotonic_increasing:
-            logger.warning(
-                "dataframe index is unsorted, resorting dataframe based on index"
-            )
-            df = df.sort_index().reindex()
-
-        # We pass everything else to our qdbnp.write_arrays function, as generally speaking
-        # it is (much) more sensible to deal with numpy arrays than Pandas dataframes:
-        # pandas has the bad habit of wanting to cast data to different types if your data
-        # is sparse, most notably forcing sparse integer arrays to floating points.
+    kwargs["deprecation_stacklevel"] = kwargs.get("deprecation_stacklevel", 1) + 1
 
-        data = _extract_columns(df, cinfos)
-        data["$timestamp"] = ma.masked_array(
-            df.index.to_numpy(copy=False, dtype="datetime64[ns]")
-        )  # We cast to masked_array to enforce typing compliance
+    if parallel > 1:
+        return _write_dataframes_parallel(
+            dfs_,
+            cluster,
+            parallel=parallel,
+            create=create,
+            shard_size=shard_size,
+            dtype=dtype,
+            push_mode=push_mode,
+            _async=_async,
+            fast=fast,
+            truncate=truncate,
+            truncate_range=truncate_range,
+            deduplicate=deduplicate,
+            deduplication_mode=deduplication_mode,
+            infer_types=infer_types,
+            write_through=write_through,
+            retries=retries,
+            **kwargs,
+        )
 
-        data_by_table.append((table, data))
+    data_by_table = [
+        _dataframe_to_arrays(table, df, create=create, shard_size=shard_size)
+        for table, df in dfs_
+    ]
 
-    kwargs["deprecation_stacklevel"] = kwargs.get("deprecation_stacklevel", 1) + 1
     return qdbnp.write_arrays(
         data_by_table,
         cluster,
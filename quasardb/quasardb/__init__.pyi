@@ -29,14 +29,14 @@ from ._integer import Integer
 from ._node import DirectBlob, DirectInteger, Node
 from ._options import Options
 from ._perf import Perf
-from ._query import FindQuery
+from ._query import FindQuery, NumpyQueryStream
 from ._reader import Reader
 from ._retry import RetryOptions
 from ._string import String
 from ._table import ColumnInfo, ColumnType, IndexedColumnInfo, Table
 from ._tag import Tag
 from ._timestamp import Timestamp
-from ._writer import Writer, WriterData, WriterPushMode
+from ._writer import Writer, WriterData, WriterPushFuture, WriterPushMode
 
 __all__ = [
     "BatchColumnInfo",
@@ -69,6 +69,7 @@ __all__ = [
     "Options",
     "Perf",
     "FindQuery",
+    "NumpyQueryStream",
     "Reader",
     "RetryOptions",
     "String",
@@ -80,6 +81,7 @@ __all__ = [
     "Timestamp",
     "Writer",
     "WriterData",
+    "WriterPushFuture",
     "WriterPushMode",
     "metrics",
 ]
@@ -2,9 +2,9 @@ from __future__ import annotations
 
 import datetime
 from types import TracebackType
-from typing import Any, Optional, Type
+from typing import Any, Literal, Optional, Type, overload
 
-from ..typing import MaskedArrayAny, RangeSet
+from ..typing import DType, MaskedArrayAny, NDArrayAny, RangeSet
 from ._batch_column import BatchColumnInfo
 from ._batch_inserter import TimeSeriesBatch
 from ._blob import Blob
@@ -15,9 +15,10 @@ from ._node import Node
 from ._options import Options
 from ._perf import Perf
 from ._properties import Properties
+from ._query import NumpyQueryStream
 from ._reader import Reader
 from ._string import String
-from ._table import Table
+from ._table import ColumnType, Table
 from ._tag import Tag
 from ._timestamp import Timestamp
 from ._writer import Writer
@@ -72,22 +73,84 @@ class Cluster:
     def properties(self) -> Properties: ...
     def purge_all(self, timeout: datetime.timedelta) -> None: ...
     def purge_cache(self, timeout: datetime.timedelta) -> None: ...
+    @overload
     def query(
-        self, query: str, blobs: bool | list[str] = False
+        self,
+        query: str,
+        blobs: bool | list[str] = False,
+        format: None = None,
     ) -> list[dict[str, Any]]: ...
+    @overload
+    def query(
+        self,
+        query: str,
+        blobs: bool | list[str] = False,
+        *,
+        format: Literal["tuples"],
+    ) -> tuple[list[str], list[tuple[Any, ...]]]: ...
+    @overload
+    def query(
+        self,
+        query: str,
+        blobs: bool | list[str] = False,
+        *,
+        format: Literal["columns"],
+    ) -> dict[str, list[Any]]: ...
+    @overload
+    def query(
+        self,
+        query: str,
+        blobs: bool | list[str] = False,
+        format: str | None = None,
+    ) -> (
+        list[dict[str, Any]]
+        | tuple[list[str], list[tuple[Any, ...]]]
+        | dict[str, list[Any]]
+    ): ...
     def query_continuous_full(
         self, query: str, pace: datetime.timedelta, blobs: bool | list[str] = False
     ) -> QueryContinuous: ...
     def query_continuous_new_values(
         self, query: str, pace: datetime.timedelta, blobs: bool | list[str] = False
     ) -> QueryContinuous: ...
-    def query_numpy(self, query: str) -> list[tuple[str, MaskedArrayAny]]: ...
+    def query_arrow(self, query: str) -> Any: ...
+    def describe_query(
+        self, query: str
+    ) -> list[tuple[str, Optional[ColumnType], Optional[DType]]]: ...
+    def clear_query_descriptions(self) -> None: ...
+    def query_numpy(
+        self, query: str, strings: Optional[str] = None, masked: bool = True
+    ) -> list[
+        tuple[
+            str,
+            MaskedArrayAny
+            | NDArrayAny
+            | tuple[MaskedArrayAny | NDArrayAny, NDArrayAny]
+            | tuple[NDArrayAny, Any, Optional[NDArrayAny]],
+        ]
+    ]: ...
+    def query_numpy_stream(
+        self,
+        query: str,
+        *,
+        chunk_rows: int = 65536,
+        strings: Optional[str] = None,
+        masked: bool = True,
+    ) -> NumpyQueryStream: ...
     def reader(
         self,
         table_names: list[str],
         column_names: list[str] = [],
         batch_size: int = 0,
         ranges: RangeSet = [],
+        prefetch: int = 0,
+        zero_copy: bool = False,
+        strings: Optional[str] = None,
+        max_batch_bytes: int = 0,
+        masked: bool = True,
+        resume_from: Optional[dict[str, Any]] = None,
+        filter: Optional[list[tuple[str, str, Any]]] = None,
+        table_column: Optional[str] = None,
     ) -> Reader: ...
     def string(self, alias: str) -> String: ...
     def suffix_count(self, suffix: str) -> int: ...
@@ -103,4 +166,4 @@ class Cluster:
     def ts_batch(self, column_info_list: list[BatchColumnInfo]) -> TimeSeriesBatch: ...
     def uri(self) -> str: ...
     def wait_for_compaction(self) -> None: ...
-    def writer(self) -> Writer: ...
+    def writer(self, *, max_pending: int = 2, staging_threads: int = 0) -> Writer: ...
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Awaitable
 
 # import datetime
 
 class QueryContinuous:
+    def __aiter__(self) -> QueryContinuous: ...
+    def __anext__(self) -> Awaitable[list[dict[str, Any]]]: ...
     def __iter__(self) -> QueryContinuous: ...
     def __next__(self) -> list[dict[str, Any]]: ...
     def probe_results(self) -> list[dict[str, Any]]: ...
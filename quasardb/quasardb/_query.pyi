@@ -1,2 +1,24 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from ..typing import MaskedArrayAny, NDArrayAny
+
 class FindQuery:
     def run(self) -> list[str]: ...
+
+class NumpyQueryStream:
+    def __iter__(self) -> NumpyQueryStream: ...
+    def __next__(
+        self,
+    ) -> list[
+        tuple[
+            str,
+            MaskedArrayAny
+            | NDArrayAny
+            | tuple[MaskedArrayAny | NDArrayAny, NDArrayAny]
+            | tuple[NDArrayAny, Any, Optional[NDArrayAny]],
+        ]
+    ]: ...
+    def close(self) -> None: ...
+    def get_chunk_rows(self) -> int: ...
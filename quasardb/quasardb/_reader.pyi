@@ -12,4 +12,13 @@ class Reader:
         exc_tb: Optional[TracebackType],
     ) -> None: ...
     def __iter__(self) -> Iterator[dict[str, Any]]: ...
+    def arrow_batches(self) -> Iterator[Any]: ...
+    def checkpoint(self) -> Optional[dict[str, Any]]: ...
+    def read_all(self) -> dict[str, Any]: ...
+    def read_into(self, out: dict[str, Any]) -> int: ...
     def get_batch_size(self) -> int: ...
+    def get_prefetch(self) -> int: ...
+    def get_max_batch_bytes(self) -> int: ...
+    def get_zero_copy(self) -> bool: ...
+    def get_masked(self) -> bool: ...
+    def get_table_names(self) -> list[str]: ...
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime
 from typing import Any, Iterable
 
 from quasardb.typing import Range
@@ -45,7 +46,20 @@ class WriterPushMode:
     @property
     def value(self) -> int: ...
 
+class WriterPushFuture:
+    def done(self) -> bool:
+        """Returns true if the push has completed, successfully or not"""
+
+    def result(self, timeout: datetime.timedelta | float | None = None) -> None:
+        """Waits for the push to complete, and raises its error if it failed"""
+
 class Writer:
+    def close(self) -> None:
+        """Flushes all background pushes and stops the background push thread"""
+
+    def flush(self) -> None:
+        """Waits for all background pushes to complete, raises the first error encountered"""
+
     def push(
         self,
         data: WriterData,
@@ -57,6 +71,19 @@ class Writer:
         range: Range,
         **kwargs: Any,
     ) -> None: ...
+    def push_nowait(
+        self,
+        data: WriterData,
+        write_through: bool,
+        push_mode: WriterPushMode,
+        deduplication_mode: str,
+        deduplicate: str,
+        retries: int,
+        range: Range,
+        **kwargs: Any,
+    ) -> WriterPushFuture:
+        """Hands the batch over to a background push thread, and returns a future-like handle to the push. Blocks while the background push queue is full."""
+
     def push_fast(
         self,
         data: WriterData,
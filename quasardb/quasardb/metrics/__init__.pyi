@@ -7,7 +7,7 @@ from __future__ import annotations
 from types import TracebackType
 from typing import Optional, Type
 
-__all__ = ["Measure", "clear", "totals"]
+__all__ = ["Measure", "clear", "counters", "increment", "totals"]
 
 class Measure:
     """
@@ -23,6 +23,9 @@ class Measure:
     ) -> None: ...
     def __init__(self) -> None: ...
     def get(self) -> dict[str, int]: ...
+    def get_counters(self) -> dict[str, int]: ...
 
 def clear() -> None: ...
+def counters() -> dict[str, int]: ...
+def increment(name: str, n: int = 1) -> None: ...
 def totals() -> dict[str, int]: ...
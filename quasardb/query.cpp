@@ -30,18 +30,26 @@
  */
 
 #include "query.hpp"
+#include "arrow.hpp"
 #include "masked_array.hpp"
 #include "metrics.hpp"
 #include "numpy.hpp"
 #include "traits.hpp"
 #include "utils.hpp"
+#include "convert/array.hpp"
 #include "convert/value.hpp"
 #include "detail/qdb_resource.hpp"
 #include <pybind11/stl.h>
+#include <range/v3/view/iota.hpp>
+#include <range/v3/view/transform.hpp>
+#include <algorithm>
+#include <bit>
+#include <cctype>
 #include <iostream>
 #include <set>
 #include <sstream>
 #include <string>
+#include <vector>
 
 namespace py = pybind11;
 
@@ -181,6 +189,110 @@ dict_query_result_t convert_query_results(const qdb_query_result_t * r, const py
     return convert_query_results(r, column_names, parse_blobs);
 }
 
+static inline py::object coerce_point_object(qdb_point_result_t p, bool parse_blob)
+{
+    if (p.type == qdb_query_result_none)
+    {
+        return py::none();
+    }
+
+    // Apart from None, `coerce_point` always returns a new reference.
+    return py::reinterpret_steal<py::object>(coerce_point(p, parse_blob));
+}
+
+/**
+ * Column names are interned, so that using them as dict keys or comparing them to
+ * literals on the Python side doesn't need to hash or compare their contents.
+ */
+static std::vector<py::str> intern_column_names(const qdb_query_result_t & r)
+{
+    std::vector<py::str> xs;
+    xs.reserve(r.column_count);
+
+    for (qdb_size_t i = 0; i < r.column_count; ++i)
+    {
+        PyObject * x = PyUnicode_FromStringAndSize(
+            r.column_names[i].data, static_cast<Py_ssize_t>(r.column_names[i].length));
+        if (x == nullptr)
+        {
+            throw py::error_already_set{};
+        }
+
+        PyUnicode_InternInPlace(&x);
+        xs.push_back(py::reinterpret_steal<py::str>(x));
+    }
+
+    return xs;
+}
+
+static py::tuple convert_query_tuples(const qdb_query_result_t * r, const py::object & blobs)
+{
+    if (!r) return py::make_tuple(py::list{}, py::list{});
+
+    const std::vector<std::string> column_names = coerce_column_names(*r);
+    const std::vector<bool> parse_blobs         = coerce_blobs_opt(column_names, blobs);
+    const std::vector<py::str> names            = intern_column_names(*r);
+
+    py::list names_{r->column_count};
+    for (qdb_size_t j = 0; j < r->column_count; ++j)
+    {
+        PyList_SET_ITEM(names_.ptr(), j, names[j].inc_ref().ptr());
+    }
+
+    // Lists and tuples are allocated with their final size, and their items are set
+    // directly, which steals the reference of each value.
+    py::list rows{r->row_count};
+    for (qdb_size_t i = 0; i < r->row_count; ++i)
+    {
+        py::tuple row{r->column_count};
+
+        for (qdb_size_t j = 0; j < r->column_count; ++j)
+        {
+            PyTuple_SET_ITEM(
+                row.ptr(), j, coerce_point_object(r->rows[i][j], parse_blobs[j]).release().ptr());
+        }
+
+        PyList_SET_ITEM(rows.ptr(), i, row.release().ptr());
+    }
+
+    return py::make_tuple(std::move(names_), std::move(rows));
+}
+
+static py::dict convert_query_columns(const qdb_query_result_t * r, const py::object & blobs)
+{
+    py::dict ret{};
+    if (!r) return ret;
+
+    const std::vector<std::string> column_names = coerce_column_names(*r);
+    const std::vector<bool> parse_blobs         = coerce_blobs_opt(column_names, blobs);
+    const std::vector<py::str> names            = intern_column_names(*r);
+
+    std::vector<py::list> columns;
+    columns.reserve(r->column_count);
+
+    for (qdb_size_t j = 0; j < r->column_count; ++j)
+    {
+        columns.emplace_back(r->row_count);
+    }
+
+    for (qdb_size_t i = 0; i < r->row_count; ++i)
+    {
+        for (qdb_size_t j = 0; j < r->column_count; ++j)
+        {
+            PyList_SET_ITEM(columns[j].ptr(), i,
+                coerce_point_object(r->rows[i][j], parse_blobs[j]).release().ptr());
+        }
+    }
+
+    // As with dict rows, the last column wins when several have the same name.
+    for (qdb_size_t j = 0; j < r->column_count; ++j)
+    {
+        ret[names[j]] = std::move(columns[j]);
+    }
+
+    return ret;
+}
+
 qdb::masked_array numpy_null_array(qdb_size_t row_count)
 {
     py::array::ShapeContainer shape{row_count};
@@ -190,201 +302,572 @@ qdb::masked_array numpy_null_array(qdb_size_t row_count)
     return qdb::masked_array::masked_all(data);
 }
 
-template <qdb_query_result_value_type_t ResultType>
-struct numpy_util
+static inline bool is_array(query_column_type_t type) noexcept
 {
-    static constexpr decltype(auto) get_value(qdb_point_result_t const &);
-};
+    return type >= query_column_array_int64;
+}
 
-template <>
-struct numpy_util<qdb_query_result_double>
+/**
+ * Combines the type a column is converted to so far with the type of one more of its
+ * values. int64 and double values are combined into doubles, any other combination of
+ * scalar types into Python objects. Arrays cannot be combined with anything else.
+ */
+static query_column_type_t combine_column_type(
+    query_column_type_t lhs, qdb_query_result_value_type_t rhs)
 {
+    query_column_type_t rhs_;
 
-    using value_type = std::double_t;
-    using dtype      = traits::float64_dtype;
+    switch (rhs)
+    {
+    case qdb_query_result_none:
+        return lhs;
+    case qdb_query_result_int64:
+    case qdb_query_result_count:
+        rhs_ = query_column_int64;
+        break;
+    case qdb_query_result_double:
+        rhs_ = query_column_double;
+        break;
+    case qdb_query_result_timestamp:
+        rhs_ = query_column_timestamp;
+        break;
+    case qdb_query_result_string:
+        rhs_ = query_column_string;
+        break;
+    case qdb_query_result_blob:
+        rhs_ = query_column_blob;
+        break;
+    case qdb_query_result_array_int64:
+        rhs_ = query_column_array_int64;
+        break;
+    case qdb_query_result_array_double:
+        rhs_ = query_column_array_double;
+        break;
+    case qdb_query_result_array_timestamp:
+        rhs_ = query_column_array_timestamp;
+        break;
+    case qdb_query_result_array_string:
+        rhs_ = query_column_array_string;
+        break;
+    case qdb_query_result_array_blob:
+        rhs_ = query_column_array_blob;
+        break;
+    default: {
+        std::stringstream ss;
+        ss << "unrecognized query result column type: " << rhs;
+        throw qdb::incompatible_type_exception(ss.str());
+    }
+    }
 
-    static constexpr std::double_t get_value(qdb_point_result_t const & row) noexcept
+    if (lhs == query_column_none || lhs == rhs_)
     {
-        return row.payload.double_.value;
+        return rhs_;
     }
-};
+    else if (is_array(lhs) || is_array(rhs_))
+    {
+        // Arrays cannot be Python objects: their values are only ever returned flattened.
+        std::stringstream ss;
+        ss << "query result column mixes arrays with other values: " << lhs << " and " << rhs_;
+        throw qdb::incompatible_type_exception(ss.str());
+    }
+    else if ((lhs == query_column_int64 && rhs_ == query_column_double)
+             || (lhs == query_column_double && rhs_ == query_column_int64))
+    {
+        return query_column_double;
+    }
+
+    return query_column_object;
+}
 
-template <>
-struct numpy_util<qdb_query_result_int64>
+static inline bool is_numeric(query_column_type_t type) noexcept
 {
-    using value_type = std::int64_t;
-    using dtype      = traits::int64_dtype;
+    return type == query_column_int64 || type == query_column_double || type == query_column_timestamp;
+}
 
-    static constexpr std::int64_t get_value(qdb_point_result_t const & row) noexcept
+static inline std::int64_t null_slot(query_column_type_t type) noexcept
+{
+    switch (type)
     {
-        return row.payload.int64_.value;
+    case query_column_double:
+        return std::bit_cast<std::int64_t>(traits::float64_dtype::null_value());
+    case query_column_timestamp:
+        return traits::datetime64_ns_dtype::null_value();
+    default:
+        return traits::int64_dtype::null_value();
     }
-};
+}
 
-template <>
-struct numpy_util<qdb_query_result_blob>
+static inline std::int64_t value_slot(query_column_type_t type, qdb_point_result_t const & x) noexcept
 {
-    using value_type = py::object;
-    using dtype      = traits::pyobject_dtype;
+    std::int64_t ret{0};
 
-    static inline py::object get_value(qdb_point_result_t const & row) noexcept
+    switch (x.type)
     {
-        return py::bytes{
-            static_cast<char const *>(row.payload.blob.content), row.payload.blob.content_length};
+    case qdb_query_result_int64:
+        ret = x.payload.int64_.value;
+        break;
+    case qdb_query_result_count:
+        ret = static_cast<std::int64_t>(x.payload.count.value);
+        break;
+    case qdb_query_result_double:
+        return std::bit_cast<std::int64_t>(x.payload.double_.value);
+    case qdb_query_result_timestamp:
+        return convert::value<qdb_timespec_t, std::int64_t>(x.payload.timestamp.value);
+    default:
+        break;
     }
-};
 
-template <>
-struct numpy_util<qdb_query_result_string>
+    // Integers in a double column
+    return type == query_column_double ? std::bit_cast<std::int64_t>(static_cast<std::double_t>(ret))
+                                       : ret;
+}
+
+/**
+ * Values of a single column, as collected in a single pass over its rows. Numeric values
+ * are stored in 8 byte slots, as int64, double or nanosecond timestamps depending on
+ * `type`, which numpy takes over as-is. For strings, blobs and mixed columns only the
+ * nulls are collected, as their values need the GIL to become Python objects.
+ *
+ * Arrays are flattened: `offsets` has the offset of the first value of every row, plus the
+ * total amount of values, which are stored in `values` as above. Strings and blobs in arrays
+ * are concatenated in `bytes`, with `value_offsets` the offset of every value in it.
+ */
+struct query_column_values
 {
-    using value_type = py::object;
-    using dtype      = traits::pyobject_dtype;
+    query_column_type_t type{query_column_none};
+    std::vector<std::int64_t> values;
+    std::vector<qdb_size_t> nulls;
 
-    static inline py::object get_value(qdb_point_result_t const & row) noexcept
-    {
-        return py::str{row.payload.string.content, row.payload.string.content_length};
-    }
+    std::vector<std::int64_t> offsets;
+    std::vector<std::int64_t> value_offsets;
+    std::vector<std::uint8_t> bytes;
 };
 
-template <>
-struct numpy_util<qdb_query_result_count>
+static inline void append_query_bytes(query_column_values & xs, void const * data, qdb_size_t n)
 {
-    using value_type = std::int64_t;
-    using dtype      = traits::int64_dtype;
+    std::uint8_t const * data_ = static_cast<std::uint8_t const *>(data);
+
+    xs.bytes.insert(xs.bytes.end(), data_, data_ + n);
+    xs.value_offsets.push_back(static_cast<std::int64_t>(xs.bytes.size()));
+}
 
-    static constexpr std::int64_t get_value(qdb_point_result_t const & row) noexcept
+/**
+ * Appends the values of a single array to the flattened values of its column, and returns
+ * the amount of values appended.
+ */
+static qdb_size_t append_query_array(query_column_values & xs, qdb_point_result_t const & x)
+{
+    switch (x.type)
     {
-        return row.payload.count.value;
+    case qdb_query_result_array_int64: {
+        auto values = query_array<qdb_query_result_array_int64>::get(x);
+        xs.values.insert(xs.values.end(), values.begin(), values.end());
+        return values.size();
+    }
+
+    case qdb_query_result_array_double: {
+        auto values = query_array<qdb_query_result_array_double>::get(x);
+        for (double v : values)
+        {
+            xs.values.push_back(std::bit_cast<std::int64_t>(v));
+        }
+        return values.size();
     }
-};
 
-template <>
-struct numpy_util<qdb_query_result_timestamp>
+    case qdb_query_result_array_timestamp: {
+        auto values = query_array<qdb_query_result_array_timestamp>::get(x);
+        for (qdb_timespec_t const & v : values)
+        {
+            xs.values.push_back(convert::value<qdb_timespec_t, std::int64_t>(v));
+        }
+        return values.size();
+    }
+
+    case qdb_query_result_array_string: {
+        auto values = query_array<qdb_query_result_array_string>::get(x);
+        for (qdb_string_t const & v : values)
+        {
+            append_query_bytes(xs, v.data, v.length);
+        }
+        return values.size();
+    }
+
+    case qdb_query_result_array_blob: {
+        auto values = query_array<qdb_query_result_array_blob>::get(x);
+        for (qdb_blob_t const & v : values)
+        {
+            append_query_bytes(xs, v.content, v.content_length);
+        }
+        return values.size();
+    }
+
+    default:
+        // Guarded against by `combine_column_type()`.
+        return 0;
+    }
+}
+
+/**
+ * Collects the values of an array column. Null rows are empty.
+ */
+static query_column_values collect_query_arrays(
+    qdb_query_result_t const & r, qdb_size_t column, query_column_type_t type)
 {
-    using value_type = std::int64_t;
-    using dtype      = traits::datetime64_ns_dtype;
+    query_column_values ret{};
+    ret.type = type;
+
+    ret.offsets.reserve(r.row_count + 1);
+    ret.offsets.push_back(0);
 
-    static constexpr std::int64_t get_value(qdb_point_result_t const & row) noexcept
+    if (type == query_column_array_string || type == query_column_array_blob)
     {
-        return convert::value<qdb_timespec_t, std::int64_t>(row.payload.timestamp.value);
+        ret.value_offsets.push_back(0);
     }
-};
 
-template <qdb_query_result_value_type_t ResultType>
-struct numpy_converter
+    for (qdb_size_t i = 0; i < r.row_count; ++i)
+    {
+        qdb_point_result_t const & x = r.rows[i][column];
+        qdb_size_t n                 = 0;
+
+        if (x.type == qdb_query_result_none)
+        {
+            ret.nulls.push_back(i);
+        }
+        else
+        {
+            // Throws if anything other than an array of this type shows up.
+            combine_column_type(ret.type, x.type);
+            n = append_query_array(ret, x);
+        }
+
+        ret.offsets.push_back(ret.offsets.back() + static_cast<std::int64_t>(n));
+    }
+
+    return ret;
+}
+
+/**
+ * Collects the values of a column, starting out as `type` (which is only widened), without
+ * touching any Python objects. The values are only allocated once the first value of a
+ * numeric type is encountered, so all-null and object columns never allocate them.
+ */
+static query_column_values collect_query_column(
+    qdb_query_result_t const & r, qdb_size_t column, query_column_type_t type)
 {
-    using dtype = typename numpy_util<ResultType>::dtype;
+    if (is_array(type))
+    {
+        return collect_query_arrays(r, column, type);
+    }
+
+    query_column_values ret{};
+    ret.type = type;
+
+    if (is_numeric(ret.type))
+    {
+        ret.values.assign(r.row_count, null_slot(ret.type));
+    }
 
-    static decltype(auto) convert(qdb_size_t column, qdb_point_result_t ** rows, qdb_size_t row_count)
+    for (qdb_size_t i = 0; i < r.row_count; ++i)
     {
-        using value_type = typename numpy_util<ResultType>::value_type;
-        py::dtype dtype_ = dtype::dtype();
+        qdb_point_result_t const & x = r.rows[i][column];
 
-        auto fn = numpy_util<ResultType>::get_value;
+        if (x.type == qdb_query_result_none)
+        {
+            ret.nulls.push_back(i);
 
-        py::array data(dtype_, py::array::ShapeContainer{row_count});
-        qdb::mask mask = qdb::mask::of_all<true>(row_count);
+            if (is_numeric(ret.type))
+            {
+                ret.values[i] = null_slot(ret.type);
+            }
 
-        auto data_f = data.template mutable_unchecked<value_type, 1>();
+            continue;
+        }
 
-        bool * mask_ = mask.mutable_data();
+        query_column_type_t type_ = combine_column_type(ret.type, x.type);
 
-        for (qdb_size_t i = 0; i < row_count; ++i, ++mask_)
+        if (type_ != ret.type) [[unlikely]]
         {
-            bool masked = (rows[i][column].type == qdb_query_result_none);
-            *mask_      = masked;
-
-            if (!masked)
+            if (is_array(type_))
             {
-                data_f(i) = fn(rows[i][column]);
+                // Everything before the first array is null, which is cheap to start over.
+                return collect_query_arrays(r, column, type_);
             }
+            else if (ret.type == query_column_int64 && type_ == query_column_double)
+            {
+                // int64 and double have the same size: upcast everything so far in place,
+                // after which the nulls need the null value of doubles instead.
+                for (qdb_size_t j = 0; j < i; ++j)
+                {
+                    ret.values[j] =
+                        std::bit_cast<std::int64_t>(static_cast<std::double_t>(ret.values[j]));
+                }
+
+                for (qdb_size_t j : ret.nulls)
+                {
+                    ret.values[j] = null_slot(type_);
+                }
+            }
+            else if (ret.type == query_column_none && is_numeric(type_))
+            {
+                // Everything before the first value is null.
+                ret.values.resize(r.row_count);
+                std::fill_n(ret.values.begin(), i, null_slot(type_));
+            }
+            else if (!is_numeric(type_))
+            {
+                ret.values = {};
+            }
+
+            ret.type = type_;
         }
 
-        return qdb::masked_array{data, mask};
+        if (is_numeric(ret.type))
+        {
+            ret.values[i] = value_slot(ret.type, x);
+        }
     }
-};
 
-/**
- * Nothing to convert for columns without type, just return an array filled with null
- * values.
- */
-template <>
-struct numpy_converter<qdb_query_result_none>
+    return ret;
+}
+
+std::vector<query_column_type_t> query_column_types(qdb_query_result_t const & r)
 {
-    static qdb::masked_array convert(
-        qdb_size_t /* column */, qdb_point_result_t ** /* rows */, qdb_size_t row_count)
+    std::vector<query_column_type_t> ret(r.column_count, query_column_none);
+
+    for (qdb_size_t i = 0; i < r.row_count; ++i)
     {
-        return numpy_null_array(row_count);
+        for (qdb_size_t j = 0; j < r.column_count; ++j)
+        {
+            ret[j] = combine_column_type(ret[j], r.rows[i][j].type);
+        }
     }
-};
 
-qdb_query_result_value_type_t probe_column_type(qdb_query_result_t const & r, qdb_size_t column)
+    return ret;
+}
+
+static qdb::mask query_column_mask(std::vector<qdb_size_t> const & nulls, qdb_size_t row_count)
 {
-    // Probe a column for its value type, by returning the type of the first non-null
-    // value.
-    for (qdb_size_t row = 0; row < r.row_count; ++row)
+    // Only allocate a mask if there actually is something to mask.
+    if (nulls.empty())
     {
-        if (r.rows[row][column].type != qdb_query_result_none)
+        return qdb::mask::lazy_none(row_count);
+    }
+    else if (nulls.size() == row_count)
+    {
+        return qdb::mask::of_all<true>(row_count);
+    }
+
+    py::array_t<bool> mask{py::array::ShapeContainer{row_count}};
+    bool * mask_ = mask.mutable_data();
+
+    {
+        py::gil_scoped_release release{};
+
+        std::fill_n(mask_, row_count, false);
+        for (qdb_size_t i : nulls)
         {
-            return r.rows[row][column].type;
+            mask_[i] = true;
         }
     }
 
-    // No non-null values were part of the dataset.
-    return qdb_query_result_none;
+    return qdb::mask{mask, detail::mask_mixed};
 }
 
-qdb::masked_array numpy_query_array(qdb_query_result_t const & r, qdb_size_t column)
+static py::array query_column_objects(qdb_query_result_t const & r, qdb_size_t column)
 {
+    py::array data(traits::pyobject_dtype::dtype(), py::array::ShapeContainer{r.row_count});
+    auto data_f = data.template mutable_unchecked<py::object, 1>();
 
-    switch (probe_column_type(r, column))
+    // Nulls become None, and mixed columns get the Python value of each row's own type.
+    for (qdb_size_t i = 0; i < r.row_count; ++i)
     {
+        data_f(i) = coerce_point_object(r.rows[i][column], true);
+    }
 
-#define CASE(t) \
-    case t:     \
-        return numpy_converter<t>::convert(column, r.rows, r.row_count);
+    return data;
+}
 
-        CASE(qdb_query_result_double);
-        CASE(qdb_query_result_int64);
-        CASE(qdb_query_result_string);
-        CASE(qdb_query_result_blob);
-        CASE(qdb_query_result_timestamp);
-        CASE(qdb_query_result_count);
-        CASE(qdb_query_result_none);
+/**
+ * Dictionary-encodes a string column, see `convert::categorical()`.
+ */
+py::tuple numpy_query_categorical(qdb_query_result_t const & r, qdb_size_t column, bool masked)
+{
+    auto xs = ranges::views::iota(qdb_size_t{0}, r.row_count)
+              | ranges::views::transform([&r, column](qdb_size_t i) -> qdb_string_t {
+                    qdb_point_result_t const & x = r.rows[i][column];
 
-    default: {
-        std::stringstream ss;
-        ss << "unrecognized query result column type: " << r.rows[0][column].type;
-        throw qdb::incompatible_type_exception(ss.str());
+                    qdb_string_t ret{nullptr, 0};
+                    if (x.type == qdb_query_result_string)
+                    {
+                        ret.data   = x.payload.string.content;
+                        ret.length = x.payload.string.content_length;
+                    }
+
+                    return ret;
+                });
+
+    return convert::categorical(xs, masked);
+}
+
+static py::array owned_bytes(std::vector<std::uint8_t> && xs)
+{
+    using vector_type = std::vector<std::uint8_t>;
+
+    auto * xs_ = new vector_type{std::move(xs)};
+    py::capsule owner{xs_, [](void * p) { delete static_cast<vector_type *>(p); }};
+
+    return py::array{
+        py::dtype::of<std::uint8_t>(), {static_cast<py::ssize_t>(xs_->size())}, xs_->data(), owner};
+}
+
+/**
+ * Converts a flattened array column into a tuple of (offsets, values, mask), where
+ * `offsets` has `row_count + 1` entries and the values of row `i` are
+ * `values[offsets[i]:offsets[i + 1]]`. Strings and blobs are returned as a nested
+ * (offsets, bytes, None) tuple. `mask` is None when `masked` is false, in which case null
+ * rows are only recognizable as being empty.
+ */
+static py::tuple numpy_query_arrays(qdb_size_t row_count, query_column_values && xs, bool masked)
+{
+    py::object values;
+
+    switch (xs.type)
+    {
+    case query_column_array_int64:
+        values = convert::owned_array<traits::int64_dtype>(std::move(xs.values));
+        break;
+
+    case query_column_array_double:
+        values = convert::owned_array<traits::float64_dtype>(std::move(xs.values));
+        break;
+
+    case query_column_array_timestamp:
+        values = convert::owned_array<traits::datetime64_ns_dtype>(std::move(xs.values));
+        break;
+
+    default:
+        values = py::make_tuple(convert::owned_array<traits::int64_dtype>(std::move(xs.value_offsets)),
+            owned_bytes(std::move(xs.bytes)), py::none());
+        break;
     }
-    };
+
+    py::object mask = py::none();
+    if (masked)
+    {
+        mask = query_column_mask(xs.nulls, row_count).array();
+    }
+
+    return py::make_tuple(
+        convert::owned_array<traits::int64_dtype>(std::move(xs.offsets)), std::move(values), mask);
 }
 
-numpy_query_column_t numpy_query_column(qdb_query_result_t const & r, qdb_size_t column)
+numpy_query_column_t numpy_query_column(qdb_query_result_t const & r,
+    qdb_size_t column,
+    query_column_values && xs,
+    convert::strings_mode_t strings,
+    bool masked)
 {
 
     qdb::numpy_query_column_t ret;
-    ret.first  = qdb::to_string(r.column_names[column]);
-    ret.second = py::cast(numpy_query_array(r, column));
+    ret.first = qdb::to_string(r.column_names[column]);
+
+    py::array data;
+
+    switch (xs.type)
+    {
+    case query_column_none:
+        // Nothing to convert for columns without type, just return an array filled with
+        // null values.
+        ret.second = numpy_null_array(r.row_count).to_object(masked);
+        return ret;
+
+    case query_column_string:
+        if (strings == convert::strings_mode_categorical)
+        {
+            ret.second = numpy_query_categorical(r, column, masked);
+            return ret;
+        }
+
+        data = query_column_objects(r, column);
+        break;
+
+    case query_column_int64:
+        data = convert::owned_array<traits::int64_dtype>(std::move(xs.values));
+        break;
+
+    case query_column_double:
+        data = convert::owned_array<traits::float64_dtype>(std::move(xs.values));
+        break;
+
+    case query_column_timestamp:
+        data = convert::owned_array<traits::datetime64_ns_dtype>(std::move(xs.values));
+        break;
+
+    case query_column_blob:
+    case query_column_object:
+        data = query_column_objects(r, column);
+        break;
+
+    case query_column_array_int64:
+    case query_column_array_double:
+    case query_column_array_timestamp:
+    case query_column_array_string:
+    case query_column_array_blob:
+        ret.second = numpy_query_arrays(r.row_count, std::move(xs), masked);
+        return ret;
+    }
+
+    ret.second = qdb::masked_array{data, query_column_mask(xs.nulls, r.row_count)}.to_object(masked);
     return ret;
 }
 
-numpy_query_result_t numpy_query_results(qdb_query_result_t const & r)
+static std::vector<query_column_type_t> query_column_types_nogil(qdb_query_result_t const & r)
+{
+    // This walks the native result set only: don't block other Python threads while
+    // doing so.
+    py::gil_scoped_release release{};
+    return query_column_types(r);
+}
+
+static numpy_query_result_t numpy_query_results(qdb_query_result_t const & r,
+    std::vector<query_column_type_t> const & column_types,
+    convert::strings_mode_t strings,
+    bool masked)
 {
+    std::vector<query_column_values> columns;
+    columns.reserve(r.column_count);
+
+    {
+        // Every column is collected in a single pass over its rows, which only touches
+        // native memory: other Python threads can run in the meantime.
+        py::gil_scoped_release release{};
+
+        for (qdb_size_t j = 0; j < r.column_count; ++j)
+        {
+            columns.push_back(
+                collect_query_column(r, j, column_types.empty() ? query_column_none : column_types[j]));
+        }
+    }
+
     qdb::numpy_query_result_t ret{};
     ret.reserve(r.column_count);
 
-    // First initialize the result vector. This means storing the column names,
-    // and pre-allocating the column result arrays with data points for each .
     for (qdb_size_t j = 0; j < r.column_count; ++j)
     {
-        ret.push_back(numpy_query_column(r, j));
+        ret.push_back(numpy_query_column(r, j, std::move(columns[j]), strings, masked));
     }
 
     return ret;
 }
 
-numpy_query_result_t numpy_query_results(const qdb_query_result_t * r)
+numpy_query_result_t numpy_query_results(
+    qdb_query_result_t const & r, convert::strings_mode_t strings, bool masked)
+{
+    return numpy_query_results(r, {}, strings, masked);
+}
+
+numpy_query_result_t numpy_query_results(
+    const qdb_query_result_t * r, convert::strings_mode_t strings, bool masked)
 {
     if (!r || r->column_count == 0 || r->row_count == 0)
     {
@@ -392,36 +875,336 @@ numpy_query_result_t numpy_query_results(const qdb_query_result_t * r)
     }
 
     const std::vector<std::string> column_names = coerce_column_names(*r);
-    return numpy_query_results(*r);
+    return numpy_query_results(*r, strings, masked);
 }
 
-dict_query_result_t dict_query(qdb::handle_ptr h, const std::string & q, const py::object & blobs)
+/**
+ * Runs a query, and returns its result set.
+ */
+static detail::qdb_resource<qdb_query_result_t> run_query(qdb::handle_ptr h, const std::string & q)
 {
     detail::qdb_resource<qdb_query_result_t> r{*h};
 
     qdb_error_t err;
     {
         metrics::scoped_capture capture{"qdb_query"};
+
+        // Query execution can take a long time and does not involve any Python objects.
+        py::gil_scoped_release release{};
         err = qdb_query(*h, q.c_str(), &r);
     }
 
     qdb::qdb_throw_if_query_error(*h, err, r.get());
 
+    return r;
+}
+
+dict_query_result_t dict_query(qdb::handle_ptr h, const std::string & q, const py::object & blobs)
+{
+    auto r = run_query(h, q);
+
     return convert_query_results(r, blobs);
 }
 
-numpy_query_result_t numpy_query(qdb::handle_ptr h, const std::string & q)
+py::tuple tuples_query(qdb::handle_ptr h, const std::string & q, const py::object & blobs)
 {
-    detail::qdb_resource<qdb_query_result_t> r{*h};
+    auto r = run_query(h, q);
 
-    qdb_error_t err;
+    return convert_query_tuples(r, blobs);
+}
+
+py::dict columns_query(qdb::handle_ptr h, const std::string & q, const py::object & blobs)
+{
+    auto r = run_query(h, q);
+
+    return convert_query_columns(r, blobs);
+}
+
+numpy_query_result_t numpy_query(
+    qdb::handle_ptr h, const std::string & q, convert::strings_mode_t strings, bool masked)
+{
+    auto r = run_query(h, q);
+
+    return numpy_query_results(r, strings, masked);
+}
+
+numpy_query_stream::numpy_query_stream(qdb::handle_ptr h,
+    const std::string & q,
+    std::size_t chunk_rows,
+    convert::strings_mode_t strings,
+    bool masked)
+    : handle_{h}
+    , result_{nullptr}
+    , chunk_rows_{chunk_rows}
+    , offset_{0}
+    , strings_{strings}
+    , masked_{masked}
+{
+    auto r = run_query(h, q);
+
+    if (r.get() != nullptr && r->column_count > 0 && r->row_count > 0)
     {
-        metrics::scoped_capture capture{"qdb_query"};
-        err = qdb_query(*h, q.c_str(), &r);
+        column_types_ = query_column_types_nogil(*r);
+
+        // From here on, we're responsible for releasing the result set.
+        result_ = r.release();
+    }
+}
+
+numpy_query_result_t numpy_query_stream::next()
+{
+    if (result_ == nullptr || offset_ >= result_->row_count)
+    {
+        close();
+        throw py::stop_iteration{};
+    }
+
+    // A chunk is a view over the rows of the result set, which we convert the same way as
+    // an entire result set.
+    qdb_size_t n = result_->row_count - offset_;
+    if (chunk_rows_ > 0 && chunk_rows_ < n)
+    {
+        n = chunk_rows_;
+    }
+
+    qdb_query_result_t chunk = *result_;
+    chunk.rows               = result_->rows + offset_;
+    chunk.row_count          = n;
+
+    offset_ += n;
+
+    numpy_query_result_t ret = numpy_query_results(chunk, column_types_, strings_, masked_);
+
+    if (offset_ >= result_->row_count)
+    {
+        // Everything is converted, no need to hold on to the native rows until the caller
+        // asks for the next chunk.
+        close();
+    }
+
+    return ret;
+}
+
+void numpy_query_stream::close()
+{
+    if (result_ != nullptr)
+    {
+        // Closing the handle already released all of its memory.
+        if (handle_->is_open())
+        {
+            qdb_release(*handle_, result_);
+        }
+
+        result_ = nullptr;
+    }
+}
+
+static std::optional<qdb_ts_column_type_t> describe_column_type(
+    query_column_type_t column_type) noexcept
+{
+    switch (column_type)
+    {
+    case query_column_double:
+        return qdb_ts_column_double;
+    case query_column_int64:
+        return qdb_ts_column_int64;
+    case query_column_timestamp:
+        return qdb_ts_column_timestamp;
+    case query_column_string:
+        return qdb_ts_column_string;
+    case query_column_blob:
+        return qdb_ts_column_blob;
+    default:
+        return std::nullopt;
+    }
+}
+
+static py::object describe_column_dtype(query_column_type_t column_type)
+{
+    // These are the dtypes `numpy_query()` returns for every column type.
+    switch (column_type)
+    {
+    case query_column_double:
+        return traits::float64_dtype::dtype();
+    case query_column_int64:
+        return traits::int64_dtype::dtype();
+    case query_column_timestamp:
+        return traits::datetime64_ns_dtype::dtype();
+    case query_column_string:
+    case query_column_blob:
+    case query_column_object:
+        return traits::pyobject_dtype::dtype();
+    default:
+        return py::none();
+    }
+}
+
+/**
+ * Returns the query without its trailing whitespace and semicolon, so that a clause can be
+ * appended to it.
+ */
+static std::string strip_query_end(std::string const & q)
+{
+    std::size_t n = q.size();
+
+    while (n > 0 && (std::isspace(static_cast<unsigned char>(q[n - 1])) || q[n - 1] == ';'))
+    {
+        --n;
+    }
+
+    return q.substr(0, n);
+}
+
+/**
+ * Returns the query with all string literals and quoted identifiers blanked out, so that
+ * their contents are never mistaken for keywords.
+ */
+static std::string strip_query_quotes(std::string const & q)
+{
+    std::string ret;
+    ret.reserve(q.size());
+
+    char quote = 0;
+    for (char c : q)
+    {
+        if (quote == 0 && (c == '\'' || c == '"'))
+        {
+            quote = c;
+            ret.push_back(' ');
+        }
+        else if (quote != 0)
+        {
+            // Doubled quotes within a quoted part close and immediately reopen it, which
+            // blanks it out all the same.
+            if (c == quote)
+            {
+                quote = 0;
+            }
+
+            ret.push_back(' ');
+        }
+        else
+        {
+            ret.push_back(c);
+        }
+    }
+
+    return ret;
+}
+
+/**
+ * Splits the top-level clauses of a query, stripped of its quoted parts, into words.
+ * Parenthesized parts such as subqueries are a single "()" word.
+ */
+static std::vector<std::string> top_level_words(std::string const & q)
+{
+    std::vector<std::string> ret;
+    std::string word;
+    int depth = 0;
+
+    auto flush = [&ret, &word]() {
+        if (word.empty() == false)
+        {
+            ret.push_back(std::move(word));
+            word.clear();
+        }
+    };
+
+    for (char c : q)
+    {
+        unsigned char c_ = static_cast<unsigned char>(c);
+
+        if (c == '(')
+        {
+            if (depth++ == 0)
+            {
+                flush();
+                ret.push_back("()");
+            }
+        }
+        else if (c == ')')
+        {
+            depth = std::max(depth - 1, 0);
+        }
+        else if (depth == 0 && (std::isalnum(c_) || c == '_' || c == '$'))
+        {
+            word.push_back(static_cast<char>(std::tolower(c_)));
+        }
+        else if (depth == 0)
+        {
+            flush();
+        }
+    }
+
+    flush();
+    return ret;
+}
+
+static inline bool is_number(std::string const & x) noexcept
+{
+    return x.empty() == false && std::all_of(x.begin(), x.end(), [](char c) {
+        return std::isdigit(static_cast<unsigned char>(c));
+    });
+}
+
+/**
+ * Returns true if the query already limits its amount of rows, in which case we cannot
+ * add a limit of our own. Only a trailing `LIMIT n [OFFSET m]` clause of the query itself
+ * counts: not a limit within a subquery, nor a column that happens to be named "limit".
+ */
+static bool has_limit(const std::string & q)
+{
+    std::vector<std::string> xs = top_level_words(strip_query_quotes(q));
+    std::size_t n               = xs.size();
+
+    if (n >= 4 && xs[n - 2] == "offset" && is_number(xs[n - 1]))
+    {
+        n -= 2;
+    }
+
+    return n >= 2 && xs[n - 2] == "limit" && is_number(xs[n - 1]);
+}
+
+query_description_t describe_query(qdb::handle_ptr h, const std::string & q)
+{
+    // The C API has no way to describe a query without running it: limit the query to a
+    // single row, which is enough to probe the type of every column that isn't null.
+    std::string q_ = strip_query_end(q);
+    if (has_limit(q_) == false)
+    {
+        q_ += " LIMIT 1";
+    }
+
+    auto r = run_query(h, q_);
+
+    query_description_t ret{};
+    if (r.get() == nullptr)
+    {
+        return ret;
+    }
+
+    std::vector<query_column_type_t> column_types = query_column_types(*r);
+
+    ret.reserve(r->column_count);
+    for (qdb_size_t j = 0; j < r->column_count; ++j)
+    {
+        ret.emplace_back(qdb::to_string(r->column_names[j]), describe_column_type(column_types[j]),
+            describe_column_dtype(column_types[j]));
+    }
+
+    return ret;
+}
+
+py::object arrow_query(qdb::handle_ptr h, const std::string & q)
+{
+    auto r = run_query(h, q);
+
+    if (r.get() == nullptr)
+    {
+        return arrow::record_batch(std::vector<arrow::column>{}, 0);
     }
-    qdb::qdb_throw_if_query_error(*h, err, r.get());
 
-    return numpy_query_results(r);
+    return arrow::record_batch(*r.get());
 }
 
 } // namespace qdb
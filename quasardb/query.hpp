@@ -33,9 +33,13 @@
 #include "handle.hpp"
 #include "utils.hpp"
 #include <qdb/query.h>
+#include "convert/strings.hpp"
 #include <pybind11/numpy.h>
 #include <map>
+#include <optional>
+#include <span>
 #include <string>
+#include <tuple>
 #include <unordered_map>
 #include <vector>
 
@@ -57,9 +61,14 @@ public:
     {
         const char ** aliases = nullptr;
         size_t count          = 0;
+        qdb_error_t err;
 
-        qdb::qdb_throw_if_error(
-            *_handle, qdb_query_find(*_handle, _query_string.c_str(), &aliases, &count));
+        {
+            py::gil_scoped_release release{};
+            err = qdb_query_find(*_handle, _query_string.c_str(), &aliases, &count);
+        }
+
+        qdb::qdb_throw_if_error(*_handle, err);
 
         return convert_strings_and_release(_handle, aliases, count);
     }
@@ -69,13 +78,202 @@ private:
     std::string _query_string;
 };
 
+// Shape of the results of `cluster.query()`.
+enum query_format_t
+{
+    // A list with a dict per row
+    query_format_dicts,
+
+    // A tuple of the column names and a list with a tuple per row
+    query_format_tuples,
+
+    // A dict with a list of values per column
+    query_format_columns
+};
+
+static inline query_format_t query_format_of(py::object const & format)
+{
+    if (format.is_none())
+    {
+        return query_format_dicts;
+    }
+
+    std::string format_ = py::cast<std::string>(format);
+
+    if (format_ == "tuples")
+    {
+        return query_format_tuples;
+    }
+    else if (format_ == "columns")
+    {
+        return query_format_columns;
+    }
+
+    std::string error_msg = "Invalid argument provided for `format`: expected "
+                            "None, 'tuples' or 'columns', got: ";
+    error_msg += format_;
+
+    throw qdb::invalid_argument_exception{error_msg};
+}
+
 using dict_query_result_t  = std::vector<std::map<std::string, py::handle>>;
 using numpy_query_column_t = std::pair<std::string, py::object>;
 using numpy_query_result_t = std::vector<numpy_query_column_t>;
 
+// Type a query result column is converted to, which combines the types of all of its
+// values.
+enum query_column_type_t
+{
+    // Every value is null
+    query_column_none,
+
+    // int64 and count values
+    query_column_int64,
+
+    // Doubles, or a mix of doubles and integers
+    query_column_double,
+
+    query_column_timestamp,
+    query_column_string,
+    query_column_blob,
+
+    // Any other mix of types, returned as Python objects
+    query_column_object,
+
+    // Arrays, returned as offsets into the flattened values of all rows
+    query_column_array_int64,
+    query_column_array_double,
+    query_column_array_timestamp,
+    query_column_array_string,
+    query_column_array_blob
+};
+
+/**
+ * Values of an array query result, by result type. Arrays point to a contiguous block of
+ * values owned by the result set.
+ */
+template <qdb_query_result_value_type_t ResultType>
+struct query_array;
+
+template <>
+struct query_array<qdb_query_result_array_int64>
+{
+    static inline std::span<qdb_int_t const> get(qdb_point_result_t const & x) noexcept
+    {
+        return {x.payload.array_int64.values, static_cast<std::size_t>(x.payload.array_int64.count)};
+    }
+};
+
+template <>
+struct query_array<qdb_query_result_array_double>
+{
+    static inline std::span<double const> get(qdb_point_result_t const & x) noexcept
+    {
+        return {x.payload.array_double.values, static_cast<std::size_t>(x.payload.array_double.count)};
+    }
+};
+
+template <>
+struct query_array<qdb_query_result_array_timestamp>
+{
+    static inline std::span<qdb_timespec_t const> get(qdb_point_result_t const & x) noexcept
+    {
+        return {x.payload.array_timestamp.values,
+            static_cast<std::size_t>(x.payload.array_timestamp.count)};
+    }
+};
+
+template <>
+struct query_array<qdb_query_result_array_string>
+{
+    static inline std::span<qdb_string_t const> get(qdb_point_result_t const & x) noexcept
+    {
+        return {x.payload.array_string.values, static_cast<std::size_t>(x.payload.array_string.count)};
+    }
+};
+
+template <>
+struct query_array<qdb_query_result_array_blob>
+{
+    static inline std::span<qdb_blob_t const> get(qdb_point_result_t const & x) noexcept
+    {
+        return {x.payload.array_blob.values, static_cast<std::size_t>(x.payload.array_blob.count)};
+    }
+};
+
+// Name, column type and numpy dtype of every column of a query. Types are empty when
+// they cannot be determined.
+using query_description_t =
+    std::vector<std::tuple<std::string, std::optional<qdb_ts_column_type_t>, py::object>>;
+
 dict_query_result_t convert_query_results(const qdb_query_result_t * r, const py::object & blobs);
 dict_query_result_t dict_query(qdb::handle_ptr h, const std::string & query, const py::object & blobs);
-numpy_query_result_t numpy_query(qdb::handle_ptr h, const std::string & query);
+py::tuple tuples_query(qdb::handle_ptr h, const std::string & query, const py::object & blobs);
+py::dict columns_query(qdb::handle_ptr h, const std::string & query, const py::object & blobs);
+numpy_query_result_t numpy_query(qdb::handle_ptr h,
+    const std::string & query,
+    convert::strings_mode_t strings = convert::strings_mode_default,
+    bool masked                     = true);
+py::object arrow_query(qdb::handle_ptr h, const std::string & query);
+query_description_t describe_query(qdb::handle_ptr h, const std::string & query);
+
+/**
+ * Returns the type of every column, combined over all of its values.
+ */
+std::vector<query_column_type_t> query_column_types(qdb_query_result_t const & r);
+
+/**
+ * Runs a query once, and converts its result set to numpy arrays `chunk_rows` rows at a
+ * time, rather than all at once. Only the arrays of the chunk being consumed are alive on
+ * top of the native result set, which is released as soon as the last chunk is returned.
+ *
+ * Column types are combined over the entire result set, so that a column has the same dtype
+ * in every chunk.
+ */
+class numpy_query_stream
+{
+public:
+    numpy_query_stream(qdb::handle_ptr h,
+        const std::string & query,
+        std::size_t chunk_rows,
+        convert::strings_mode_t strings = convert::strings_mode_default,
+        bool masked                     = true);
+
+    numpy_query_stream(numpy_query_stream const &)             = delete;
+    numpy_query_stream & operator=(numpy_query_stream const &) = delete;
+
+    ~numpy_query_stream()
+    {
+        close();
+    }
+
+    /**
+     * Converts the next chunk, in the same shape as `numpy_query()`. Raises StopIteration
+     * once all rows have been returned.
+     */
+    numpy_query_result_t next();
+
+    /**
+     * Releases the native result set, after which no more chunks are returned.
+     */
+    void close();
+
+    constexpr inline std::size_t get_chunk_rows() const noexcept
+    {
+        return chunk_rows_;
+    }
+
+private:
+    qdb::handle_ptr handle_;
+    qdb_query_result_t * result_;
+
+    std::vector<query_column_type_t> column_types_;
+    std::size_t chunk_rows_;
+    std::size_t offset_;
+
+    convert::strings_mode_t strings_;
+    bool masked_;
+};
 
 template <typename Module>
 static inline void register_query(Module & m)
@@ -89,6 +287,16 @@ static inline void register_query(Module & m)
         }))
         .def("run", &qdb::find_query::run);
 
+    py::class_<qdb::numpy_query_stream, std::shared_ptr<qdb::numpy_query_stream>>{m, "NumpyQueryStream"}
+        .def(py::init([](py::args, py::kwargs) {
+            throw qdb::direct_instantiation_exception{"conn.query_numpy_stream(...)"};
+            return nullptr;
+        }))
+        .def("get_chunk_rows", &qdb::numpy_query_stream::get_chunk_rows)
+        .def("close", &qdb::numpy_query_stream::close)
+        .def("__iter__", [](std::shared_ptr<qdb::numpy_query_stream> const & x) { return x; })
+        .def("__next__", [](qdb::numpy_query_stream & x) { return py::cast(x.next()); });
+
     m.def("dict_query", &qdb::dict_query);
 }
 
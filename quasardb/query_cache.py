@@ -0,0 +1,359 @@
+"""
+Opt-in, client-side cache for query results.
+
+Results are keyed by the normalized query text, evicted least recently used first once
+the cache holds more than `max_bytes`, and expire `ttl` seconds after they were stored.
+Optionally, results are invalidated as soon as `$qdb.firehose` reports a transaction on
+any of the tables the query reads from.
+
+  cache = QueryCache(max_bytes=2**28, ttl=30, invalidate=True)
+
+  df = qdbpd.query(conn, q, cache=cache)
+  rows = cache.query(conn, q)
+
+Cached results are shared between callers, and must not be modified. A cache should
+only be used with connections to a single cluster. Hits and misses are counted in the
+counters of `quasardb.metrics`, as `query_cache_hit` and `query_cache_miss`.
+"""
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+
+import quasardb.firehose as firehose
+from quasardb import Cluster, metrics
+
+logger = logging.getLogger("quasardb.query_cache")
+
+T = TypeVar("T")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_QUOTED_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_FIND_RE = re.compile(r"\bfrom\s+find\s*\(", re.IGNORECASE)
+_TABLE = r"(?:\"(?:[^\"]|\"\")*\"|[^\s,()\"]+)"
+_FROM_RE = re.compile(
+    r"\b(?:from|join)\s+({t}(?:\s*,\s*{t})*)".format(t=_TABLE), re.IGNORECASE
+)
+_TABLE_RE = re.compile(r"\"((?:[^\"]|\"\")*)\"|([^\s,()\"]+)")
+
+
+def normalize(query: str) -> str:
+    """
+    Returns the query text used as the cache key: whitespace outside of quoted literals
+    and identifiers is collapsed, so that formatting differences still hit the same entry.
+    """
+    xs = _QUOTED_RE.split(query)
+
+    # Quoted parts end up at the odd offsets.
+    for i in range(0, len(xs), 2):
+        xs[i] = _WHITESPACE_RE.sub(" ", xs[i])
+
+    return "".join(xs).strip()
+
+
+def tables_of(query: str) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the names of the tables a query reads from, or None if they cannot be
+    determined from the query text, e.g. when tables are looked up with `find()`.
+    """
+    q = _STRING_LITERAL_RE.sub("''", query)
+
+    if _FIND_RE.search(q) is not None:
+        return None
+
+    ret: List[str] = []
+    for m in _FROM_RE.finditer(q):
+        for quoted, bare in _TABLE_RE.findall(m.group(1)):
+            name = quoted.replace('""', '"') if quoted else bare
+            if name not in ret:
+                ret.append(name)
+
+    return tuple(ret) if len(ret) > 0 else None
+
+
+def _sizeof(x: Any) -> int:
+    """
+    Estimates the number of bytes held by a query result.
+    """
+    if isinstance(x, np.ndarray):
+        n = x.nbytes
+
+        if isinstance(x, np.ma.MaskedArray) and x.mask is not np.ma.nomask:
+            n += x.mask.nbytes
+
+        if x.dtype == np.dtype("O"):
+            n += sum(sys.getsizeof(v) for v in x.flat)
+
+        return n
+
+    if isinstance(x, dict):
+        return sys.getsizeof(x) + sum(_sizeof(k) + _sizeof(v) for (k, v) in x.items())
+
+    if isinstance(x, (list, tuple)):
+        return sys.getsizeof(x) + sum(_sizeof(v) for v in x)
+
+    return sys.getsizeof(x)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    nbytes: int
+    expires: Optional[float]
+    tables: Optional[Tuple[str, ...]]
+    generations: Tuple[int, ...]
+
+
+class QueryCache:
+    """
+    Caches query results in memory, see the module documentation.
+
+    Parameters:
+    -----------
+
+    max_bytes : int
+      Upper bound on the estimated size of all cached results. Results larger than this
+      are never cached. Defaults to 64MiB.
+
+    ttl : optional[float | timedelta]
+      Number of seconds after which a result expires. None means results never expire.
+      Defaults to 60 seconds.
+
+    invalidate : bool
+      If True, polls `$qdb.firehose` when looking up a result, and drops it if any of the
+      tables it reads from was written to since. Queries whose tables cannot be
+      determined only expire through `ttl`. Defaults to False.
+
+    poll_interval : float
+      Minimum number of seconds between two firehose polls of the same table. Defaults to
+      the polling interval of `quasardb.firehose`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[Union[float, timedelta]] = 60.0,
+        invalidate: bool = False,
+        poll_interval: float = firehose.POLL_INTERVAL,
+    ):
+        if max_bytes <= 0:
+            raise ValueError(
+                "max_bytes must be a positive number, got: {}".format(max_bytes)
+            )
+
+        if isinstance(ttl, timedelta):
+            ttl = ttl.total_seconds()
+
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._invalidate = invalidate
+        self._poll_interval = poll_interval
+
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        # Firehose state per table, along with a generation which is bumped every time
+        # new transactions are seen on that table. Every table is polled under a lock of
+        # its own, `_tables_lock` only guards the dict itself.
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._tables_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Estimated size of all cached results.
+        """
+        return self._nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drops all results that read from `table_name`, or all results if None. Results
+        whose tables cannot be determined are dropped as well.
+        """
+        if table_name is None:
+            self.clear()
+            return
+
+        with self._lock:
+            for key in list(self._entries.keys()):
+                entry = self._entries[key]
+                if entry.tables is None or table_name in entry.tables:
+                    self._remove(key)
+
+    def cached(
+        self,
+        conn: Cluster,
+        query: str,
+        compute: Callable[[], T],
+        variant: Hashable = None,
+    ) -> T:
+        """
+        Returns the cached result of `query`, or calls `compute()` and caches its result.
+        `variant` distinguishes between different representations of the results of the
+        same query, e.g. dicts or numpy arrays.
+        """
+        q = normalize(query)
+        key = (q, variant)
+        tables = tables_of(q)
+
+        generations = self._generations(conn, tables)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_valid(entry, generations):
+                self._entries.move_to_end(key)
+                metrics.increment("query_cache_hit")
+                return entry.value
+
+            if entry is not None:
+                logger.debug("dropping stale cached result: %s", q)
+                self._remove(key)
+
+        metrics.increment("query_cache_miss")
+        value = compute()
+        self._store(key, value, tables, generations)
+
+        return value
+
+    def query(
+        self,
+        conn: Cluster,
+        query: str,
+        blobs: Union[bool, List[str]] = False,
+        format: Optional[str] = None,
+    ) -> Any:
+        """
+        Cached equivalent of `conn.query()`.
+        """
+        blobs_ = tuple(blobs) if isinstance(blobs, list) else blobs
+
+        return self.cached(
+            conn,
+            query,
+            lambda: conn.query(query, blobs=blobs, format=format),
+            variant=("query", blobs_, format),
+        )
+
+    def _is_valid(self, entry: _Entry, generations: Tuple[int, ...]) -> bool:
+        if entry.expires is not None and time.monotonic() >= entry.expires:
+            return False
+
+        return entry.generations == generations
+
+    def _store(
+        self,
+        key: Tuple[str, Hashable],
+        value: Any,
+        tables: Optional[Tuple[str, ...]],
+        generations: Tuple[int, ...],
+    ) -> None:
+        nbytes = _sizeof(value)
+        if nbytes > self._max_bytes:
+            logger.debug(
+                "not caching result of %d bytes, larger than the cache: %s",
+                nbytes,
+                key[0],
+            )
+            return
+
+        expires = None if self._ttl is None else time.monotonic() + self._ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _Entry(value, nbytes, expires, tables, generations)
+            self._nbytes += nbytes
+
+            # Least recently used entries are at the front.
+            while self._nbytes > self._max_bytes:
+                (_, evicted) = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def _remove(self, key: Tuple[str, Hashable]) -> None:
+        entry = self._entries.pop(key)
+        self._nbytes -= entry.nbytes
+
+    def _generations(
+        self, conn: Cluster, tables: Optional[Tuple[str, ...]]
+    ) -> Tuple[int, ...]:
+        if not self._invalidate or tables is None:
+            return ()
+
+        return tuple(self._poll(conn, table_name) for table_name in tables)
+
+    def _poll(self, conn: Cluster, table_name: str) -> int:
+        """
+        Returns the generation of a table, polling the firehose for new transactions at
+        most once every `poll_interval` seconds.
+
+        Lookups never wait for a poll in progress, on this table or any other: while
+        another thread polls a table, its current generation is returned as-is, just like
+        in between two polls.
+        """
+        with self._tables_lock:
+            t = self._tables.get(table_name)
+            if t is None:
+                t = {
+                    "state": None,
+                    "generation": 0,
+                    "polled": None,
+                    "lock": threading.Lock(),
+                }
+                self._tables[table_name] = t
+
+        if not t["lock"].acquire(blocking=False):
+            return t["generation"]
+
+        try:
+            now = time.monotonic()
+            if t["polled"] is not None and now - t["polled"] < self._poll_interval:
+                return t["generation"]
+
+            if t["state"] is None:
+                # The first poll only establishes where the firehose currently is, without
+                # going through the history of the table.
+                t["state"] = firehose._init_latest(conn, table_name)
+            else:
+                txs = firehose._new_transactions(conn, table_name, t["state"])
+
+                if len(txs) > 0:
+                    logger.debug(
+                        "%d new transactions on table %s, invalidating cached results",
+                        len(txs),
+                        table_name,
+                    )
+                    t["generation"] += 1
+
+            t["polled"] = now
+            return t["generation"]
+        finally:
+            t["lock"].release()
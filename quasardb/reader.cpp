@@ -1,4 +1,5 @@
 #include "reader.hpp"
+#include "arrow.hpp"
 #include "error.hpp"
 #include "table.hpp"
 #include "traits.hpp"
@@ -6,6 +7,12 @@
 #include "convert/value.hpp"
 #include "detail/qdb_resource.hpp"
 #include <range/v3/view/counted.hpp>
+#include <range/v3/view/transform.hpp>
+#include <algorithm>
+#include <iterator>
+#include <limits>
+#include <numeric>
+#include <string_view>
 
 namespace qdb
 {
@@ -13,100 +20,1608 @@ namespace qdb
 namespace detail
 {
 
-/* static */ py::dict reader_data::convert(qdb_bulk_reader_table_data_t const & data)
+/* static */ py::capsule reader_data::make_owner(handle_ptr handle, qdb_bulk_reader_table_data_t * data)
+{
+    struct owner
+    {
+        handle_ptr handle;
+        qdb_bulk_reader_table_data_t * data;
+    };
+
+    auto release = [](void * x) {
+        owner * owner_ = static_cast<owner *>(x);
+
+        // A handle which was closed in the meantime releases all of its memory at once,
+        // as soon as the last pin is released.
+        if (owner_->handle->is_open())
+        {
+            qdb_release(*owner_->handle, owner_->data);
+        }
+
+        owner_->handle->unpin();
+        delete owner_;
+    };
+
+    // The views must remain valid even if the connection is closed before they are
+    // garbage collected.
+    handle->pin();
+
+    return py::capsule{new owner{handle, data}, release};
+}
+
+/* static */ py::dict reader_data::convert(qdb_bulk_reader_table_data_t const & data,
+    py::handle owner,
+    convert::strings_mode_t strings,
+    bool masked)
+{
+    py::dict ret{};
+
+    // Convert the timestamp index, which should never contain null values
+    // and thus is *not* a masked array.
+    auto timestamps = ranges::views::counted(data.timestamps, data.row_count);
+    auto columns    = ranges::views::counted(data.columns, data.column_count);
+
+    py::array idx          = convert::array<qdb_timespec_t, traits::datetime64_ns_dtype>(timestamps);
+    qdb::masked_array idx_ = qdb::masked_array::masked_none(idx);
+
+    ret[py::str("$timestamp")] = idx;
+
+    for (qdb_exp_batch_push_column_t const & column : columns)
+    {
+        py::str column_name{column.name};
+
+        if (column.data_type == qdb_ts_column_int64 && std::string_view{column.name} == "$table")
+        {
+            // Codes rather than names, see `reader_table_column`. Always a copy, as the codes
+            // are not part of the batch itself.
+            ret[std::move(column_name)] = table_codes(column.data.ints, data.row_count);
+            continue;
+        }
+
+        qdb::masked_array xs;
+        switch (column.data_type)
+        {
+        case qdb_ts_column_int64:
+            if (owner)
+            {
+                xs = convert::masked_array_view<qdb_int_t, traits::int64_dtype>(
+                    column.data.ints, data.row_count, owner);
+                break;
+            }
+
+            xs = convert::masked_array<qdb_int_t, traits::int64_dtype>(
+                ranges::views::counted(column.data.ints, data.row_count));
+            break;
+        case qdb_ts_column_double:
+            if (owner)
+            {
+                xs = convert::masked_array_view<double, traits::float64_dtype>(
+                    column.data.doubles, data.row_count, owner);
+                break;
+            }
+
+            xs = convert::masked_array<double, traits::float64_dtype>(
+                ranges::views::counted(column.data.doubles, data.row_count));
+            break;
+        case qdb_ts_column_string:
+            if (strings == convert::strings_mode_categorical)
+            {
+                ret[std::move(column_name)] = convert::categorical(
+                    ranges::views::counted(column.data.strings, data.row_count), masked);
+                continue;
+            }
+
+            xs = convert::masked_array<qdb_string_t, traits::unicode_dtype>(
+                ranges::views::counted(column.data.strings, data.row_count));
+            break;
+        case qdb_ts_column_blob:
+            xs = convert::masked_array<qdb_blob_t, traits::pyobject_dtype>(
+                ranges::views::counted(column.data.blobs, data.row_count));
+            break;
+        case qdb_ts_column_timestamp:
+            xs = convert::masked_array<qdb_timespec_t, traits::datetime64_ns_dtype>(
+                ranges::views::counted(column.data.timestamps, data.row_count));
+            break;
+
+        case qdb_ts_column_symbol:
+            // This should not happen, as "symbol" is just an internal representation, and symbols
+            // are exposed to the user as strings. If this actually happens, it indicates either
+            // a bug in the bulk reader *or* a memory corruption.
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: symbol column type returned from bulk reader");
+
+        case qdb_ts_column_uninitialized:
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: uninitialized column "
+                "type returned from bulk reader");
+        };
+
+        ret[std::move(column_name)] = xs.to_object(masked);
+    }
+
+    return ret;
+}
+
+/* static */ py::array reader_data::table_codes(std::int64_t const * xs, std::size_t n)
+{
+    using code_type = traits::int32_dtype::value_type;
+
+    py::array ret{traits::int32_dtype::dtype(), py::array::ShapeContainer{n}};
+    code_type * ys = static_cast<code_type *>(ret.mutable_data());
+
+    {
+        py::gil_scoped_release release{};
+        std::transform(xs, xs + n, ys, [](std::int64_t x) { return static_cast<code_type>(x); });
+    }
+
+    return ret;
+}
+
+std::size_t reader_collector::column::size() const noexcept
+{
+    switch (type)
+    {
+    case qdb_ts_column_double:
+        return doubles.size();
+    case qdb_ts_column_string:
+    case qdb_ts_column_blob:
+        return ends.size();
+    default:
+        return ints.size();
+    };
+}
+
+void reader_collector::column::pad(std::size_t n)
+{
+    switch (type)
+    {
+    case qdb_ts_column_int64:
+        ints.resize(n, traits::int64_dtype::null_value());
+        break;
+    case qdb_ts_column_timestamp:
+        ints.resize(n, traits::datetime64_ns_dtype::null_value());
+        break;
+    case qdb_ts_column_double:
+        doubles.resize(n, traits::float64_dtype::null_value());
+        break;
+    case qdb_ts_column_string:
+    case qdb_ts_column_blob:
+        // Empty values are null values
+        ends.resize(n, bytes.size());
+        break;
+    default:
+        break;
+    };
+}
+
+void reader_collector::append(qdb_bulk_reader_table_data_t const & data)
+{
+    std::size_t offset = timestamps_.size();
+    std::size_t n      = data.row_count;
+
+    std::transform(data.timestamps, data.timestamps + n, std::back_inserter(timestamps_),
+        convert::value<qdb_timespec_t, std::int64_t>);
+
+    for (qdb_exp_batch_push_column_t const & x :
+        ranges::views::counted(data.columns, data.column_count))
+    {
+        auto [pos, inserted] = index_.try_emplace(std::string{x.name}, columns_.size());
+
+        if (inserted)
+        {
+            columns_.push_back(column{.name = std::string{x.name}, .type = x.data_type});
+            columns_.back().pad(offset);
+        }
+
+        column & xs = columns_[pos->second];
+
+        if (xs.type != x.data_type) [[unlikely]]
+        {
+            throw qdb::incompatible_type_exception{
+                "Column '" + xs.name + "' has a different type in different tables"};
+        }
+
+        switch (x.data_type)
+        {
+        case qdb_ts_column_int64:
+            xs.ints.insert(xs.ints.end(), x.data.ints, x.data.ints + n);
+            break;
+        case qdb_ts_column_double:
+            xs.doubles.insert(xs.doubles.end(), x.data.doubles, x.data.doubles + n);
+            break;
+        case qdb_ts_column_timestamp:
+            std::transform(x.data.timestamps, x.data.timestamps + n, std::back_inserter(xs.ints),
+                convert::value<qdb_timespec_t, std::int64_t>);
+            break;
+        case qdb_ts_column_string:
+            for (qdb_string_t const & y : ranges::views::counted(x.data.strings, n))
+            {
+                xs.bytes.insert(xs.bytes.end(), y.data, y.data + y.length);
+                xs.ends.push_back(xs.bytes.size());
+            }
+            break;
+        case qdb_ts_column_blob:
+            for (qdb_blob_t const & y : ranges::views::counted(x.data.blobs, n))
+            {
+                char const * content = static_cast<char const *>(y.content);
+                xs.bytes.insert(xs.bytes.end(), content, content + y.content_length);
+                xs.ends.push_back(xs.bytes.size());
+            }
+            break;
+
+        case qdb_ts_column_symbol:
+            // See reader_data::convert()
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: symbol column type returned from bulk reader");
+
+        case qdb_ts_column_uninitialized:
+            throw qdb::not_implemented_exception(
+                "Internal error: invalid data type: uninitialized column "
+                "type returned from bulk reader");
+        };
+    }
+
+    // Columns that are not part of this batch
+    for (column & xs : columns_)
+    {
+        xs.pad(offset + n);
+    }
+}
+
+py::dict reader_collector::finalize()
 {
     py::dict ret{};
 
-    // Convert the timestamp index, which should never contain null values
-    // and thus is *not* a masked array.
-    auto timestamps = ranges::views::counted(data.timestamps, data.row_count);
-    auto columns    = ranges::views::counted(data.columns, data.column_count);
+    ret[py::str("$timestamp")] =
+        convert::owned_array<traits::datetime64_ns_dtype>(std::move(timestamps_));
+
+    for (column & xs : columns_)
+    {
+        py::str column_name{xs.name};
+
+        if (xs.type == qdb_ts_column_int64 && xs.name == "$table")
+        {
+            // See `reader_data::convert()`
+            ret[column_name] = reader_data::table_codes(xs.ints.data(), xs.ints.size());
+            continue;
+        }
+        else if (xs.type == qdb_ts_column_string || xs.type == qdb_ts_column_blob)
+        {
+            // Views over the collected bytes, which are converted the same way as the
+            // values of a single batch.
+            std::vector<qdb_string_t> values;
+            values.reserve(xs.ends.size());
+
+            std::size_t begin = 0;
+            for (std::size_t end : xs.ends)
+            {
+                values.push_back(qdb_string_t{xs.bytes.data() + begin, end - begin});
+                begin = end;
+            }
+
+            auto values_ = ranges::views::counted(values.data(), values.size());
+
+            if (xs.type == qdb_ts_column_blob)
+            {
+                auto blobs = values_ | ranges::views::transform([](qdb_string_t const & x) {
+                    return qdb_blob_t{x.data, x.length};
+                });
+
+                ret[column_name] =
+                    convert::masked_array<qdb_blob_t, traits::pyobject_dtype>(blobs).to_object(masked_);
+            }
+            else if (strings_ == convert::strings_mode_categorical)
+            {
+                ret[column_name] = convert::categorical(values_, masked_);
+            }
+            else
+            {
+                ret[column_name] =
+                    convert::masked_array<qdb_string_t, traits::unicode_dtype>(values_).to_object(
+                        masked_);
+            }
+
+            continue;
+        }
+
+        py::array values;
+        qdb::mask mask;
+
+        // Without masks, we don't even need to look for null values.
+        switch (xs.type)
+        {
+        case qdb_ts_column_int64:
+            values = convert::owned_array<traits::int64_dtype>(std::move(xs.ints));
+            mask   = masked_ ? qdb::masked_array::masked_null<traits::int64_dtype>(values)
+                             : qdb::mask::lazy_none(values.size());
+            break;
+        case qdb_ts_column_double:
+            values = convert::owned_array<traits::float64_dtype>(std::move(xs.doubles));
+            mask   = masked_ ? qdb::masked_array::masked_null<traits::float64_dtype>(values)
+                             : qdb::mask::lazy_none(values.size());
+            break;
+        case qdb_ts_column_timestamp:
+            values = convert::owned_array<traits::datetime64_ns_dtype>(std::move(xs.ints));
+            mask   = masked_ ? qdb::masked_array::masked_null<traits::datetime64_ns_dtype>(values)
+                             : qdb::mask::lazy_none(values.size());
+            break;
+        default:
+            assert(false);
+        };
+
+        ret[column_name] = qdb::masked_array{values, mask}.to_object(masked_);
+    }
+
+    return ret;
+}
+
+/**
+ * Ensures `xs` is an array we can write into directly.
+ */
+static py::array output_array_of(std::string const & name, py::handle xs)
+{
+    if (!py::isinstance<py::array>(xs)) [[unlikely]]
+    {
+        throw qdb::invalid_argument_exception{"Output for column '" + name + "' must be a numpy array"};
+    }
+
+    py::array xs_ = py::reinterpret_borrow<py::array>(xs);
+
+    if (xs_.ndim() != 1 || !(xs_.flags() & py::array::c_style) || !xs_.writeable()) [[unlikely]]
+    {
+        throw qdb::invalid_argument_exception{"Output array for column '" + name
+                                              + "' must be a writeable, 1-dimensional and "
+                                                "contiguous array"};
+    }
+
+    return xs_;
+}
+
+static traits::dtype_kind output_kind_of(std::string const & name, py::array const & xs)
+{
+    py::dtype dt = xs.dtype();
+
+    if (traits::int64_dtype::is_dtype(dt))
+    {
+        return traits::int_kind;
+    }
+    else if (traits::float64_dtype::is_dtype(dt))
+    {
+        return traits::float_kind;
+    }
+    else if (py::str(dt).cast<std::string>() == "datetime64[ns]")
+    {
+        return traits::datetime_kind;
+    }
+    else if (traits::pyobject_dtype::is_dtype(dt))
+    {
+        return traits::object_kind;
+    }
+
+    throw qdb::incompatible_type_exception{
+        "Output array for column '" + name + "' has unsupported dtype "
+        + py::str(dt).cast<std::string>() + ": expected int64, float64, datetime64[ns] or object"};
+}
+
+/**
+ * Returns true if values of a column of type `type` can be written into an array of `kind`.
+ */
+static constexpr bool is_output_compatible(qdb_ts_column_type_t type, traits::dtype_kind kind)
+{
+    switch (type)
+    {
+    case qdb_ts_column_int64:
+        return kind == traits::int_kind;
+    case qdb_ts_column_double:
+        return kind == traits::float_kind;
+    case qdb_ts_column_timestamp:
+        return kind == traits::datetime_kind;
+    case qdb_ts_column_string:
+    case qdb_ts_column_blob:
+        return kind == traits::object_kind;
+    default:
+        return false;
+    };
+}
+
+reader_output::reader_output(py::dict const & out)
+{
+    for (auto [k, v] : out)
+    {
+        column xs{};
+        xs.name = py::cast<std::string>(k);
+
+        if (py::isinstance<py::tuple>(v))
+        {
+            py::tuple v_ = py::reinterpret_borrow<py::tuple>(v);
+
+            if (v_.size() != 2) [[unlikely]]
+            {
+                throw qdb::invalid_argument_exception{
+                    "Output for column '" + xs.name + "' must be a tuple of (values, validity)"};
+            }
+
+            xs.values   = output_array_of(xs.name, v_[0]);
+            xs.validity = output_array_of(xs.name, v_[1]);
+
+            if (xs.validity.dtype().kind() != 'b' || xs.validity.size() != xs.values.size())
+                [[unlikely]]
+            {
+                throw qdb::invalid_argument_exception{"Validity array for column '" + xs.name
+                                                      + "' must be a bool array with the same "
+                                                        "length as its values"};
+            }
+        }
+        else
+        {
+            xs.values = output_array_of(xs.name, v);
+        }
+
+        xs.kind     = output_kind_of(xs.name, xs.values);
+        xs.capacity = static_cast<std::size_t>(xs.values.size());
+        xs.data     = xs.values.mutable_data();
+        xs.valid    = xs.validity ? static_cast<bool *>(xs.validity.mutable_data()) : nullptr;
+
+        if (xs.name == "$timestamp")
+        {
+            if (xs.kind != traits::datetime_kind) [[unlikely]]
+            {
+                throw qdb::incompatible_type_exception{
+                    "Output array for column '$timestamp' must have dtype datetime64[ns]"};
+            }
+
+            timestamps_ = columns_.size();
+        }
+
+        index_.emplace(xs.name, columns_.size());
+        columns_.push_back(std::move(xs));
+    }
+}
+
+void reader_output::column::pad(std::size_t offset, std::size_t n)
+{
+    switch (kind)
+    {
+    case traits::int_kind:
+        std::fill_n(static_cast<std::int64_t *>(data) + offset, n, traits::int64_dtype::null_value());
+        break;
+    case traits::float_kind:
+        std::fill_n(static_cast<double *>(data) + offset, n, traits::float64_dtype::null_value());
+        break;
+    case traits::datetime_kind:
+        std::fill_n(
+            static_cast<std::int64_t *>(data) + offset, n, traits::datetime64_ns_dtype::null_value());
+        break;
+    case traits::object_kind:
+        // Requires the GIL
+        for (PyObject *& x : ranges::views::counted(static_cast<PyObject **>(data) + offset, n))
+        {
+            Py_INCREF(Py_None);
+            Py_XSETREF(x, Py_None);
+        }
+        break;
+    default:
+        break;
+    };
+
+    if (valid != nullptr)
+    {
+        std::fill_n(valid + offset, n, false);
+    }
+}
+
+/**
+ * Copies `n` native values into `dst`, and sets their validity if requested.
+ */
+template <concepts::dtype Dtype, typename From>
+static inline void write_output(
+    From const * xs, std::size_t n, void * dst, bool * valid, std::size_t offset) noexcept
+{
+    using value_type = typename Dtype::value_type;
+
+    value_type * dst_ = static_cast<value_type *>(dst) + offset;
+
+    for (std::size_t i = 0; i < n; ++i)
+    {
+        if constexpr (std::is_same_v<From, qdb_timespec_t>)
+        {
+            dst_[i] = convert::value<qdb_timespec_t, std::int64_t>(xs[i]);
+        }
+        else
+        {
+            dst_[i] = xs[i];
+        }
+    }
+
+    if (valid != nullptr)
+    {
+        for (std::size_t i = 0; i < n; ++i)
+        {
+            valid[offset + i] = !traits::is_null(xs[i]);
+        }
+    }
+}
+
+/**
+ * Writes `n` native strings or blobs as Python objects into `dst`. Requires the GIL.
+ */
+template <typename From>
+static inline void write_output_objects(
+    From const * xs, std::size_t n, void * dst, bool * valid, std::size_t offset)
+{
+    PyObject ** dst_ = static_cast<PyObject **>(dst) + offset;
+
+    for (std::size_t i = 0; i < n; ++i)
+    {
+        bool is_null = traits::is_null(xs[i]);
+        py::object x;
+
+        if (is_null)
+        {
+            x = py::none();
+        }
+        else if constexpr (std::is_same_v<From, qdb_string_t>)
+        {
+            x = py::str{xs[i].data, xs[i].length};
+        }
+        else
+        {
+            x = py::bytes{static_cast<char const *>(xs[i].content), xs[i].content_length};
+        }
+
+        Py_XSETREF(dst_[i], x.release().ptr());
+
+        if (valid != nullptr)
+        {
+            valid[offset + i] = !is_null;
+        }
+    }
+}
+
+void reader_output::append(qdb_bulk_reader_table_data_t const & data)
+{
+    std::size_t n = data.row_count;
+
+    for (column & xs : columns_)
+    {
+        if (xs.capacity < offset_ + n) [[unlikely]]
+        {
+            throw qdb::out_of_bounds_exception{
+                "Output array for column '" + xs.name + "' is too small: need room for at least "
+                + std::to_string(offset_ + n) + " rows, but it has " + std::to_string(xs.capacity)};
+        }
+
+        xs.batch = nullptr;
+    }
+
+    for (qdb_exp_batch_push_column_t const & x :
+        ranges::views::counted(data.columns, data.column_count))
+    {
+        auto pos = index_.find(x.name);
+
+        if (pos == index_.end())
+        {
+            continue;
+        }
+
+        column & xs = columns_[pos->second];
+
+        if (!is_output_compatible(x.data_type, xs.kind)) [[unlikely]]
+        {
+            throw qdb::incompatible_type_exception{"Output array for column '" + xs.name
+                                                   + "' has a dtype that is incompatible with "
+                                                     "the column's type"};
+        }
+
+        xs.batch = &x;
+    }
+
+    {
+        // Numeric values are plain copies, which don't involve Python at all.
+        py::gil_scoped_release release{};
+
+        if (timestamps_.has_value())
+        {
+            column & xs = columns_[*timestamps_];
+            write_output<traits::datetime64_ns_dtype>(data.timestamps, n, xs.data, xs.valid, offset_);
+        }
+
+        for (column & xs : columns_)
+        {
+            if (xs.kind == traits::object_kind || xs.name == "$timestamp")
+            {
+                continue;
+            }
+            else if (xs.batch == nullptr)
+            {
+                xs.pad(offset_, n);
+                continue;
+            }
+
+            switch (xs.batch->data_type)
+            {
+            case qdb_ts_column_int64:
+                write_output<traits::int64_dtype>(xs.batch->data.ints, n, xs.data, xs.valid, offset_);
+                break;
+            case qdb_ts_column_double:
+                write_output<traits::float64_dtype>(
+                    xs.batch->data.doubles, n, xs.data, xs.valid, offset_);
+                break;
+            case qdb_ts_column_timestamp:
+                write_output<traits::datetime64_ns_dtype>(
+                    xs.batch->data.timestamps, n, xs.data, xs.valid, offset_);
+                break;
+            default:
+                assert(false);
+            };
+        }
+    }
+
+    for (column & xs : columns_)
+    {
+        if (xs.kind != traits::object_kind)
+        {
+            continue;
+        }
+        else if (xs.batch == nullptr)
+        {
+            xs.pad(offset_, n);
+            continue;
+        }
+
+        if (xs.batch->data_type == qdb_ts_column_string)
+        {
+            write_output_objects(xs.batch->data.strings, n, xs.data, xs.valid, offset_);
+        }
+        else
+        {
+            write_output_objects(xs.batch->data.blobs, n, xs.data, xs.valid, offset_);
+        }
+    }
+
+    offset_ += n;
+}
+
+py::object reader_arrow_iterator::operator*()
+{
+    // Values are copied into Arrow buffers, so the native batch is released as usual
+    // when the iterator is advanced.
+    return arrow::record_batch(xs_.batch());
+}
+
+reader_iterator & reader_iterator::operator++()
+{
+    if (ptr_ != nullptr)
+    {
+        // The consumer moved past this batch, so all of its rows are emitted.
+        progress_->observe(read_);
+
+        if (owner_)
+        {
+            // The capsule owns the batch, and releases it once all arrays are gone.
+            owner_ = py::object{};
+        }
+        else
+        {
+            qdb_release(*handle_, ptr_);
+        }
+
+        ptr_ = nullptr;
+    }
+
+    qdb_error_t err{qdb_e_ok};
+
+    // Message of errors raised by the prefetcher, which cannot be looked up from this thread.
+    std::string msg{};
+
+    for (;;)
+    {
+        if (prefetcher_ == nullptr)
+        {
+            // Fetching the data does not involve any Python objects, so let other threads run
+            // while we're waiting for the cluster.
+            py::gil_scoped_release release{};
+            err = qdb_bulk_reader_get_data(reader_, &ptr_, sizer_->next());
+
+            if (err == qdb_e_ok)
+            {
+                sizer_->observe(*ptr_);
+            }
+        }
+        else
+        {
+            // Ownership of the batch is transferred to us; it's released the same way as
+            // batches we fetched ourselves.
+            err = prefetcher_->next(&ptr_, msg);
+        }
+
+        if (err != qdb_e_ok)
+        {
+            break;
+        }
+
+        read_ = *ptr_;
+
+        // When resuming, leave out the rows that were emitted before.
+        std::size_t skip = progress_->skip(read_);
+
+        if (skip > 0 && skip == read_.row_count)
+        {
+            qdb_release(*handle_, ptr_);
+            ptr_ = nullptr;
+            continue;
+        }
+        else if (skip > 0)
+        {
+            read_.row_count -= skip;
+            read_.timestamps += skip;
+
+            columns_.assign(ptr_->columns, ptr_->columns + ptr_->column_count);
+            for (qdb_exp_batch_push_column_t & x : columns_)
+            {
+                switch (x.data_type)
+                {
+                case qdb_ts_column_int64:
+                    x.data.ints += skip;
+                    break;
+                case qdb_ts_column_double:
+                    x.data.doubles += skip;
+                    break;
+                case qdb_ts_column_timestamp:
+                    x.data.timestamps += skip;
+                    break;
+                case qdb_ts_column_string:
+                    x.data.strings += skip;
+                    break;
+                case qdb_ts_column_blob:
+                    x.data.blobs += skip;
+                    break;
+                default:
+                    break;
+                };
+            }
+
+            read_.columns = columns_.data();
+        }
+
+        if (filter_->empty()) [[likely]]
+        {
+            batch_    = read_;
+            filtered_ = false;
+            break;
+        }
+
+        filter_->bind(read_);
+
+        {
+            py::gil_scoped_release release{};
+            batch_ = filter_->apply(read_);
+        }
+
+        filtered_ = (batch_.row_count != read_.row_count);
+
+        if (batch_.row_count == 0 && read_.row_count > 0)
+        {
+            // Nothing in this batch matches, but its rows still count as read.
+            progress_->observe(read_);
+            qdb_release(*handle_, ptr_);
+            ptr_ = nullptr;
+            continue;
+        }
+
+        break;
+    }
+
+    if (err == qdb_e_ok)
+    {
+        batch_ = table_column_->apply(batch_);
+    }
+
+    if (err == qdb_e_iterator_end) [[unlikely]]
+    {
+        // We have reached the end -- reset all our internal state, and make us look
+        // like the "end" iterator.
+        handle_       = nullptr;
+        reader_       = nullptr;
+        prefetcher_   = nullptr;
+        sizer_        = nullptr;
+        progress_     = nullptr;
+        filter_       = nullptr;
+        table_column_ = nullptr;
+        table_count_  = 0;
+        ptr_          = nullptr;
+        n_            = 0;
+    }
+    else
+    {
+        if (err != qdb_e_ok && !msg.empty()) [[unlikely]]
+        {
+            qdb::qdb_throw_error(err, msg);
+        }
+
+        qdb::qdb_throw_if_error(*handle_, err);
+
+        // I like assertions
+        assert(handle_ != nullptr);
+        assert(reader_ != nullptr);
+        assert(ptr_ != nullptr);
+    } // if (err == qdb_e_iterator_end)
+
+    return *this;
+};
+
+/* static */ std::optional<reader_checkpoint> reader_checkpoint::of_object(py::object const & x)
+{
+    if (x.is_none())
+    {
+        return std::nullopt;
+    }
+    else if (py::isinstance<py::dict>(x) == false) [[unlikely]]
+    {
+        throw qdb::invalid_argument_exception{
+            "A checkpoint should be a dict as returned by Reader.checkpoint(), got: "
+            + py::repr(x).cast<std::string>()};
+    }
+
+    py::dict xs = x.cast<py::dict>();
+
+    if (xs.contains("table") == false || xs.contains("timestamp") == false) [[unlikely]]
+    {
+        throw qdb::invalid_argument_exception{
+            "A checkpoint should at least contain 'table' and 'timestamp', got: "
+            + py::repr(x).cast<std::string>()};
+    }
+
+    reader_checkpoint ret{};
+
+    ret.table     = xs["table"].cast<std::string>();
+    ret.timestamp = convert::value<qdb_timespec_t, std::int64_t>(
+        convert::value<py::object, qdb_timespec_t>(xs["timestamp"]));
+    ret.rows = xs.contains("rows") ? xs["rows"].cast<std::size_t>() : 0;
+
+    if (xs.contains("finished"))
+    {
+        ret.finished = xs["finished"].cast<std::vector<std::string>>();
+    }
+
+    return ret;
+}
+
+/* static */ qdb_string_t const * reader_progress::tables_of(
+    qdb_bulk_reader_table_data_t const & data) noexcept
+{
+    // Batches can span multiple tables, in which case the table of each row is available
+    // in the `$table` column.
+    for (qdb_exp_batch_push_column_t const & x :
+        ranges::views::counted(data.columns, data.column_count))
+    {
+        if (x.data_type == qdb_ts_column_string && std::string_view{x.name} == "$table")
+        {
+            return x.data.strings;
+        }
+    }
+
+    return nullptr;
+}
+
+std::string_view reader_progress::table_of(qdb_string_t const * tables, std::size_t i) const noexcept
+{
+    return tables == nullptr ? std::string_view{table_}
+                             : std::string_view{tables[i].data, tables[i].length};
+}
+
+std::size_t reader_progress::skip(qdb_bulk_reader_table_data_t const & data) noexcept
+{
+    if (skip_ == 0 || data.row_count == 0) [[likely]]
+    {
+        return 0;
+    }
+
+    assert(checkpoint_.has_value());
+
+    qdb_string_t const * tables = tables_of(data);
+
+    if (table_of(tables, 0) != checkpoint_->table)
+    {
+        // Rows of another table come first, the rows to skip are still to come.
+        return 0;
+    }
+
+    std::size_t n = 0;
+    while (
+        n < data.row_count && n < skip_ && table_of(tables, n) == checkpoint_->table
+        && convert::value<qdb_timespec_t, std::int64_t>(data.timestamps[n]) == checkpoint_->timestamp)
+    {
+        ++n;
+    }
+
+    // Rows at the checkpoint's timestamp can continue in the next batch only if this one
+    // is skipped entirely.
+    skip_ = (n == data.row_count) ? skip_ - n : 0;
+
+    return n;
+}
+
+void reader_progress::observe(qdb_bulk_reader_table_data_t const & data)
+{
+    std::size_t n = data.row_count;
+
+    if (n == 0) [[unlikely]]
+    {
+        return;
+    }
+
+    qdb_string_t const * tables = tables_of(data);
+    auto table_of               = [this, tables](std::size_t i) { return this->table_of(tables, i); };
+
+    std::string_view table = table_of(n - 1);
+    std::int64_t timestamp = convert::value<qdb_timespec_t, std::int64_t>(data.timestamps[n - 1]);
+
+    // Count the rows at the end of the batch that share the same position
+    std::size_t rows = 1;
+    while (rows < n && table_of(n - 1 - rows) == table
+           && convert::value<qdb_timespec_t, std::int64_t>(data.timestamps[n - 1 - rows]) == timestamp)
+    {
+        ++rows;
+    }
+
+    std::vector<std::string> finished{};
+
+    if (checkpoint_.has_value())
+    {
+        if (rows == n && checkpoint_->table == table && checkpoint_->timestamp == timestamp)
+        {
+            // The whole batch continues the rows of the previous checkpoint.
+            rows += checkpoint_->rows;
+        }
+
+        finished = std::move(checkpoint_->finished);
+    }
+
+    // The rows of every table are emitted contiguously: a table is finished as soon as
+    // rows of another table are emitted. This only depends on what was actually emitted,
+    // not on the order in which the tables were requested.
+    auto finish = [&finished](std::string_view x) {
+        if (std::find(finished.begin(), finished.end(), x) == finished.end())
+        {
+            finished.emplace_back(x);
+        }
+    };
+
+    std::string_view prev =
+        checkpoint_.has_value() ? std::string_view{checkpoint_->table} : table_of(0);
+
+    if (tables == nullptr)
+    {
+        if (table != prev)
+        {
+            finish(prev);
+        }
+    }
+    else
+    {
+        for (std::size_t i = 0; i < n; ++i)
+        {
+            std::string_view x = table_of(i);
+
+            if (x != prev)
+            {
+                finish(prev);
+                prev = x;
+            }
+        }
+    }
+
+    checkpoint_ = reader_checkpoint{std::string{table}, timestamp, rows, std::move(finished)};
+}
+
+reader_table_column::reader_table_column(
+    table_column_t mode, std::vector<std::string> const & table_names)
+    : mode_{mode}
+{
+    for (std::size_t i = 0; i < table_names.size(); ++i)
+    {
+        codes_of_.try_emplace(table_names[i], static_cast<std::int64_t>(i));
+    }
+}
+
+qdb_bulk_reader_table_data_t const & reader_table_column::apply(
+    qdb_bulk_reader_table_data_t const & data)
+{
+    if (mode_ == table_column_default)
+    {
+        return data;
+    }
+
+    auto columns = ranges::views::counted(data.columns, data.column_count);
+    auto column =
+        std::find_if(columns.begin(), columns.end(), [](qdb_exp_batch_push_column_t const & x) {
+            return x.data_type == qdb_ts_column_string && std::string_view{x.name} == "$table";
+        });
+
+    if (column == columns.end())
+    {
+        return data;
+    }
+
+    std::size_t pos = static_cast<std::size_t>(std::distance(columns.begin(), column));
+
+    data_ = data;
+    columns_.assign(data.columns, data.columns + data.column_count);
+
+    if (mode_ == table_column_omit)
+    {
+        columns_.erase(columns_.begin() + pos);
+    }
+    else
+    {
+        assert(mode_ == table_column_codes);
+
+        qdb_string_t const * xs = columns_[pos].data.strings;
+
+        codes_.resize(data.row_count);
+
+        std::string_view last{};
+        std::int64_t code{0};
+
+        for (std::size_t i = 0; i < data.row_count; ++i)
+        {
+            std::string_view x{xs[i].data, xs[i].length};
+
+            if (i == 0 || x != last) [[unlikely]]
+            {
+                auto found = codes_of_.find(x);
+                if (found == codes_of_.end()) [[unlikely]]
+                {
+                    // A code of -1 would silently resolve to the last table.
+                    throw qdb::internal_local_exception{
+                        "Internal error: row of table '" + std::string{x}
+                        + "' returned by reader, which is not one of the tables read"};
+                }
+
+                code = found->second;
+                last = x;
+            }
+
+            codes_[i] = code;
+        }
+
+        columns_[pos].data_type = qdb_ts_column_int64;
+        columns_[pos].data.ints = codes_.data();
+    }
+
+    data_.columns      = columns_.data();
+    data_.column_count = columns_.size();
+
+    return data_;
+}
+
+static reader_filter::op_t filter_op_of(std::string const & x)
+{
+    using op_t = reader_filter::op_t;
+
+    static std::unordered_map<std::string, op_t> const ops{
+        {"==", op_t::eq},
+        {"!=", op_t::ne},
+        {"<", op_t::lt},
+        {"<=", op_t::le},
+        {">", op_t::gt},
+        {">=", op_t::ge},
+        {"in", op_t::in},
+        {"not in", op_t::not_in},
+    };
+
+    auto op = ops.find(x);
+    if (op != ops.end()) [[likely]]
+    {
+        return op->second;
+    }
+
+    throw qdb::invalid_argument_exception{
+        "Invalid filter operator '" + x + "', expected one of: ==, !=, <, <=, >, >=, in, not in"};
+}
+
+/**
+ * Returns the column `name` of `data`, or nullptr if there is no such column.
+ */
+static qdb_exp_batch_push_column_t const * filter_column_of(
+    qdb_bulk_reader_table_data_t const & data, std::string const & name) noexcept
+{
+    for (std::size_t i = 0; i < data.column_count; ++i)
+    {
+        if (name == data.columns[i].name)
+        {
+            return &data.columns[i];
+        }
+    }
+
+    return nullptr;
+}
+
+template <typename T, typename U>
+static inline bool filter_matches(
+    reader_filter::op_t op, T const & x, std::vector<U> const & ys) noexcept
+{
+    using op_t = reader_filter::op_t;
+
+    switch (op)
+    {
+    case op_t::eq:
+        return x == ys.front();
+    case op_t::ne:
+        return x != ys.front();
+    case op_t::lt:
+        return x < ys.front();
+    case op_t::le:
+        return x <= ys.front();
+    case op_t::gt:
+        return x > ys.front();
+    case op_t::ge:
+        return x >= ys.front();
+    case op_t::in:
+        return std::binary_search(ys.begin(), ys.end(), x);
+    case op_t::not_in:
+        return std::binary_search(ys.begin(), ys.end(), x) == false;
+    };
+
+    return false;
+}
+
+/**
+ * Only keeps the rows for which `keep` returns true.
+ */
+template <typename F>
+static inline void filter_rows(std::vector<std::size_t> & rows, F && keep)
+{
+    rows.erase(std::remove_if(rows.begin(), rows.end(), [&keep](std::size_t i) { return !keep(i); }),
+        rows.end());
+}
+
+/**
+ * Copies the selected `rows` of `xs` into `out`, and returns a pointer to the copy.
+ */
+template <typename T>
+static inline T const * filter_gather(
+    T const * xs, std::vector<std::size_t> const & rows, std::vector<std::byte> & out)
+{
+    static_assert(std::is_trivially_copyable_v<T>);
+
+    out.resize(rows.size() * sizeof(T));
+    T * ys = reinterpret_cast<T *>(out.data());
+
+    for (std::size_t i = 0; i < rows.size(); ++i)
+    {
+        ys[i] = xs[rows[i]];
+    }
+
+    return ys;
+}
+
+/* static */ reader_filter reader_filter::of_object(py::object const & xs)
+{
+    reader_filter ret{};
+
+    if (xs.is_none())
+    {
+        return ret;
+    }
+
+    for (py::handle x : xs)
+    {
+        if (py::isinstance<py::sequence>(x) == false || py::isinstance<py::str>(x) == true
+            || py::len(x) != 3) [[unlikely]]
+        {
+            throw qdb::invalid_argument_exception{
+                "A filter should be a list of (column, op, value) tuples, got: "
+                + py::repr(x).cast<std::string>()};
+        }
+
+        py::sequence x_ = py::reinterpret_borrow<py::sequence>(x);
 
-    py::array idx          = convert::array<qdb_timespec_t, traits::datetime64_ns_dtype>(timestamps);
-    qdb::masked_array idx_ = qdb::masked_array::masked_none(idx);
+        predicate y{};
+        y.column = x_[0].cast<std::string>();
+        y.op     = filter_op_of(x_[1].cast<std::string>());
+        y.value  = x_[2];
 
-    ret[py::str("$timestamp")] = idx;
+        if (y.op == op_t::in || y.op == op_t::not_in)
+        {
+            if (py::isinstance<py::sequence>(y.value) == false || py::isinstance<py::str>(y.value)
+                || py::isinstance<py::bytes>(y.value)) [[unlikely]]
+            {
+                throw qdb::invalid_argument_exception{
+                    "Filter operator '" + x_[1].cast<std::string>() + "' on column '" + y.column
+                    + "' expects a sequence of values, got: " + py::repr(y.value).cast<std::string>()};
+            }
+        }
 
-    for (qdb_exp_batch_push_column_t const & column : columns)
+        ret.predicates_.push_back(std::move(y));
+    }
+
+    return ret;
+}
+
+void reader_filter::bind(qdb_bulk_reader_table_data_t const & data)
+{
+    for (predicate & x : predicates_)
     {
-        py::str column_name{column.name};
+        qdb_ts_column_type_t type{qdb_ts_column_timestamp};
 
-        qdb::masked_array xs;
-        switch (column.data_type)
+        if (x.column != "$timestamp")
+        {
+            qdb_exp_batch_push_column_t const * column = filter_column_of(data, x.column);
+
+            if (column == nullptr) [[unlikely]]
+            {
+                throw qdb::invalid_argument_exception{
+                    "Cannot filter on column '" + x.column + "': column is not read"};
+            }
+
+            type = column->data_type;
+        }
+
+        if (type == x.type) [[likely]]
+        {
+            continue;
+        }
+
+        x.ints.clear();
+        x.doubles.clear();
+        x.strings.clear();
+
+        std::vector<py::object> values{};
+        if (x.op == op_t::in || x.op == op_t::not_in)
+        {
+            for (py::handle y : x.value)
+            {
+                values.push_back(py::reinterpret_borrow<py::object>(y));
+            }
+        }
+        else
+        {
+            values.push_back(x.value);
+        }
+
+        try
+        {
+            for (py::object const & y : values)
+            {
+                switch (type)
+                {
+                case qdb_ts_column_int64:
+                    x.ints.push_back(y.cast<std::int64_t>());
+                    break;
+                case qdb_ts_column_double:
+                    x.doubles.push_back(y.cast<double>());
+                    break;
+                case qdb_ts_column_timestamp:
+                    x.ints.push_back(convert::value<qdb_timespec_t, std::int64_t>(
+                        convert::value<py::object, qdb_timespec_t>(y)));
+                    break;
+                case qdb_ts_column_string:
+                case qdb_ts_column_blob:
+                    x.strings.push_back(y.cast<std::string>());
+                    break;
+                default:
+                    throw qdb::not_implemented_exception{
+                        "Cannot filter on column '" + x.column + "': unsupported column type"};
+                };
+            }
+        }
+        catch (py::cast_error const & /* e */)
+        {
+            throw qdb::incompatible_type_exception{"Filter value "
+                                                   + py::repr(x.value).cast<std::string>()
+                                                   + " is incompatible with column '" + x.column + "'"};
+        }
+
+        // `in` and `not in` use a binary search
+        std::sort(x.ints.begin(), x.ints.end());
+        std::sort(x.doubles.begin(), x.doubles.end());
+        std::sort(x.strings.begin(), x.strings.end());
+
+        x.type = type;
+    }
+}
+
+qdb_bulk_reader_table_data_t const & reader_filter::apply(qdb_bulk_reader_table_data_t const & data)
+{
+    rows_.resize(data.row_count);
+    std::iota(rows_.begin(), rows_.end(), std::size_t{0});
+
+    for (predicate const & x : predicates_)
+    {
+        if (x.column == "$timestamp")
+        {
+            filter_rows(rows_, [&x, &data](std::size_t i) {
+                qdb_timespec_t const & y = data.timestamps[i];
+                return traits::is_null(y) == false
+                       && filter_matches(x.op, convert::value<qdb_timespec_t, std::int64_t>(y), x.ints);
+            });
+            continue;
+        }
+
+        // `bind()` made sure the column exists
+        qdb_exp_batch_push_column_t const * column = filter_column_of(data, x.column);
+        assert(column != nullptr);
+
+        switch (x.type)
         {
         case qdb_ts_column_int64:
-            xs = convert::masked_array<qdb_int_t, traits::int64_dtype>(
-                ranges::views::counted(column.data.ints, data.row_count));
+            filter_rows(rows_, [&x, ys = column->data.ints](std::size_t i) {
+                return traits::is_null(ys[i]) == false && filter_matches(x.op, ys[i], x.ints);
+            });
             break;
         case qdb_ts_column_double:
-            xs = convert::masked_array<double, traits::float64_dtype>(
-                ranges::views::counted(column.data.doubles, data.row_count));
+            filter_rows(rows_, [&x, ys = column->data.doubles](std::size_t i) {
+                return traits::is_null(ys[i]) == false && filter_matches(x.op, ys[i], x.doubles);
+            });
+            break;
+        case qdb_ts_column_timestamp:
+            filter_rows(rows_, [&x, ys = column->data.timestamps](std::size_t i) {
+                return traits::is_null(ys[i]) == false
+                       && filter_matches(
+                           x.op, convert::value<qdb_timespec_t, std::int64_t>(ys[i]), x.ints);
+            });
             break;
         case qdb_ts_column_string:
-            xs = convert::masked_array<qdb_string_t, traits::unicode_dtype>(
-                ranges::views::counted(column.data.strings, data.row_count));
+            filter_rows(rows_, [&x, ys = column->data.strings](std::size_t i) {
+                return traits::is_null(ys[i]) == false
+                       && filter_matches(x.op, std::string_view{ys[i].data, ys[i].length}, x.strings);
+            });
             break;
         case qdb_ts_column_blob:
-            xs = convert::masked_array<qdb_blob_t, traits::pyobject_dtype>(
-                ranges::views::counted(column.data.blobs, data.row_count));
+            filter_rows(rows_, [&x, ys = column->data.blobs](std::size_t i) {
+                return traits::is_null(ys[i]) == false
+                       && filter_matches(x.op,
+                           std::string_view{
+                               static_cast<char const *>(ys[i].content), ys[i].content_length},
+                           x.strings);
+            });
+            break;
+        default:
+            break;
+        };
+    }
+
+    if (rows_.size() == data.row_count)
+    {
+        return data;
+    }
+
+    data_           = data;
+    data_.row_count = rows_.size();
+
+    timestamps_.resize(rows_.size());
+    for (std::size_t i = 0; i < rows_.size(); ++i)
+    {
+        timestamps_[i] = data.timestamps[rows_[i]];
+    }
+
+    data_.timestamps = timestamps_.data();
+
+    columns_.assign(data.columns, data.columns + data.column_count);
+    values_.resize(data.column_count);
+
+    for (std::size_t i = 0; i < columns_.size(); ++i)
+    {
+        qdb_exp_batch_push_column_t & x = columns_[i];
+
+        switch (x.data_type)
+        {
+        case qdb_ts_column_int64:
+            x.data.ints = filter_gather(x.data.ints, rows_, values_[i]);
+            break;
+        case qdb_ts_column_double:
+            x.data.doubles = filter_gather(x.data.doubles, rows_, values_[i]);
             break;
         case qdb_ts_column_timestamp:
-            xs = convert::masked_array<qdb_timespec_t, traits::datetime64_ns_dtype>(
-                ranges::views::counted(column.data.timestamps, data.row_count));
+            x.data.timestamps = filter_gather(x.data.timestamps, rows_, values_[i]);
+            break;
+        case qdb_ts_column_string:
+            x.data.strings = filter_gather(x.data.strings, rows_, values_[i]);
+            break;
+        case qdb_ts_column_blob:
+            x.data.blobs = filter_gather(x.data.blobs, rows_, values_[i]);
             break;
+        default:
+            break;
+        };
+    }
 
-        case qdb_ts_column_symbol:
-            // This should not happen, as "symbol" is just an internal representation, and symbols
-            // are exposed to the user as strings. If this actually happens, it indicates either
-            // a bug in the bulk reader *or* a memory corruption.
-            throw qdb::not_implemented_exception(
-                "Internal error: invalid data type: symbol column type returned from bulk reader");
+    data_.columns = columns_.data();
 
-        case qdb_ts_column_uninitialized:
-            throw qdb::not_implemented_exception(
-                "Internal error: invalid data type: uninitialized column "
-                "type returned from bulk reader");
+    return data_;
+}
+
+std::size_t reader_batch_sizer::next() const noexcept
+{
+    if (max_batch_bytes_ == 0)
+    {
+        return batch_size_;
+    }
+    else if (rows_ == 0)
+    {
+        return batch_size_ == 0 ? probe_rows : std::min(batch_size_, probe_rows);
+    }
+
+    std::size_t bytes_per_row = std::max(bytes_ / rows_, std::size_t{1});
+    return std::max(max_batch_bytes_ / bytes_per_row, std::size_t{1});
+}
+
+void reader_batch_sizer::observe(qdb_bulk_reader_table_data_t const & data) noexcept
+{
+    std::size_t n = data.row_count;
+
+    // The index
+    std::size_t bytes = n * sizeof(qdb_timespec_t);
+
+    for (qdb_exp_batch_push_column_t const & x :
+        ranges::views::counted(data.columns, data.column_count))
+    {
+        switch (x.data_type)
+        {
+        case qdb_ts_column_int64:
+            bytes += n * sizeof(qdb_int_t);
+            break;
+        case qdb_ts_column_double:
+            bytes += n * sizeof(double);
+            break;
+        case qdb_ts_column_timestamp:
+            bytes += n * sizeof(qdb_timespec_t);
+            break;
+        case qdb_ts_column_string:
+            bytes += n * sizeof(qdb_string_t);
+            for (qdb_string_t const & y : ranges::views::counted(x.data.strings, n))
+            {
+                bytes += y.length;
+            }
+            break;
+        case qdb_ts_column_blob:
+            bytes += n * sizeof(qdb_blob_t);
+            for (qdb_blob_t const & y : ranges::views::counted(x.data.blobs, n))
+            {
+                bytes += y.content_length;
+            }
+            break;
+        default:
+            break;
         };
+    }
 
-        ret[std::move(column_name)] = std::move(xs.cast(py::return_value_policy::move));
+    rows_ += n;
+    bytes_ += bytes;
+}
+
+reader_prefetcher::reader_prefetcher(
+    handle_ptr handle, qdb_reader_handle_t reader, reader_batch_sizer sizer, std::size_t depth)
+    : handle_{handle}
+    , reader_{reader}
+    , sizer_{sizer}
+    , depth_{depth}
+    , stop_{false}
+    , done_{false}
+{
+    assert(depth_ > 0);
+
+    // Start the thread last, after all other state has been initialized.
+    thread_ = std::thread{&reader_prefetcher::run, this};
+}
+
+void reader_prefetcher::run()
+{
+    for (;;)
+    {
+        {
+            std::unique_lock<std::mutex> guard{lock_};
+            cond_.wait(guard, [this] { return stop_ || queue_.size() < depth_; });
+
+            if (stop_) [[unlikely]]
+            {
+                break;
+            }
+        }
+
+        // Fetch outside of the lock, so that the consumer can take batches from the queue
+        // in the meantime.
+        qdb_bulk_reader_table_data_t * ptr{nullptr};
+        qdb_error_t err = qdb_bulk_reader_get_data(reader_, &ptr, sizer_.next());
+
+        std::string msg{};
+
+        if (err == qdb_e_ok)
+        {
+            sizer_.observe(*ptr);
+        }
+        else if (err != qdb_e_iterator_end) [[unlikely]]
+        {
+            // The error context is only available from the thread that made the call, so grab
+            // the message now: the error is raised later on from the consumer's thread.
+            detail::qdb_resource<qdb_string_t> msg_{*handle_, nullptr};
+            qdb_error_t err_;
+            qdb_get_last_error(*handle_, &err_, &msg_);
+
+            msg = (err_ == err && msg_ != nullptr) ? std::string{msg_.get()->data}
+                                                   : std::string{qdb_error(err)};
+        }
+
+        std::lock_guard<std::mutex> guard{lock_};
+        queue_.push_back(batch{err, ptr, std::move(msg)});
+        cond_.notify_all();
+
+        if (err != qdb_e_ok) [[unlikely]]
+        {
+            // Either the end of the data, or an error which will be reported to the
+            // consumer; in both cases there is nothing more to fetch.
+            break;
+        }
     }
 
-    return ret;
+    std::lock_guard<std::mutex> guard{lock_};
+    done_ = true;
+    cond_.notify_all();
 }
 
-reader_iterator & reader_iterator::operator++()
+qdb_error_t reader_prefetcher::next(qdb_bulk_reader_table_data_t ** out, std::string & msg)
 {
-    if (ptr_ != nullptr)
+    // Waiting for the background thread can take a while, let other Python threads run.
+    py::gil_scoped_release release{};
+
+    std::unique_lock<std::mutex> guard{lock_};
+    cond_.wait(guard, [this] { return queue_.empty() == false || done_; });
+
+    if (queue_.empty()) [[unlikely]]
     {
-        qdb_release(*handle_, ptr_);
-        ptr_ = nullptr;
+        // The background thread already handed out its last batch or error: this happens
+        // when the consumer keeps on iterating after an error was raised.
+        *out = nullptr;
+        return qdb_e_iterator_end;
     }
 
-    qdb_error_t err = qdb_bulk_reader_get_data(reader_, &ptr_, batch_size_);
+    batch x = std::move(queue_.front());
+    queue_.pop_front();
 
-    if (err == qdb_e_iterator_end) [[unlikely]]
+    // There is room in the queue again
+    cond_.notify_all();
+
+    *out = x.ptr;
+    msg  = std::move(x.msg);
+    return x.err;
+}
+
+void reader_prefetcher::stop()
+{
     {
-        // We have reached the end -- reset all our internal state, and make us look
-        // like the "end" iterator.
-        handle_      = nullptr;
-        reader_      = nullptr;
-        batch_size_  = 0;
-        table_count_ = 0;
-        ptr_         = nullptr;
-        n_           = 0;
+        std::lock_guard<std::mutex> guard{lock_};
+        stop_ = true;
+        cond_.notify_all();
     }
-    else
+
+    if (thread_.joinable())
     {
-        qdb::qdb_throw_if_error(*handle_, err);
+        // The background thread may be in the middle of a fetch, which can take a while. It
+        // never touches Python, so let other Python threads run while we wait for it.
+        if (PyGILState_Check() == 1)
+        {
+            py::gil_scoped_release release{};
+            thread_.join();
+        }
+        else
+        {
+            thread_.join();
+        }
+    }
 
-        // I like assertions
-        assert(handle_ != nullptr);
-        assert(reader_ != nullptr);
-        assert(ptr_ != nullptr);
-    } // if (err == qdb_e_iterator_end)
+    // The background thread is gone, so we can safely access the queue without locks.
+    for (batch const & x : queue_)
+    {
+        if (x.ptr != nullptr)
+        {
+            qdb_release(*handle_, x.ptr);
+        }
+    }
 
-    return *this;
-};
+    queue_.clear();
+}
 
 }; // namespace detail
 
@@ -165,29 +1680,178 @@ qdb::reader const & reader::enter()
     assert((columns == nullptr) == (column_names_.empty() == true));
     assert((ranges == nullptr) == (ranges_.empty() == true));
 
-    for (std::string const & table_name : table_names_)
+    if (resume_from_.has_value() == false)
     {
-        tables.emplace_back(qdb_bulk_reader_table_t{
-            // because the scope of `table_name` outlives this function, we can just directly
-            // use .c_str() without any copies.
-            table_name.c_str(), //
-            ranges,             //
-            ranges_.size()      //
-        });
+        for (std::string const & table_name : table_names_)
+        {
+            tables.emplace_back(qdb_bulk_reader_table_t{
+                // because the scope of `table_name` outlives this function, we can just directly
+                // use .c_str() without any copies.
+                table_name.c_str(), //
+                ranges,             //
+                ranges_.size()      //
+            });
+        }
+    }
+    else
+    {
+        enter_resumed(tables, ranges);
+    }
+
+    progress_ =
+        detail::reader_progress{resume_from_, tables.empty() ? std::string{} : tables.front().name};
+    exhausted_ = resume_from_.has_value() && tables.empty();
+
+    if (exhausted_)
+    {
+        logger_.debug("nothing left to read after checkpoint");
+        return *this;
     }
 
     qdb::qdb_throw_if_error(*handle_, qdb_bulk_reader_fetch(*handle_, columns, column_names_.size(),
                                           tables.data(), tables.size(), &reader_));
 
+    if (prefetch_ > 0)
+    {
+        logger_.debug("prefetching up to %d batches in the background", prefetch_);
+        prefetcher_ = std::make_unique<detail::reader_prefetcher>(handle_, reader_, sizer_, prefetch_);
+    }
+
     return *this;
 }
 
+void reader::enter_resumed(std::vector<qdb_bulk_reader_table_t> & tables, qdb_ts_range_t * ranges)
+{
+    assert(resume_from_.has_value());
+    detail::reader_checkpoint const & checkpoint = *resume_from_;
+
+    auto cur = std::find(table_names_.begin(), table_names_.end(), checkpoint.table);
+    if (cur == table_names_.end()) [[unlikely]]
+    {
+        throw qdb::invalid_argument_exception{
+            "Checkpoint refers to table '" + checkpoint.table + "', which is not read by this reader"};
+    }
+
+    // Only the tables the checkpoint lists as finished are read entirely already, and the
+    // checkpoint's table only needs to be read from the checkpoint's timestamp onwards.
+    // Rows at exactly that timestamp that were already emitted are skipped while iterating.
+    qdb_timespec_t begin = convert::value<std::int64_t, qdb_timespec_t>(checkpoint.timestamp);
+
+    std::size_t range_count{0};
+    qdb_ts_range_t * remaining{nullptr};
+
+    if (ranges_.empty() == true)
+    {
+        range_count  = 1;
+        remaining    = object_tracker::alloc<qdb_ts_range_t>(sizeof(qdb_ts_range_t));
+        remaining[0] = qdb_ts_range_t{begin,
+            convert::value<std::int64_t, qdb_timespec_t>(std::numeric_limits<std::int64_t>::max())};
+    }
+    else
+    {
+        remaining = object_tracker::alloc<qdb_ts_range_t>(ranges_.size() * sizeof(qdb_ts_range_t));
+
+        for (std::size_t i = 0; i < ranges_.size(); ++i)
+        {
+            qdb_ts_range_t x = ranges[i];
+
+            if (convert::value<qdb_timespec_t, std::int64_t>(x.end) <= checkpoint.timestamp)
+            {
+                // Range ends before the checkpoint
+                continue;
+            }
+            else if (convert::value<qdb_timespec_t, std::int64_t>(x.begin) < checkpoint.timestamp)
+            {
+                x.begin = begin;
+            }
+
+            remaining[range_count++] = x;
+        }
+    }
+
+    auto is_finished = [&checkpoint](std::string const & x) {
+        return std::find(checkpoint.finished.begin(), checkpoint.finished.end(), x)
+               != checkpoint.finished.end();
+    };
+
+    if (range_count > 0)
+    {
+        tables.emplace_back(qdb_bulk_reader_table_t{cur->c_str(), remaining, range_count});
+    }
+
+    // Any other table that wasn't finished is read entirely, regardless of where it
+    // appears relative to the checkpoint's table.
+    for (std::string const & x : table_names_)
+    {
+        if (x != checkpoint.table && is_finished(x) == false)
+        {
+            tables.emplace_back(qdb_bulk_reader_table_t{x.c_str(), ranges, ranges_.size()});
+        }
+    }
+}
+
+py::object reader::checkpoint() const
+{
+    std::optional<detail::reader_checkpoint> const & checkpoint = progress_.checkpoint();
+
+    if (checkpoint.has_value() == false)
+    {
+        return py::none{};
+    }
+
+    // Only tables of which rows of another table were emitted afterwards are finished.
+    py::list finished{};
+    for (std::string const & x : checkpoint->finished)
+    {
+        finished.append(py::str{x});
+    }
+
+    py::dict ret{};
+    ret[py::str("table")]     = py::str{checkpoint->table};
+    ret[py::str("timestamp")] = convert::value<qdb_timespec_t, qdb::numpy::datetime64>(
+        convert::value<std::int64_t, qdb_timespec_t>(checkpoint->timestamp));
+    ret[py::str("rows")]     = py::int_{checkpoint->rows};
+    ret[py::str("finished")] = finished;
+
+    return ret;
+}
+
+std::size_t reader::read_into(py::dict const & out)
+{
+    detail::reader_output xs{out};
+
+    for (iterator cur = begin(); cur != end(); ++cur)
+    {
+        xs.append(cur.batch());
+    }
+
+    return xs.size();
+}
+
+py::dict reader::read_all()
+{
+    detail::reader_collector xs{strings_, masked_};
+
+    for (iterator cur = begin(); cur != end(); ++cur)
+    {
+        // Copying the batch only involves native data.
+        py::gil_scoped_release release{};
+        xs.append(cur.batch());
+    }
+
+    return xs.finalize();
+}
+
 void reader::close()
 {
     // Even though that from the API it looks like value, qdb_reader_handle_t is actually a pointer
     // itself that needs to be released. This static assert checks for that.
     static_assert(std::is_pointer<decltype(reader_)>());
 
+    // The prefetcher uses the reader handle from its own thread, so it must be stopped before
+    // the reader is released.
+    prefetcher_.reset();
+
     if (reader_ != nullptr)
     {
         logger_.debug("closing reader");
@@ -211,10 +1875,22 @@ void register_reader(py::module_ & m)
             return nullptr;
         }))
         .def("get_batch_size", &qdb::reader::get_batch_size)
+        .def("get_prefetch", &qdb::reader::get_prefetch)
+        .def("get_max_batch_bytes", &qdb::reader::get_max_batch_bytes)
+        .def("get_zero_copy", &qdb::reader::get_zero_copy)
+        .def("get_masked", &qdb::reader::get_masked)
+        .def("get_table_names", &qdb::reader::get_table_names)
         .def("__enter__", &qdb::reader::enter)
         .def("__exit__", &qdb::reader::exit)
         .def(
             "__iter__", [](qdb::reader & r) { return py::make_iterator(r.begin(), r.end()); },
+            py::keep_alive<0, 1>())
+        .def("checkpoint", &qdb::reader::checkpoint)
+        .def("read_all", &qdb::reader::read_all)
+        .def("read_into", &qdb::reader::read_into, py::arg("out"))
+        .def(
+            "arrow_batches",
+            [](qdb::reader & r) { return py::make_iterator(r.arrow_begin(), r.arrow_end()); },
             py::keep_alive<0, 1>());
 }
 
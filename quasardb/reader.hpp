@@ -34,7 +34,18 @@
 #include "logger.hpp"
 #include "object_tracker.hpp"
 #include "reader_fwd.hpp"
+#include "traits.hpp"
 #include <qdb/ts.h>
+#include "convert/strings.hpp"
+#include <condition_variable>
+#include <cstddef>
+#include <deque>
+#include <map>
+#include <mutex>
+#include <optional>
+#include <string>
+#include <string_view>
+#include <thread>
 #include <unordered_map>
 #include <vector>
 
@@ -58,8 +69,479 @@ public:
     /**
      * Utility function which converts table data into a vanilla dict. Currently this works well, as
      * there isn't any additional data/state we need to keep track of --
+     *
+     * When `owner` is set, int64 and double columns are not copied but refer directly to `data`,
+     * and keep `owner` alive.
+     *
+     * When `strings` is `strings_mode_categorical`, string columns are returned as a tuple of
+     * (codes, categories), see `convert::categorical()`.
+     *
+     * When `masked` is false, columns are returned as plain arrays rather than masked arrays,
+     * with nulls represented by the null value of their dtype.
+     */
+    static py::dict convert(qdb_bulk_reader_table_data_t const & data,
+        py::handle owner                = py::handle{},
+        convert::strings_mode_t strings = convert::strings_mode_default,
+        bool masked                     = true);
+
+    /**
+     * Takes ownership of a batch, and returns a capsule that releases it once it is collected.
+     */
+    static py::capsule make_owner(handle_ptr handle, qdb_bulk_reader_table_data_t * data);
+
+    /**
+     * Converts the `$table` codes of a batch, see `reader_table_column`, to an int32 array.
+     */
+    static py::array table_codes(std::int64_t const * xs, std::size_t n);
+};
+
+/**
+ * Accumulates the batches of a bulk reader into one contiguous buffer per column, so that
+ * an entire result set is returned as a single set of arrays rather than being
+ * concatenated batch by batch.
+ *
+ * Columns are matched by name: when reading multiple tables, columns missing from a
+ * batch are filled with null values.
+ */
+class reader_collector
+{
+public:
+    reader_collector(convert::strings_mode_t strings, bool masked)
+        : strings_{strings}
+        , masked_{masked}
+    {}
+
+    /**
+     * Copies a batch into the buffers. Does not touch any Python object, and can be
+     * called without the GIL.
+     */
+    void append(qdb_bulk_reader_table_data_t const & data);
+
+    /**
+     * Returns everything collected, in the same shape as `reader_data::convert()`. The
+     * int64, double and timestamp arrays take over the collected buffers without copying.
+     */
+    py::dict finalize();
+
+private:
+    struct column
+    {
+        std::string name;
+        qdb_ts_column_type_t type;
+
+        // Values of int64 columns, and of timestamp columns as nanoseconds
+        std::vector<std::int64_t> ints;
+        std::vector<double> doubles;
+
+        // Contents of string and blob columns, and the offset at which every row ends
+        std::vector<char> bytes;
+        std::vector<std::size_t> ends;
+
+        std::size_t size() const noexcept;
+
+        void pad(std::size_t n);
+    };
+
+    convert::strings_mode_t strings_;
+    bool masked_;
+    std::vector<std::int64_t> timestamps_;
+    std::vector<column> columns_;
+    std::unordered_map<std::string, std::size_t> index_;
+};
+
+/**
+ * Writes batches into arrays provided by the caller, at the running offset, without any
+ * intermediate arrays.
+ *
+ * `out` maps column names (and optionally `$timestamp`) to either a 1-dimensional array, or a
+ * tuple of (values, validity), where `validity` is a bool array that is set to True for every
+ * non-null value. int64, double and timestamp columns require int64, float64 and
+ * datetime64[ns] arrays, string and blob columns require object arrays. Columns of the table that
+ * are not part of `out` are skipped, and columns of `out` that are missing from a batch are
+ * padded with nulls.
+ */
+class reader_output
+{
+public:
+    explicit reader_output(py::dict const & out);
+
+    /**
+     * Writes a batch at the current offset. Only string and blob columns need the GIL, all
+     * other values are copied without it.
+     */
+    void append(qdb_bulk_reader_table_data_t const & data);
+
+    /**
+     * Amount of rows written so far.
+     */
+    inline std::size_t size() const noexcept
+    {
+        return offset_;
+    }
+
+private:
+    struct column
+    {
+        std::string name;
+
+        // Pinned for as long as we write into them
+        py::array values;
+        py::array validity;
+
+        // Kind of `values`, one of int64, float64, datetime64[ns] or object
+        traits::dtype_kind kind;
+        std::size_t capacity;
+
+        // Raw pointers into `values` and `validity`, so that we can write without the GIL
+        void * data;
+        bool * valid;
+
+        // The column's data in the current batch, if present
+        qdb_exp_batch_push_column_t const * batch;
+
+        void pad(std::size_t offset, std::size_t n);
+    };
+
+    std::vector<column> columns_;
+    std::unordered_map<std::string, std::size_t> index_;
+
+    // Position of `$timestamp` in `columns_`, if requested
+    std::optional<std::size_t> timestamps_;
+
+    std::size_t offset_{0};
+};
+
+/**
+ * Decides how many rows to request from the bulk reader for the next batch.
+ *
+ * By default this is always `batch_size`. When `max_batch_bytes` is set, the amount of rows
+ * is derived from the average size of a row in the batches seen so far, so that every batch
+ * stays roughly within that budget, regardless of how wide the table is. Because nothing is
+ * known about the rows before the first batch arrives, the first batch is limited to
+ * `probe_rows`.
+ *
+ * Only touches native data, and as such can be used without the GIL.
+ */
+class reader_batch_sizer
+{
+public:
+    static constexpr std::size_t probe_rows = 1024;
+
+    reader_batch_sizer(std::size_t batch_size, std::size_t max_batch_bytes) noexcept
+        : batch_size_{batch_size}
+        , max_batch_bytes_{max_batch_bytes}
+    {}
+
+    /**
+     * The amount of rows to request for the next batch. Returns 0 when everything should be
+     * read in a single batch.
+     */
+    std::size_t next() const noexcept;
+
+    /**
+     * Accounts for the size of a batch that was just fetched.
+     */
+    void observe(qdb_bulk_reader_table_data_t const & data) noexcept;
+
+private:
+    std::size_t batch_size_;
+    std::size_t max_batch_bytes_;
+
+    // Totals of all batches observed so far
+    std::size_t rows_{0};
+    std::size_t bytes_{0};
+};
+
+/**
+ * Position of a reader within its tables, up to which all rows have been emitted: every
+ * row of the `finished` tables, and every row of `table` up to `timestamp`, of which the
+ * first `rows` rows at exactly `timestamp`.
+ *
+ * Multiple rows can share the same timestamp, and a batch may end in the middle of them:
+ * counting them makes sure that resuming neither skips nor repeats any row.
+ */
+struct reader_checkpoint
+{
+    std::string table;
+
+    // Nanoseconds since epoch
+    std::int64_t timestamp;
+
+    std::size_t rows;
+
+    // Tables which are already read entirely
+    std::vector<std::string> finished;
+
+    /**
+     * Parses a checkpoint as returned by `reader::checkpoint()`. Returns an empty optional
+     * for None.
+     */
+    static std::optional<reader_checkpoint> of_object(py::object const & x);
+};
+
+/**
+ * Tracks the position of a reader as batches are emitted, and skips the rows which were
+ * already emitted before the reader was resumed. Only touches native data.
+ */
+class reader_progress
+{
+public:
+    reader_progress() = default;
+
+    reader_progress(std::optional<reader_checkpoint> const & resume_from, std::string table)
+        : checkpoint_{resume_from}
+        , table_{std::move(table)}
+        , skip_{resume_from.has_value() ? resume_from->rows : 0}
+    {}
+
+    /**
+     * Returns the amount of leading rows of `data` that were already emitted before the
+     * reader was resumed.
+     */
+    std::size_t skip(qdb_bulk_reader_table_data_t const & data) noexcept;
+
+    /**
+     * Accounts for all rows of `data` having been emitted.
+     */
+    void observe(qdb_bulk_reader_table_data_t const & data);
+
+    inline std::optional<reader_checkpoint> const & checkpoint() const noexcept
+    {
+        return checkpoint_;
+    }
+
+private:
+    /**
+     * Returns the `$table` column of a batch, or nullptr if it has none.
+     */
+    static qdb_string_t const * tables_of(qdb_bulk_reader_table_data_t const & data) noexcept;
+
+    std::string_view table_of(qdb_string_t const * tables, std::size_t i) const noexcept;
+
+private:
+    std::optional<reader_checkpoint> checkpoint_;
+
+    // Table to attribute rows to when a batch has no `$table` column
+    std::string table_;
+
+    // Rows at the checkpoint's timestamp still to skip
+    std::size_t skip_{0};
+};
+
+// How the `$table` column is returned to the user.
+enum table_column_t
+{
+    // As strings, with the table name of every row
+    table_column_default,
+
+    // As int32 codes, which are positions in the table names of the reader
+    table_column_codes,
+
+    // Not at all
+    table_column_omit
+};
+
+static inline table_column_t table_column_of(py::object const & table_column)
+{
+    if (table_column.is_none())
+    {
+        return table_column_default;
+    }
+
+    std::string table_column_ = py::cast<std::string>(table_column);
+
+    if (table_column_ == "codes")
+    {
+        return table_column_codes;
+    }
+    else if (table_column_ == "omit")
+    {
+        return table_column_omit;
+    }
+
+    std::string error_msg = "Invalid argument provided for `table_column`: expected "
+                            "None, 'codes' or 'omit', got: ";
+    error_msg += table_column_;
+
+    throw qdb::invalid_argument_exception{error_msg};
+}
+
+/**
+ * Rewrites the `$table` column of batches before they are converted, so that the name of
+ * the table is never materialized for every row.
+ *
+ * With `table_column_codes`, the column is replaced by an int64 column of codes, which
+ * `reader_data::convert()` returns as int32. Consecutive rows almost always belong to the
+ * same table, so a table name is only looked up when it changes. With `table_column_omit`,
+ * the column is left out of the batch.
+ *
+ * Only touches native data.
+ */
+class reader_table_column
+{
+public:
+    reader_table_column() = default;
+
+    reader_table_column(table_column_t mode, std::vector<std::string> const & table_names);
+
+    /**
+     * Returns `data` itself when there is nothing to rewrite, otherwise a rewritten copy of
+     * the batch which is valid until the next call.
+     */
+    qdb_bulk_reader_table_data_t const & apply(qdb_bulk_reader_table_data_t const & data);
+
+private:
+    table_column_t mode_{table_column_default};
+    std::map<std::string, std::int64_t, std::less<>> codes_of_;
+
+    // Buffers of the last result of `apply()`
+    qdb_bulk_reader_table_data_t data_{};
+    std::vector<qdb_exp_batch_push_column_t> columns_;
+    std::vector<std::int64_t> codes_;
+};
+
+/**
+ * Vectorized predicates, which are evaluated against the native batches so that rows which
+ * do not match are never converted to Python. All predicates must match for a row to be
+ * kept, and null values never match.
+ *
+ * Predicates are provided as `(column, op, value)` tuples, where `op` is one of `==`, `!=`,
+ * `<`, `<=`, `>`, `>=`, `in` and `not in`; `in` and `not in` take a sequence of values.
+ * The `$timestamp` and `$table` columns can be used as well.
+ */
+class reader_filter
+{
+public:
+    enum class op_t
+    {
+        eq,
+        ne,
+        lt,
+        le,
+        gt,
+        ge,
+        in,
+        not_in
+    };
+
+    reader_filter() = default;
+
+    static reader_filter of_object(py::object const & xs);
+
+    inline bool empty() const noexcept
+    {
+        return predicates_.empty();
+    }
+
+    /**
+     * Converts the values of the predicates to the types of the columns of `data`. Only
+     * does any work when the types change, which in practice happens for the first batch.
+     *
+     * Requires the GIL.
+     */
+    void bind(qdb_bulk_reader_table_data_t const & data);
+
+    /**
+     * Returns the rows of `data` that match all predicates. When all rows match, `data` itself
+     * is returned, otherwise a copy of the matching rows which is valid until the next call,
+     * and which refers to the strings and blobs of `data`.
+     *
+     * Only touches native data.
+     */
+    qdb_bulk_reader_table_data_t const & apply(qdb_bulk_reader_table_data_t const & data);
+
+private:
+    struct predicate
+    {
+        std::string column;
+        op_t op;
+
+        // As provided by the user, converted by `bind()` to the type of the column.
+        py::object value;
+
+        qdb_ts_column_type_t type{qdb_ts_column_uninitialized};
+        std::vector<std::int64_t> ints;
+        std::vector<double> doubles;
+        std::vector<std::string> strings;
+    };
+
+    std::vector<predicate> predicates_;
+
+    // Buffers of the last result of `apply()`
+    std::vector<std::size_t> rows_;
+    qdb_bulk_reader_table_data_t data_{};
+    std::vector<qdb_timespec_t> timestamps_;
+    std::vector<qdb_exp_batch_push_column_t> columns_;
+    std::vector<std::vector<std::byte>> values_;
+};
+
+/**
+ * Fetches batches from the bulk reader in a native background thread, so that the next
+ * batches are already transferred over the wire while Python is still processing the
+ * current one. The background thread never touches any Python object, and as such never
+ * needs the GIL.
+ *
+ * At most `depth` batches are buffered at any point in time.
+ */
+class reader_prefetcher
+{
+public:
+    reader_prefetcher(
+        handle_ptr handle, qdb_reader_handle_t reader, reader_batch_sizer sizer, std::size_t depth);
+
+    reader_prefetcher(const reader_prefetcher &) = delete;
+    reader_prefetcher(reader_prefetcher &&)      = delete;
+
+    ~reader_prefetcher()
+    {
+        stop();
+    }
+
+    /**
+     * Blocks until the next batch is available, and hands over ownership of it to the
+     * caller. Releases the GIL while waiting. Returns `qdb_e_iterator_end` when there is
+     * no more data. On error, `msg` is set to the message of the error, which was captured
+     * on the background thread.
+     */
+    qdb_error_t next(qdb_bulk_reader_table_data_t ** out, std::string & msg);
+
+    /**
+     * Signals the background thread to stop, waits for it to finish and releases any
+     * batches that were fetched but never consumed.
      */
-    static py::dict convert(qdb_bulk_reader_table_data_t const & data);
+    void stop();
+
+private:
+    void run();
+
+private:
+    struct batch
+    {
+        qdb_error_t err;
+        qdb_bulk_reader_table_data_t * ptr;
+
+        // Message of `err`, looked up on the background thread
+        std::string msg;
+    };
+
+    qdb::handle_ptr handle_;
+    qdb_reader_handle_t reader_;
+
+    // Only ever used from the background thread
+    reader_batch_sizer sizer_;
+    std::size_t depth_;
+
+    std::mutex lock_;
+    std::condition_variable cond_;
+    std::deque<batch> queue_;
+
+    // Set by the consumer to ask the background thread to stop.
+    bool stop_;
+
+    // Set by the background thread after it pushed its last batch (or error).
+    bool done_;
+
+    std::thread thread_;
 };
 
 class reader_iterator
@@ -69,20 +551,44 @@ public:
     reader_iterator() noexcept
         : handle_{nullptr}
         , reader_{nullptr}
-        , batch_size_{0}
+        , prefetcher_{nullptr}
+        , sizer_{nullptr}
+        , progress_{nullptr}
+        , filter_{nullptr}
+        , table_column_{nullptr}
         , table_count_{0}
+        , zero_copy_{false}
+        , strings_{convert::strings_mode_default}
+        , masked_{true}
         , ptr_{nullptr}
         , n_{0}
     {}
 
     // Actual initialization
-    reader_iterator(
-        handle_ptr handle, qdb_reader_handle_t reader, std::size_t batch_size, std::size_t table_count)
+    reader_iterator(handle_ptr handle,
+        qdb_reader_handle_t reader,
+        reader_prefetcher * prefetcher,
+        reader_batch_sizer * sizer,
+        reader_progress * progress,
+        reader_filter * filter,
+        reader_table_column * table_column,
+        std::size_t table_count,
+        bool zero_copy,
+        convert::strings_mode_t strings,
+        bool masked)
         : handle_{handle}
         , reader_{reader}
-        , batch_size_{batch_size}
-
+        , prefetcher_{prefetcher}
+        , sizer_{sizer}
+        , progress_{progress}
+        , filter_{filter}
+        , table_column_{table_column}
+        , table_count_{table_count}
+        , zero_copy_{zero_copy}
+        , strings_{strings}
+        , masked_{masked}
         , ptr_{nullptr}
+        , n_{0}
     {
         // Always immediately try to fetch the first batch.
         this->operator++();
@@ -114,9 +620,9 @@ public:
         // the data itself. This saves a bazillion comparisons, and for the purpose
         // of iterators, we really only care whether the current iterator is at the
         // end.
-        return (handle_ == rhs.handle_            //
-                && reader_ == rhs.reader_         //
-                && batch_size_ == rhs.batch_size_ //
+        return (handle_ == rhs.handle_    //
+                && reader_ == rhs.reader_ //
+                && sizer_ == rhs.sizer_   //
                 && ptr_ == rhs.ptr_);
     }
 
@@ -126,7 +632,31 @@ public:
     {
         assert(ptr_ != nullptr);
 
-        return reader_data::convert(*ptr_);
+        if (zero_copy_ == false || filtered_ == true)
+        {
+            // Batches that are filtered are copies which do not outlive the iterator, and
+            // cannot be viewed.
+            return reader_data::convert(batch_, py::handle{}, strings_, masked_);
+        }
+
+        if (!owner_)
+        {
+            // From here on, the batch is released once the last array referring to it is
+            // collected, rather than when we move to the next batch.
+            owner_ = reader_data::make_owner(handle_, ptr_);
+        }
+
+        return reader_data::convert(batch_, owner_, strings_, masked_);
+    }
+
+    /**
+     * Direct access to the current native batch, which is only valid until the iterator
+     * is advanced.
+     */
+    qdb_bulk_reader_table_data_t const & batch() const noexcept
+    {
+        assert(ptr_ != nullptr);
+        return batch_;
     }
 
 private:
@@ -134,24 +664,120 @@ private:
     qdb_reader_handle_t reader_;
 
     /**
-     * The amount of rows to fetch in one operation. This can span multiple tables.
+     * When set, batches are taken from the prefetcher instead of being fetched directly.
+     * Owned by the reader.
      */
-    std::size_t batch_size_;
+    reader_prefetcher * prefetcher_;
+
+    /**
+     * Decides the amount of rows to fetch in one operation, which can span multiple tables.
+     * Owned by the reader.
+     */
+    reader_batch_sizer * sizer_;
+
+    /**
+     * Keeps track of the rows emitted, owned by the reader.
+     */
+    reader_progress * progress_;
+
+    /**
+     * Leaves out rows before they are converted, owned by the reader. Empty if no
+     * filter is set.
+     */
+    reader_filter * filter_;
+
+    /**
+     * Rewrites the `$table` column, owned by the reader.
+     */
+    reader_table_column * table_column_;
 
     /**
      * `table_count_` enables us to manage how much far we can iterate `ptr_`.
      */
     std::size_t table_count_;
+
+    /**
+     * When set, numeric columns are returned as views over `ptr_` instead of copies.
+     */
+    bool zero_copy_;
+
+    /**
+     * How string columns are returned.
+     */
+    convert::strings_mode_t strings_;
+
+    /**
+     * When false, columns are returned as plain arrays rather than masked arrays.
+     */
+    bool masked_;
+
     qdb_bulk_reader_table_data_t * ptr_;
+
+    /**
+     * The part of `*ptr_` that is read: all of it, except when resuming, in which case
+     * the rows that were already emitted before are left out. `columns_` holds the
+     * columns when they don't start at the first row of `*ptr_`.
+     */
+    qdb_bulk_reader_table_data_t read_{};
+    std::vector<qdb_exp_batch_push_column_t> columns_;
+
+    /**
+     * The rows of `read_` that are emitted, which only differs from `read_` when a filter
+     * is set.
+     */
+    qdb_bulk_reader_table_data_t batch_{};
+    bool filtered_{false};
+
+    /**
+     * Capsule that owns `ptr_`, only set in zero-copy mode once the batch has been converted.
+     */
+    py::object owner_;
+
     std::size_t n_;
 };
 
+/**
+ * Iterates over the same batches as `reader_iterator`, but yields them as
+ * pyarrow.RecordBatch objects.
+ */
+class reader_arrow_iterator
+{
+public:
+    reader_arrow_iterator() noexcept = default;
+
+    explicit reader_arrow_iterator(reader_iterator xs)
+        : xs_{std::move(xs)}
+    {}
+
+    bool operator!=(reader_arrow_iterator const & rhs) const noexcept
+    {
+        return xs_ != rhs.xs_;
+    }
+
+    bool operator==(reader_arrow_iterator const & rhs) const noexcept
+    {
+        return xs_ == rhs.xs_;
+    }
+
+    reader_arrow_iterator & operator++()
+    {
+        ++xs_;
+        return *this;
+    }
+
+    py::object operator*();
+
+private:
+    reader_iterator xs_;
+};
+
 }; // namespace detail
 
 class reader
 {
 public:
-    using iterator = detail::reader_iterator;
+    using iterator       = detail::reader_iterator;
+    using arrow_iterator = detail::reader_arrow_iterator;
 
 public:
     /**
@@ -159,12 +785,20 @@ public:
      * of any metadata inside the tables (such as its name) will always exceed that
      * of the reader, which simplifies things a lot.
      */
-    reader(                                            //
-        qdb::handle_ptr handle,                        //
-        std::vector<std::string> const & table_names,  //
-        std::vector<std::string> const & column_names, //
-        std::size_t batch_size,                        //
-        std::vector<py::tuple> const & ranges)         //
+    reader(                                                                                  //
+        qdb::handle_ptr handle,                                                              //
+        std::vector<std::string> const & table_names,                                        //
+        std::vector<std::string> const & column_names,                                       //
+        std::size_t batch_size,                                                              //
+        std::vector<py::tuple> const & ranges,                                               //
+        std::size_t prefetch,                                                                //
+        bool zero_copy,                                                                      //
+        convert::strings_mode_t strings,                                                     //
+        std::size_t max_batch_bytes                          = 0,                            //
+        bool masked                                          = true,                         //
+        std::optional<detail::reader_checkpoint> resume_from = std::nullopt,                 //
+        detail::reader_filter filter                         = {},                           //
+        detail::table_column_t table_column                  = detail::table_column_default) //
         : logger_("quasardb.reader")
         , handle_{handle}
         , reader_{nullptr}
@@ -172,6 +806,17 @@ public:
         , column_names_{column_names}
         , batch_size_{batch_size}
         , ranges_{ranges}
+        , prefetch_{prefetch}
+        , zero_copy_{zero_copy}
+        , strings_{strings}
+        , max_batch_bytes_{max_batch_bytes}
+        , sizer_{batch_size, max_batch_bytes}
+        , masked_{masked}
+        , resume_from_{std::move(resume_from)}
+        , exhausted_{false}
+        , filter_{std::move(filter)}
+        , table_column_{table_column}
+        , table_column_rewriter_{table_column, table_names}
     {}
 
     // prevent copy because of the table object, use a unique_ptr of the batch in cluster
@@ -196,6 +841,50 @@ public:
         return batch_size_;
     }
 
+    /**
+     * Convenience function for accessing the amount of batches fetched ahead of time in the
+     * background. Returns 0 when batches are fetched on demand.
+     */
+    constexpr inline std::size_t get_prefetch() const noexcept
+    {
+        return prefetch_;
+    }
+
+    /**
+     * Convenience function for accessing the approximate maximum size of a batch in bytes.
+     * Returns 0 when batches are sized by `batch_size` only.
+     */
+    constexpr inline std::size_t get_max_batch_bytes() const noexcept
+    {
+        return max_batch_bytes_;
+    }
+
+    /**
+     * Returns true when int64 and double columns are returned as views over the native batch,
+     * rather than copies.
+     */
+    constexpr inline bool get_zero_copy() const noexcept
+    {
+        return zero_copy_;
+    }
+
+    /**
+     * Returns true when columns are returned as masked arrays, and false when they are
+     * returned as plain arrays.
+     */
+    constexpr inline bool get_masked() const noexcept
+    {
+        return masked_;
+    }
+
+    /**
+     * The tables this reader reads, in order, which `$table` codes refer to.
+     */
+    inline std::vector<std::string> const & get_table_names() const noexcept
+    {
+        return table_names_;
+    }
+
     /**
      * Opens the actual reader; this will initiate a call to quasardb and initialize the local
      * reader handle. If table strings are provided instead of qdb::table objects, will automatically
@@ -219,15 +908,21 @@ public:
      */
     void close();
 
-    iterator begin() const
+    iterator begin()
     {
-        if (reader_ == nullptr) [[unlikely]]
+        if (exhausted_)
+        {
+            // Resumed after everything was read already
+            return end();
+        }
+        else if (reader_ == nullptr) [[unlikely]]
         {
             throw qdb::uninitialized_exception{
                 "Reader not yet opened: please encapsulate calls to the reader in a `with` block, or "
                 "explicitly `open` and `close` the resource"};
         }
-        return iterator{handle_, reader_, batch_size_, table_names_.size()};
+        return iterator{handle_, reader_, prefetcher_.get(), &sizer_, &progress_, &filter_,
+            &table_column_rewriter_, table_names_.size(), zero_copy_, strings_, masked_};
     }
 
     iterator end() const noexcept
@@ -235,6 +930,37 @@ public:
         return iterator{};
     }
 
+    /**
+     * Returns the position up to which rows have been emitted, as a dict that can be
+     * provided as `resume_from` to a new reader over the same tables to read only the
+     * remaining rows. Returns None if no rows have been emitted yet.
+     *
+     * A batch counts as emitted once the iterator moves past it.
+     */
+    py::object checkpoint() const;
+
+    /**
+     * Drains the reader, and returns everything as a single dict of arrays rather than
+     * batch by batch.
+     */
+    py::dict read_all();
+
+    /**
+     * Drains the reader into the caller-provided arrays of `out`, see `detail::reader_output`.
+     * Returns the amount of rows written.
+     */
+    std::size_t read_into(py::dict const & out);
+
+    arrow_iterator arrow_begin()
+    {
+        return arrow_iterator{begin()};
+    }
+
+    arrow_iterator arrow_end() const noexcept
+    {
+        return arrow_iterator{};
+    }
+
 private:
     qdb::logger logger_;
     qdb::handle_ptr handle_;
@@ -244,16 +970,54 @@ private:
     std::vector<std::string> column_names_;
     std::size_t batch_size_;
     std::vector<py::tuple> ranges_;
+
+    std::size_t prefetch_;
+    std::unique_ptr<detail::reader_prefetcher> prefetcher_;
+
+    bool zero_copy_;
+    convert::strings_mode_t strings_;
+
+    std::size_t max_batch_bytes_;
+    detail::reader_batch_sizer sizer_;
+
+    bool masked_;
+
+    std::optional<detail::reader_checkpoint> resume_from_;
+    detail::reader_progress progress_;
+
+    // Set when resuming left nothing to read
+    bool exhausted_;
+
+    detail::reader_filter filter_;
+
+    detail::table_column_t table_column_;
+    detail::reader_table_column table_column_rewriter_;
+
+    /**
+     * Fills `tables` with what remains to be read after `resume_from_`.
+     */
+    void enter_resumed(std::vector<qdb_bulk_reader_table_t> & tables, qdb_ts_range_t * ranges);
 };
 
 static inline reader_ptr make_reader_ptr(handle_ptr handle, //
     std::vector<std::string> const & table_names,           //
     std::vector<std::string> const & column_names,          //
     std::size_t batch_size,                                 //
-    std::vector<py::tuple> const & ranges                   //
+    std::vector<py::tuple> const & ranges,                  //
+    std::size_t prefetch,                                   //
+    bool zero_copy,                                         //
+    py::object const & strings,                             //
+    std::size_t max_batch_bytes,                            //
+    bool masked,                                            //
+    py::object const & resume_from,                         //
+    py::object const & filter,                              //
+    py::object const & table_column                         //
 )
 {
-    return std::make_unique<reader>(handle, table_names, column_names, batch_size, ranges);
+    return std::make_unique<reader>(handle, table_names, column_names, batch_size, ranges, prefetch,
+        zero_copy, convert::strings_mode_of(strings), max_batch_bytes, masked,
+        detail::reader_checkpoint::of_object(resume_from), detail::reader_filter::of_object(filter),
+        detail::table_column_of(table_column));
 }
 
 void register_reader(py::module_ & m);
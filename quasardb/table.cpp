@@ -49,7 +49,8 @@ qdb::reader_ptr table::reader(                     //
     std::vector<py::tuple> const & ranges) const
 {
     std::vector<std::string> table_names{get_name()};
-    return std::make_unique<qdb::reader>(_handle, table_names, column_names, batch_size, ranges);
+    return std::make_unique<qdb::reader>(_handle, table_names, column_names, batch_size, ranges,
+        std::size_t{0}, false, convert::strings_mode_default);
 };
 
 }; // namespace qdb
@@ -36,11 +36,136 @@
 #include "metrics.hpp"
 #include "object_tracker.hpp"
 #include "writer_fwd.hpp"
+#include "detail/push_queue.hpp"
+#include "detail/qdb_resource.hpp"
 #include "detail/writer.hpp"
+#include <pybind11/chrono.h>
+#include <pybind11/stl.h>
+#include <chrono>
+#include <condition_variable>
+#include <memory>
+#include <mutex>
+#include <optional>
 #include <vector>
 
 namespace qdb
 {
+
+namespace detail
+{
+
+/**
+ * A batch that is fully staged into native buffers and ready to be pushed. Holds on to everything
+ * the batch points into, e.g. the buffers of the staged tables.
+ */
+struct staged_batch
+{
+    detail::staged_tables idx;
+    std::vector<qdb_ts_range_t> truncate_ranges;
+    detail::deduplicate_options deduplicate_options;
+    qdb_exp_batch_options_t options;
+    std::vector<qdb_exp_batch_push_table_t> tables;
+};
+
+} // namespace detail
+
+/**
+ * Future-like handle to a push that is performed by the writer's background push thread, as
+ * returned by `writer.push_nowait()`.
+ */
+class writer_push_future
+{
+public:
+    writer_push_future() = default;
+
+    writer_push_future(const writer_push_future &) = delete;
+
+    /**
+     * Invoked by the background push thread once the push has completed. Does not require
+     * the GIL.
+     */
+    void set_result(qdb_error_t err, std::string msg)
+    {
+        {
+            std::unique_lock<std::mutex> lock{_lock};
+
+            _err  = err;
+            _msg  = std::move(msg);
+            _done = true;
+        }
+
+        _cond.notify_all();
+    }
+
+    bool done() const
+    {
+        std::unique_lock<std::mutex> lock{_lock};
+        return _done;
+    }
+
+    /**
+     * True if the push has completed, and failed.
+     */
+    bool failed() const
+    {
+        std::unique_lock<std::mutex> lock{_lock};
+        return _done && _is_error();
+    }
+
+    /**
+     * Blocks until the push has completed, and raises the push error, if any.
+     */
+    void result(std::optional<std::chrono::milliseconds> timeout)
+    {
+        bool done{false};
+
+        {
+            // The push may take a while, don't block other Python threads in the meantime.
+            py::gil_scoped_release release{};
+            std::unique_lock<std::mutex> lock{_lock};
+
+            auto is_done = [this] { return _done; };
+
+            if (timeout.has_value())
+            {
+                done = _cond.wait_for(lock, timeout.value(), is_done);
+            }
+            else
+            {
+                _cond.wait(lock, is_done);
+                done = true;
+            }
+        }
+
+        if (done == false) [[unlikely]]
+        {
+            PyErr_SetString(PyExc_TimeoutError, "Timed out while waiting for push to complete");
+            throw py::error_already_set{};
+        }
+
+        if (_is_error()) [[unlikely]]
+        {
+            qdb::qdb_throw_error(_err, _msg);
+        }
+    }
+
+private:
+    inline bool _is_error() const noexcept
+    {
+        return (_err != qdb_e_ok) && (_err != qdb_e_ok_created);
+    }
+
+private:
+    mutable std::mutex _lock;
+    std::condition_variable _cond;
+
+    bool _done{false};
+    qdb_error_t _err{qdb_e_ok};
+    std::string _msg;
+};
+
+using writer_push_future_ptr = std::shared_ptr<writer_push_future>;
+
 class writer
 {
 
@@ -53,9 +178,15 @@ class writer
 
 public:
 public:
-    writer(qdb::handle_ptr h)
+    /**
+     * `staging_threads` is the number of threads converting columns when staging a batch, 0
+     * means one per CPU.
+     */
+    writer(qdb::handle_ptr h, std::size_t max_pending = 2, std::size_t staging_threads = 0)
         : _logger("quasardb.writer")
         , _handle{h}
+        , _staging_pool{staging_threads}
+        , _push_queue{std::make_unique<detail::push_queue>(max_pending)}
     {}
 
     // prevent copy because of the table object, use a unique_ptr of the batch in cluster
@@ -63,7 +194,12 @@ public:
     writer(const writer &) = delete;
 
     ~writer()
-    {}
+    {
+        // Pending background pushes refer to data owned by this writer: wait for them to
+        // complete.
+        py::gil_scoped_release release{};
+        _push_queue->close();
+    }
 
     const std::vector<qdb_exp_batch_push_column_t> & prepare_columns();
 
@@ -77,10 +213,111 @@ public:
         // We always want to have a push mode at this point
         kwargs = detail::batch_push_mode::ensure(kwargs);
 
-        _push_impl<PushStrategy, SleepStrategy>( //
-            detail::staged_tables::index(data),  //
-            kwargs                               //
-        );                                       //
+        _push_impl<PushStrategy, SleepStrategy>(               //
+            detail::staged_tables::index(data, _staging_pool), //
+            kwargs                                             //
+        );                                                     //
+    }
+
+    /**
+     * Stages the data and hands it over to the background push thread, which means conversion
+     * of the next batch can overlap with pushing this one. Blocks while `max_pending` pushes are
+     * already waiting to be pushed.
+     */
+    template <                                            //
+        qdb::concepts::writer_push_strategy PushStrategy, //
+        qdb::concepts::sleep_strategy SleepStrategy>      //
+    writer_push_future_ptr push_nowait(detail::writer_data const & data, py::kwargs kwargs)
+    {
+        auto batch = std::make_shared<detail::staged_batch>();
+
+        {
+            qdb::object_tracker::scoped_capture capture{_object_tracker};
+
+            // We always want to have a push mode at this point
+            kwargs = detail::batch_push_mode::ensure(kwargs);
+
+            batch->idx = detail::staged_tables::index(data, _staging_pool);
+            kwargs     = _prepare_batch(*batch, kwargs);
+        }
+
+        auto future = std::make_shared<writer_push_future>();
+
+        // The connection may be closed while the push is still queued: keep the handle alive
+        // until the push has been performed, closing it is deferred until then.
+        _handle->check_open();
+        _handle->pin();
+
+        // Everything the background thread needs is native: it never touches Python objects.
+        auto job = [owner = _handle, handle = static_cast<qdb_handle_t>(*_handle), batch, future,
+                       push_strategy = PushStrategy::from_kwargs(kwargs),
+                       retry_options = detail::retry_options::from_kwargs(kwargs)]() mutable {
+            _do_push_nowait<PushStrategy, SleepStrategy>(
+                handle, *batch, push_strategy, retry_options, *future);
+
+            owner->unpin();
+        };
+
+        // Successful pushes are of no further interest to flush(), only keep track of the ones
+        // that are still pending and the ones that failed.
+        std::erase_if(_pending,
+            [](pending_push const & x) { return x.future->done() && x.future->failed() == false; });
+
+        bool queued{false};
+        {
+            // Blocks while the queue is full, which is our backpressure mechanism.
+            py::gil_scoped_release release{};
+            queued = _push_queue->put(std::move(job));
+        }
+
+        if (queued == false) [[unlikely]]
+        {
+            // The job is never executed.
+            _handle->unpin();
+
+            throw qdb::invalid_argument_exception{
+                "Writer has been closed: background pushes are no longer possible."};
+        }
+
+        _pending.push_back(pending_push{future, data});
+
+        return future;
+    }
+
+    /**
+     * Waits for all background pushes to complete, and raises the first error encountered by
+     * any of them since the last flush.
+     */
+    void flush()
+    {
+        {
+            py::gil_scoped_release release{};
+            _push_queue->flush();
+        }
+
+        std::vector<pending_push> pending;
+        pending.swap(_pending);
+
+        for (pending_push const & x : pending)
+        {
+            if (x.future->failed()) [[unlikely]]
+            {
+                x.future->result(std::nullopt);
+            }
+        }
+    }
+
+    /**
+     * Flushes all background pushes and stops the background push thread.
+     */
+    void close()
+    {
+        {
+            py::gil_scoped_release release{};
+            _push_queue->close();
+        }
+
+        flush();
     }
 
     template <                                            //
@@ -170,14 +407,32 @@ private:
     void _push_impl(                                 //
         detail::staged_tables && idx,                //
         py::kwargs kwargs)                           //
+    {
+        detail::staged_batch batch{std::move(idx)};
+        kwargs = _prepare_batch(batch, kwargs);
+
+        _do_push<PushStrategy, SleepStrategy>(         //
+            batch.options,                             //
+            batch.tables,                              //
+            PushStrategy::from_kwargs(kwargs),         //
+            detail::retry_options::from_kwargs(kwargs) //
+        );                                             //
+    }
+
+    /**
+     * Prepares the native batch out of the staged tables. Returns the kwargs, amended with
+     * defaults.
+     */
+    py::kwargs _prepare_batch(detail::staged_batch & batch, py::kwargs kwargs)
     {
         _handle->check_open();
 
+        detail::staged_tables & idx                   = batch.idx;
+        std::vector<qdb_ts_range_t> & truncate_ranges = batch.truncate_ranges;
+
         // Ensure some default variables that are set
         kwargs = detail::batch_push_flags::ensure(kwargs);
 
-        std::vector<qdb_ts_range_t> truncate_ranges{};
-
         if (detail::batch_push_mode::from_kwargs(kwargs) == qdb_exp_batch_push_truncate)
             [[unlikely]] // Unlikely because truncate isn't used much
         {
@@ -185,17 +440,18 @@ private:
             truncate_ranges = detail::batch_truncate_ranges::from_kwargs(kwargs);
         }
 
-        qdb_exp_batch_options_t options = detail::batch_options::from_kwargs(kwargs);
+        batch.options                     = detail::batch_options::from_kwargs(kwargs);
+        qdb_exp_batch_options_t & options = batch.options;
 
         if (idx.empty()) [[unlikely]]
         {
             throw qdb::invalid_argument_exception{"No data written to batch writer."};
         }
 
-        auto deduplicate_options = detail::deduplicate_options::from_kwargs(kwargs);
+        batch.deduplicate_options = detail::deduplicate_options::from_kwargs(kwargs);
+        detail::deduplicate_options const & deduplicate_options = batch.deduplicate_options;
 
-        std::vector<qdb_exp_batch_push_table_t> batch;
-        batch.assign(idx.size(), qdb_exp_batch_push_table_t());
+        batch.tables.assign(idx.size(), qdb_exp_batch_push_table_t());
 
         qdb_ts_range_t * truncate_ranges_{nullptr};
         if (truncate_ranges.empty() == false) [[unlikely]]
@@ -209,7 +465,7 @@ private:
         {
             std::string const & table_name      = pos->first;
             detail::staged_table & staged_table = pos->second;
-            auto & batch_table                  = batch.at(cur++);
+            auto & batch_table                  = batch.tables.at(cur++);
 
             staged_table.prepare_batch( //
                 options.mode,           //
@@ -228,12 +484,7 @@ private:
                 detail::batch_push_mode::to_string(options.mode));
         }
 
-        _do_push<PushStrategy, SleepStrategy>(         //
-            options,                                   //
-            batch,                                     //
-            PushStrategy::from_kwargs(kwargs),         //
-            detail::retry_options::from_kwargs(kwargs) //
-        );                                             //
+        return kwargs;
     }
 
     template <                                       //
@@ -252,6 +503,11 @@ private:
             // the push time, not e.g. retry time.
             qdb::metrics::scoped_capture capture{"qdb_batch_push"};
 
+            // At this point all data has been staged into native buffers, and the push
+            // does not touch any Python object. Release the GIL so that other threads
+            // (e.g. other writers) can make progress while we wait for the cluster.
+            py::gil_scoped_release release{};
+
             err = push_strategy( //
                 *_handle,        //
                 &options,        //
@@ -275,7 +531,11 @@ private:
             std::chrono::milliseconds delay = retry_options.delay;
             _logger.info("Sleeping for %d milliseconds", delay.count());
 
-            SleepStrategy::sleep(delay);
+            {
+                // Don't block other Python threads while we're backing off.
+                py::gil_scoped_release release{};
+                SleepStrategy::sleep(delay);
+            }
 
             // Now try again -- easier way to go about this is to enter recursion. Note how
             // we permutate the retry_options, which automatically adjusts the amount of retries
@@ -288,12 +548,81 @@ private:
         qdb::qdb_throw_if_error(*_handle, err);
     }
 
+    /**
+     * Performs a push on the background push thread: no Python objects, no GIL, which also means
+     * no logging. The outcome is reported through `future`.
+     */
+    template <                                       //
+        concepts::writer_push_strategy PushStrategy, //
+        concepts::sleep_strategy SleepStrategy>      //
+    static void _do_push_nowait(qdb_handle_t handle,
+        detail::staged_batch const & batch,
+        PushStrategy push_strategy,
+        detail::retry_options retry_options,
+        writer_push_future & future) noexcept
+    {
+        qdb_error_t err{qdb_e_ok};
+
+        while (true)
+        {
+            {
+                qdb::metrics::scoped_capture capture{"qdb_batch_push"};
+
+                err = push_strategy(      //
+                    handle,               //
+                    &batch.options,       //
+                    batch.tables.data(),  //
+                    nullptr,              //
+                    batch.tables.size()); //
+            }
+
+            if (retry_options.should_retry(err) == false) [[likely]]
+            {
+                break;
+            }
+
+            SleepStrategy::sleep(retry_options.delay);
+            retry_options = retry_options.next();
+        }
+
+        std::string msg{};
+
+        if ((err != qdb_e_ok) && (err != qdb_e_ok_created)) [[unlikely]]
+        {
+            // The error context is only available from the thread that made the call, so grab
+            // the message now: the error is raised later on from a Python thread.
+            detail::qdb_resource<qdb_string_t> msg_{handle, nullptr};
+            qdb_error_t err_;
+            qdb_get_last_error(handle, &err_, &msg_);
+
+            msg = (err_ == err && msg_ != nullptr) ? std::string{msg_.get()->data}
+                                                   : std::string{qdb_error(err)};
+        }
+
+        future.set_result(err, std::move(msg));
+    }
+
 private:
     qdb::logger _logger;
     qdb::handle_ptr _handle;
 
     qdb::object_tracker::scoped_repository _object_tracker;
 
+    // Converts the columns of a batch in parallel, see detail::staging_tasks
+    detail::thread_pool _staging_pool;
+
+    // Background pushes, see push_nowait()
+    struct pending_push
+    {
+        writer_push_future_ptr future;
+
+        // Blobs are staged as pointers into the Python objects, which must outlive the push.
+        detail::writer_data data;
+    };
+
+    std::unique_ptr<detail::push_queue> _push_queue;
+    std::vector<pending_push> _pending;
+
 public:
     // the 'legacy' API needs some state attached to the pinned writer; monkey patching
     // the pinned writer purely in python for this is possible, but annoying to do right;
@@ -325,6 +654,17 @@ static void register_writer(py::module_ & m)
         .value("Truncate", qdb_exp_batch_push_truncate)
         .value("Async", qdb_exp_batch_push_async);
 
+    // Handle to a background push
+    py::class_<qdb::writer_push_future, qdb::writer_push_future_ptr>{m, "WriterPushFuture"}
+        .def(py::init([](py::args, py::kwargs) {
+            throw qdb::direct_instantiation_exception{"writer.push_nowait(...)"};
+            return nullptr;
+        }))
+        .def("done", &qdb::writer_push_future::done,
+            "Returns true if the push has completed, successfully or not")
+        .def("result", &qdb::writer_push_future::result, py::arg("timeout") = py::none(),
+            "Waits for the push to complete, and raises its error if it failed");
+
     // And the actual pinned writer
     auto writer_c = py::class_<qdb::writer>{m, "Writer"};
 
@@ -339,6 +679,13 @@ static void register_writer(py::module_ & m)
     // push functions
     writer_c //
         .def("push", &qdb::writer::push<PS, SS>, "Regular batch push")
+        .def("push_nowait", &qdb::writer::push_nowait<PS, SS>,
+            "Hands the batch over to a background push thread, and returns a future-like handle to "
+            "the push. Blocks while the background push queue is full.")
+        .def("flush", &qdb::writer::flush,
+            "Waits for all background pushes to complete, raises the first error encountered")
+        .def("close", &qdb::writer::close,
+            "Flushes all background pushes and stops the background push thread")
         .def("push_async", &qdb::writer::push_async<PS, SS>,
             "Asynchronous batch push that buffers data inside the QuasarDB daemon")
         .def("push_fast", &qdb::writer::push_fast<PS, SS>,
@@ -13,6 +13,7 @@ from functools import partial
 
 import quasardb
 import quasardb.pandas as qdbpd
+import quasardb.pool as pool
 
 pp = pprint.PrettyPrinter()
 
@@ -69,6 +70,13 @@ def qdbd_connection(qdbd_settings):
     conn.close()
 
 
+@pytest.fixture(scope="module")
+def qdbd_pool(qdbd_settings):
+    # One connection per thread, for the parallel readers and queries.
+    with pool.SingletonPool(uri=qdbd_settings.get("uri").get("insecure")) as p:
+        yield p
+
+
 @pytest.fixture(scope="module")
 def qdbd_secure_connection(qdbd_settings):
     conn = quasardb.Cluster(
@@ -942,7 +950,11 @@ def qdbpd_write_fn(request):
     yield request.param
 
 
-@pytest.fixture(params=[qdbpd.write_dataframes])
+def _write_dataframes_parallel(*args, **kwargs):
+    return qdbpd.write_dataframes(*args, parallel=4, **kwargs)
+
+
+@pytest.fixture(params=[qdbpd.write_dataframes, _write_dataframes_parallel])
 def qdbpd_writes_fn(request):
     yield request.param
 
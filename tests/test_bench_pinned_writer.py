@@ -6,9 +6,11 @@ import test_table as tslib
 from time import sleep
 import time
 import random
+import threading
 
 import pytest
 import quasardb
+import quasardb.numpy as qdbnp
 import numpy as np
 
 table_count, column_count, row_factor = 10000, 6, 1000
@@ -191,3 +193,65 @@ def test_pinned_writer_column(qdbd_connection):
     print(f"  - batch insert values: {bulk_insert_time}s")
     print(f"  - total insert time:   {total_insertion_time}s")
     print(f"  - rows inserted: {res[0]}")
+
+
+@pytest.mark.skip(reason="Skip unless you're benching the pinned writer")
+@pytest.mark.parametrize("thread_count", [1, 2, 4, 8])
+def test_pinned_writer_threads(qdbd_connection, entry_name, thread_count):
+    # N threads, each pushing to its own table with its own writer. As the native
+    # push runs without the GIL, throughput should scale close to linearly with N.
+    push_count, rows_per_push = 10, 100000
+
+    tables = []
+    for i in range(thread_count):
+        t = qdbd_connection.table("{}_{}".format(entry_name, i))
+        t.create(
+            [
+                quasardb.ColumnInfo(quasardb.ColumnType.Int64, "col_{}".format(col_idx))
+                for col_idx in range(column_count)
+            ]
+        )
+        tables.append(t)
+
+    start = np.datetime64("2017-01-01", "ns")
+    batches = []
+    for push_idx in range(push_count):
+        idx = start + np.arange(
+            push_idx * rows_per_push, (push_idx + 1) * rows_per_push
+        ).astype("timedelta64[ms]")
+        data = {
+            "col_{}".format(col_idx): np.random.randint(-100, 100, rows_per_push)
+            for col_idx in range(column_count)
+        }
+        batches.append((idx, data))
+
+    def _push(table):
+        writer = qdbd_connection.writer()
+        for idx, data in batches:
+            qdbnp.write_arrays(
+                data,
+                qdbd_connection,
+                table,
+                index=idx,
+                writer=writer,
+                push_mode=quasardb.WriterPushMode.Fast,
+            )
+
+    threads = [threading.Thread(target=_push, args=(t,)) for t in tables]
+
+    total_insertion_start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total_insertion_time = time.time() - total_insertion_start
+
+    rows_inserted = thread_count * push_count * rows_per_push
+
+    print(f"{__name__}:")
+    print(f"  - {thread_count} thread(s)")
+    print(f"  - {column_count} column(s) per table")
+    print(f"  - {push_count} push(es) of {rows_per_push} row(s) per thread")
+    print(f"Results:")
+    print(f"  - total insert time: {total_insertion_time}s")
+    print(f"  - rows per second:   {rows_inserted / total_insertion_time}")
@@ -1,4 +1,7 @@
 # pylint: disable=missing-module-docstring,missing-function-docstring,not-an-iterable,invalid-name
+import asyncio
+import threading
+
 import pytest
 import quasardb
 import numpy as np
@@ -206,3 +209,95 @@ def test_returns_rows_new_value_iterator_multiple(qdbd_connection, table, interv
     inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 1)
 
     assert True is __wait_for(cont, lambda x: len(x) == 1)
+
+
+def test_returns_rows_full_async_iterator(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 1)
+    q = 'select * from "' + table.get_name() + '"'
+    cont = qdbd_connection.query_continuous_full(
+        q, datetime.timedelta(milliseconds=100)
+    )
+
+    # Early ticks may not see the inserted row yet, skip them rather than relying on
+    # the first one.
+    async def _first():
+        async for res in cont:
+            if len(res) > 0:
+                return res
+
+    res = asyncio.run(asyncio.wait_for(_first(), timeout=10))
+    assert len(res) == 1
+    _test_against_table(res, table, inserted_double_data[1])
+
+
+def test_results_does_not_hold_gil(qdbd_connection, table):
+    q = 'select * from "' + table.get_name() + '"'
+
+    # A pace long enough for the consumer to be blocked waiting for results for the
+    # whole test, whatever the ticks in between.
+    cont = qdbd_connection.query_continuous_new_values(q, datetime.timedelta(hours=1))
+
+    waiting = threading.Event()
+    stopped = threading.Event()
+
+    def _wait():
+        waiting.set()
+        for _ in cont:
+            pass
+
+        stopped.set()
+
+    t = threading.Thread(target=_wait, daemon=True)
+    t.start()
+
+    assert waiting.wait(timeout=10)
+    time.sleep(0.1)
+
+    # Running Python code requires the GIL: if the consumer held it while waiting, we
+    # would never get past this point.
+    assert sum(range(100000)) == 4999950000
+    assert t.is_alive()
+
+    cont.stop()
+    t.join(timeout=10)
+
+    assert stopped.is_set()
+
+
+def test_stop_ends_async_iteration(qdbd_connection, table):
+    q = 'select * from "' + table.get_name() + '"'
+    cont = qdbd_connection.query_continuous_new_values(
+        q, datetime.timedelta(milliseconds=100)
+    )
+    cont.stop()
+
+    async def _collect():
+        return [res async for res in cont]
+
+    res = asyncio.run(asyncio.wait_for(_collect(), timeout=10))
+    assert res == []
+
+
+def test_stop_ends_iteration_for_good(qdbd_connection, table):
+    q = 'select * from "' + table.get_name() + '"'
+    cont = qdbd_connection.query_continuous_new_values(
+        q, datetime.timedelta(milliseconds=100)
+    )
+    cont.stop()
+
+    assert list(cont) == []
+
+    # Once stopped, no more results will ever come: none of these may wait for them.
+    with pytest.raises(StopIteration):
+        cont.results()
+
+    with pytest.raises(StopIteration):
+        cont.probe_results()
+
+    assert list(cont) == []
+
+    async def _collect():
+        return [res async for res in cont]
+
+    assert asyncio.run(asyncio.wait_for(_collect(), timeout=10)) == []
@@ -21,6 +21,18 @@ def test_scoped_measure():
         assert len(scoped) == 0
 
 
+def test_counters_are_kept_apart_from_timings():
+    with metrics.Measure() as measure:
+        metrics.increment("test_counter")
+        metrics.increment("test_counter", 2)
+
+        assert measure.get_counters()["test_counter"] == 3
+        assert "test_counter" not in measure.get()
+
+    assert "test_counter" not in metrics.totals()
+    assert metrics.counters()["test_counter"] >= 3
+
+
 def test_batch_push_metrics(qdbpd_write_fn, df_with_table, qdbd_connection):
     (_, _, df, table) = df_with_table
 
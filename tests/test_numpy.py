@@ -559,6 +559,243 @@ def test_read_arrays_rejects_string_column_names(qdbd_connection, table):
         qdbnp.read_arrays(qdbd_connection, [table], column_names="the_double")
 
 
+def _write_doubles_over_days(conn, table, days):
+    # One row every hour, spanning multiple (1 day) shards.
+    index = np.array(
+        [
+            np.datetime64("2017-01-01T00:00:00", "ns") + np.timedelta64(i, "h")
+            for i in range(days * 24)
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    doubles = np.random.uniform(-100.0, 100.0, len(index))
+
+    qdbnp.write_arrays(
+        {tslib._double_col_name(table): doubles},
+        conn,
+        table,
+        index=index,
+        infer_types=False,
+        dtype={tslib._double_col_name(table): doubles.dtype},
+    )
+
+    return index, doubles
+
+
+@pytest.mark.parametrize("parallel", [2, 8])
+def test_read_arrays_parallel_matches_sequential_read(
+    qdbd_connection, qdbd_pool, table, parallel
+):
+    index, doubles = _write_doubles_over_days(qdbd_connection, table, 10)
+
+    # Overlapping and unordered ranges, which do not align with the shards
+    ranges = [
+        (index[50], index[200]),
+        (index[10], index[60] + np.timedelta64(30, "m")),
+    ]
+
+    for ranges_ in [None, ranges]:
+        expected_idx, expected_xs = qdbnp.read_arrays(
+            qdbd_connection,
+            [table],
+            column_names=[tslib._double_col_name(table)],
+            ranges=ranges_,
+        )
+        idx, xs = qdbnp.read_arrays(
+            qdbd_connection,
+            [table],
+            column_names=[tslib._double_col_name(table)],
+            ranges=ranges_,
+            parallel=parallel,
+            pool=qdbd_pool,
+        )
+
+        np.testing.assert_array_equal(idx, expected_idx)
+        assert xs.keys() == expected_xs.keys()
+        for cname in expected_xs:
+            assert_ma_equal(xs[cname], expected_xs[cname])
+
+    idx, xs = qdbnp.read_arrays(
+        qdbd_connection,
+        [table],
+        column_names=[tslib._double_col_name(table)],
+        parallel=parallel,
+        pool=qdbd_pool,
+    )
+    np.testing.assert_array_equal(idx, index)
+    np.testing.assert_array_equal(xs[tslib._double_col_name(table)], doubles)
+
+
+def test_read_arrays_parallel_splits_on_shard_boundaries():
+    start = np.datetime64("2017-01-01T12:00:00", "ns")
+    end = np.datetime64("2017-01-04T06:00:00", "ns")
+    day = np.timedelta64(1, "D").astype("timedelta64[ns]")
+
+    slices = qdbnp._split_ranges([(start, end)], day, 16)
+
+    assert slices == [
+        (start, np.datetime64("2017-01-02", "ns")),
+        (np.datetime64("2017-01-02", "ns"), np.datetime64("2017-01-03", "ns")),
+        (np.datetime64("2017-01-03", "ns"), np.datetime64("2017-01-04", "ns")),
+        (np.datetime64("2017-01-04", "ns"), end),
+    ]
+
+    # Adjacent shards are combined when there are too many of them
+    slices = qdbnp._split_ranges([(start, end)], day, 2)
+
+    assert slices == [
+        (start, np.datetime64("2017-01-03", "ns")),
+        (np.datetime64("2017-01-03", "ns"), end),
+    ]
+
+
+def test_list_column_from_native_arrays():
+    # Shape of an array of strings column as returned by `query_numpy()`: one row with
+    # two values, a null row and one row with a single value.
+    offsets = np.array([0, 2, 2, 3], dtype=np.int64)
+    value_offsets = np.array([0, 1, 3, 6], dtype=np.int64)
+    data = np.frombuffer(b"abcdef", dtype=np.uint8)
+    mask = np.array([False, True, False])
+
+    xs = qdbnp._ensure_column((offsets, (value_offsets, data, None), mask))
+
+    assert isinstance(xs, qdbnp.ListColumn)
+    assert isinstance(xs.values, qdbnp.ListColumn)
+    assert xs.size == 3
+    assert xs.values.size == 3
+    assert xs.values.mask is None
+
+    (start, end) = (xs.offsets[0], xs.offsets[1])
+    values = [
+        xs.values.values[xs.values.offsets[i] : xs.values.offsets[i + 1]].tobytes()
+        for i in range(start, end)
+    ]
+    assert values == [b"a", b"bc"]
+
+    # Categorical columns are still returned as such.
+    codes = ma.masked_array(np.array([0, 0], dtype=np.int32))
+    assert isinstance(
+        qdbnp._ensure_column((codes, np.array(["a"], dtype="O"))), qdbnp.Categorical
+    )
+
+
+def test_concat_list_columns():
+    # Two slices of an array of strings column, as merged by `query_parallel()`.
+    xs = qdbnp._ensure_column(
+        (
+            np.array([0, 2, 2], dtype=np.int64),
+            (
+                np.array([0, 1, 3], dtype=np.int64),
+                np.frombuffer(b"abc", dtype=np.uint8),
+                None,
+            ),
+            np.array([False, True]),
+        )
+    )
+    ys = qdbnp._ensure_column(
+        (
+            np.array([0, 1], dtype=np.int64),
+            (
+                np.array([0, 3], dtype=np.int64),
+                np.frombuffer(b"def", dtype=np.uint8),
+                None,
+            ),
+            np.array([False]),
+        )
+    )
+
+    res = qdbnp._concat_masked([xs, ys])
+
+    assert isinstance(res, qdbnp.ListColumn)
+    assert isinstance(res.values, qdbnp.ListColumn)
+    assert res.size == 3
+    np.testing.assert_array_equal(res.offsets, [0, 2, 2, 3])
+    np.testing.assert_array_equal(res.mask, [False, True, False])
+    np.testing.assert_array_equal(res.values.offsets, [0, 1, 3, 6])
+    assert res.values.values.tobytes() == b"abcdef"
+    assert res.values.mask is None
+
+
+def test_read_arrays_rejects_invalid_parallel(qdbd_connection, table):
+    with pytest.raises(ValueError):
+        qdbnp.read_arrays(qdbd_connection, [table], parallel=0)
+
+
+def test_read_arrays_parallel_requires_pool(qdbd_connection, table):
+    with pytest.raises(ValueError):
+        qdbnp.read_arrays(qdbd_connection, [table], parallel=2)
+
+
+def _write_masked_doubles_and_integers(conn, table):
+    index = np.array(
+        [
+            np.datetime64("2017-01-01T00:00:00", "ns"),
+            np.datetime64("2017-01-01T00:00:01", "ns"),
+            np.datetime64("2017-01-01T00:00:02", "ns"),
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    doubles = ma.masked_array([1.0, 2.0, 3.0], mask=[False, True, False])
+    integers = np.array([10, 11, 12], dtype=np.int64)
+
+    qdbnp.write_arrays(
+        {
+            tslib._double_col_name(table): doubles,
+            tslib._int64_col_name(table): integers,
+        },
+        conn,
+        table,
+        index=index,
+        infer_types=False,
+        dtype={
+            tslib._double_col_name(table): np.dtype(np.float64),
+            tslib._int64_col_name(table): integers.dtype,
+        },
+    )
+
+    return (doubles, integers)
+
+
+def test_read_arrays_does_not_mask_columns_without_nulls(qdbd_connection, table):
+    (doubles, integers) = _write_masked_doubles_and_integers(qdbd_connection, table)
+
+    _, xs = qdbnp.read_arrays(
+        qdbd_connection,
+        [table],
+        column_names=[tslib._double_col_name(table), tslib._int64_col_name(table)],
+    )
+
+    doubles_ = xs[tslib._double_col_name(table)]
+    integers_ = xs[tslib._int64_col_name(table)]
+
+    assert ma.isMA(doubles_)
+    np.testing.assert_array_equal(ma.getmaskarray(doubles_), doubles.mask)
+
+    assert ma.isMA(integers_)
+    assert integers_.mask is ma.nomask
+    np.testing.assert_array_equal(integers_, integers)
+
+
+def test_read_arrays_can_return_plain_arrays(qdbd_connection, table):
+    (doubles, integers) = _write_masked_doubles_and_integers(qdbd_connection, table)
+
+    _, xs = qdbnp.read_arrays(
+        qdbd_connection,
+        [table],
+        column_names=[tslib._double_col_name(table), tslib._int64_col_name(table)],
+        masked=False,
+    )
+
+    doubles_ = xs[tslib._double_col_name(table)]
+    integers_ = xs[tslib._int64_col_name(table)]
+
+    assert not ma.isMA(doubles_)
+    assert not ma.isMA(integers_)
+
+    np.testing.assert_array_equal(doubles_, doubles.filled(np.nan))
+    np.testing.assert_array_equal(integers_, integers)
+
+
 def test_stream_arrays_reads_batched_results(qdbd_connection, table):
     index = np.array(
         [
@@ -596,6 +833,195 @@ def test_stream_arrays_reads_batched_results(qdbd_connection, table):
     )
 
 
+def test_stream_arrays_can_prefetch(qdbd_connection, table):
+    index = np.array(
+        [
+            np.datetime64("2017-01-01T00:00:00", "ns"),
+            np.datetime64("2017-01-01T00:00:01", "ns"),
+            np.datetime64("2017-01-01T00:00:02", "ns"),
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    doubles = np.array([1.0, 2.0, 3.0], dtype=np.float64)
+
+    qdbnp.write_arrays(
+        {tslib._double_col_name(table): doubles},
+        qdbd_connection,
+        table,
+        index=index,
+        infer_types=False,
+        dtype={tslib._double_col_name(table): doubles.dtype},
+    )
+
+    xs = list(
+        qdbnp.stream_arrays(
+            qdbd_connection,
+            [table],
+            batch_size=1,
+            column_names=[tslib._double_col_name(table)],
+            prefetch=2,
+        )
+    )
+
+    assert len(xs) == 3
+    np.testing.assert_array_equal(np.concatenate([idx for idx, _ in xs]), index)
+    np.testing.assert_array_equal(
+        ma.concatenate([batch[tslib._double_col_name(table)] for _, batch in xs]),
+        doubles,
+    )
+
+
+def test_stream_arrays_rejects_negative_prefetch(qdbd_connection, table):
+    with pytest.raises(TypeError):
+        list(qdbnp.stream_arrays(qdbd_connection, [table], prefetch=-1))
+
+
+def test_stream_arrays_can_return_categorical_strings(qdbd_connection, table):
+    index = tslib._generate_dates(np.datetime64("2017-01-01", "ns"), 5)
+    strings = ma.masked_array(
+        np.array(["foo", "bar", "foo", "", "bar"], dtype=np.dtype("U")),
+        mask=[False, False, False, True, False],
+    )
+
+    qdbnp.write_arrays(
+        {tslib._string_col_name(table): strings},
+        qdbd_connection,
+        table,
+        index=index,
+        infer_types=False,
+        dtype={tslib._string_col_name(table): strings.dtype},
+    )
+
+    ((idx, xs),) = qdbnp.stream_arrays(
+        qdbd_connection,
+        [table],
+        column_names=[tslib._string_col_name(table)],
+        strings="categorical",
+    )
+
+    x = xs[tslib._string_col_name(table)]
+    assert isinstance(x, qdbnp.Categorical)
+    assert x.codes.dtype == np.dtype("int32")
+    assert list(x.categories) == ["foo", "bar"]
+
+    np.testing.assert_array_equal(x.codes.data, [0, 1, 0, -1, 1])
+    np.testing.assert_array_equal(ma.getmaskarray(x.codes), strings.mask)
+
+
+def test_stream_arrays_rejects_invalid_strings(qdbd_connection, table):
+    with pytest.raises(quasardb.InvalidArgumentError):
+        list(qdbnp.stream_arrays(qdbd_connection, [table], strings="utf8"))
+
+
+def _write_dfs_with_tables(qdbpd_writes_fn, dfs_with_tables, qdbd_connection):
+    qdbpd_writes_fn(
+        [(table, df) for (_, _, df, table) in dfs_with_tables],
+        qdbd_connection,
+        infer_types=True,
+        push_mode=quasardb.WriterPushMode.Fast,
+    )
+
+    return [table for (_, _, _, table) in dfs_with_tables]
+
+
+def test_stream_arrays_can_return_table_codes(
+    qdbpd_writes_fn, dfs_with_tables, qdbd_connection, reader_batch_size
+):
+    tables = _write_dfs_with_tables(qdbpd_writes_fn, dfs_with_tables, qdbd_connection)
+
+    codes = [
+        xs["$table"]
+        for (_, xs) in qdbnp.stream_arrays(
+            qdbd_connection,
+            tables,
+            batch_size=reader_batch_size,
+            table_column="codes",
+        )
+    ]
+
+    expected = np.concatenate(
+        [np.full(len(df.index), i) for (i, (_, _, df, _)) in enumerate(dfs_with_tables)]
+    )
+
+    assert all(x.dtype == np.int32 for x in codes)
+    np.testing.assert_array_equal(np.concatenate(codes), expected)
+
+
+def test_stream_arrays_can_omit_table_column(qdbd_connection, table):
+    for _, xs in qdbnp.stream_arrays(qdbd_connection, [table], table_column="omit"):
+        assert "$table" not in xs
+
+
+def test_stream_arrays_can_group_by_table(
+    qdbpd_writes_fn, dfs_with_tables, qdbd_connection, reader_batch_size
+):
+    tables = _write_dfs_with_tables(qdbpd_writes_fn, dfs_with_tables, qdbd_connection)
+
+    idx_by_table = {}
+    for table_name, idx, xs in qdbnp.stream_arrays(
+        qdbd_connection, tables, batch_size=reader_batch_size, group_by_table=True
+    ):
+        assert "$table" not in xs
+        idx_by_table.setdefault(table_name, []).append(idx)
+
+    assert list(idx_by_table.keys()) == [table.get_name() for table in tables]
+
+    for _, _, df, table in dfs_with_tables:
+        np.testing.assert_array_equal(
+            np.concatenate(idx_by_table[table.get_name()]), df.index.to_numpy()
+        )
+
+
+def test_stream_arrow_returns_record_batches(qdbd_connection, table):
+    pa = pytest.importorskip("pyarrow")
+
+    index = np.array(
+        [
+            np.datetime64("2017-01-01T00:00:00", "ns"),
+            np.datetime64("2017-01-01T00:00:01", "ns"),
+            np.datetime64("2017-01-01T00:00:02", "ns"),
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    doubles = ma.masked_array(
+        np.array([1.0, 2.0, 3.0], dtype=np.float64), mask=[False, True, False]
+    )
+
+    qdbnp.write_arrays(
+        {tslib._double_col_name(table): doubles},
+        qdbd_connection,
+        table,
+        index=index,
+        infer_types=False,
+        dtype={tslib._double_col_name(table): doubles.dtype},
+    )
+
+    xs = list(
+        qdbnp.stream_arrow(
+            qdbd_connection,
+            [table],
+            batch_size=2,
+            column_names=[tslib._double_col_name(table)],
+        )
+    )
+
+    assert all(isinstance(x, pa.RecordBatch) for x in xs)
+    assert sum(x.num_rows for x in xs) == 3
+
+    result = pa.Table.from_batches(xs)
+    assert result.schema.field("$timestamp").type == pa.timestamp("ns")
+    assert result.schema.field(tslib._double_col_name(table)).type == pa.float64()
+
+    np.testing.assert_array_equal(
+        result.column("$timestamp").to_numpy(), index.astype("datetime64[ns]")
+    )
+    assert result.column(tslib._double_col_name(table)).to_pylist() == [
+        1.0,
+        None,
+        3.0,
+    ]
+
+
 ######
 #
 # Query tests
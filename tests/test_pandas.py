@@ -193,6 +193,72 @@ def test_multiple_dataframe(
     _assert_df_equal(df1, df2)
 
 
+def test_stream_dataframes_can_return_categorical_strings(qdbd_connection, table):
+    count = 100
+    idx = gen_idx(np.datetime64("2017-01-01", "ns"), count)
+    df1 = pd.DataFrame(
+        data={
+            "the_string": np.array(
+                [("content_" + str(item % 3)) for item in range(count)], "U"
+            )
+        },
+        index=idx,
+    )
+
+    qdbpd.write_dataframe(df1, qdbd_connection, table)
+
+    dfs = list(
+        qdbpd.stream_dataframes(
+            qdbd_connection,
+            [table],
+            batch_size=10,
+            column_names=["the_string"],
+            strings="categorical",
+        )
+    )
+
+    assert len(dfs) == 10
+    for df in dfs:
+        assert isinstance(df["the_string"].dtype, pd.CategoricalDtype)
+        assert len(df["the_string"].cat.categories) == 3
+
+    df2 = pd.concat(dfs)
+    np.testing.assert_array_equal(
+        df2["the_string"].astype(str).to_numpy(), df1["the_string"].to_numpy()
+    )
+
+
+def test_write_dataframes_parallel_aggregates_errors(
+    qdbd_connection, table, entry_name
+):
+    df = gen_df(np.datetime64("2017-01-01"), ROW_COUNT)
+
+    # Never created, so it cannot be written
+    missing = qdbd_connection.table(entry_name + "_missing")
+
+    with pytest.raises(qdbpd.WriteDataframesError) as e:
+        qdbpd.write_dataframes(
+            [(table, df), (missing, df)], qdbd_connection, parallel=2
+        )
+
+    assert list(e.value.errors.keys()) == [missing.get_name()]
+    assert [x.get_name() for x in e.value.tables] == [table.get_name()]
+
+    _assert_df_equal(df, qdbpd.read_dataframe(qdbd_connection, table))
+
+
+def test_write_dataframes_parallel_rejects_writer(qdbd_connection, table):
+    df = gen_df(np.datetime64("2017-01-01"), ROW_COUNT)
+
+    with pytest.raises(ValueError):
+        qdbpd.write_dataframes(
+            [(table, df)],
+            qdbd_connection,
+            parallel=2,
+            writer=qdbd_connection.writer(),
+        )
+
+
 # Pandas is a retard when it comes to null values, so make sure to just only
 # generate "full" arrays when we don't infer / convert array types.
 @pytest.mark.parametrize("sparsify", conftest.no_sparsify)
@@ -1,4 +1,7 @@
 # # pylint: disable=C0103,C0111,C0302,W0212
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import quasardb
 import numpy as np
@@ -297,6 +300,43 @@ def test_supports_all_column_types(
         raise RuntimeError("Unrecognized query handler: {}".format(query_handler))
 
 
+@pytest.mark.parametrize("query_handler", ["dict", "numpy"])
+def test_concurrent_queries_from_multiple_threads(
+    query_handler, qdbd_connection, table, intervals
+):
+    # Queries release the GIL while executing, which means multiple threads
+    # can be running queries against the same connection at the same time.
+    inserted_data = _insert_points(
+        "double", qdbd_connection, table, intervals=intervals
+    )
+    column_name = _column_name(table, "double")
+    query = 'SELECT "{}" FROM "{}"'.format(column_name, table.get_name())
+
+    thread_count = 4
+    results = [None] * thread_count
+    errors = []
+
+    def _run(i):
+        try:
+            if query_handler == "numpy":
+                results[i] = qdbd_connection.query_numpy(query)[0][1]
+            else:
+                results[i] = [row[column_name] for row in qdbd_connection.query(query)]
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(thread_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+    for xs in results:
+        np.testing.assert_array_equal(xs, inserted_data[1])
+
+
 @pytest.mark.skip(reason="Skip unless you're benching the pinned writer")
 @pytest.mark.parametrize("query_handler", ["dict", "numpy"])
 @pytest.mark.parametrize(
@@ -376,6 +416,424 @@ def test_returns_inserted_data_with_specific_select(qdbd_connection, table, inte
         assert row["the_double"] == v
 
 
+def test_query_can_return_tuples(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select $timestamp, "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    (names, rows) = qdbd_connection.query(query, format="tuples")
+
+    assert names == ["$timestamp", "the_double"]
+    assert len(rows) == 10
+
+    for row, v in zip(rows, inserted_double_data[1]):
+        assert isinstance(row, tuple)
+        assert row[1] == v
+
+    assert rows == [tuple(row.values()) for row in qdbd_connection.query(query)]
+
+
+def test_query_can_return_columns(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select $timestamp, "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    res = qdbd_connection.query(query, format="columns")
+
+    assert list(res.keys()) == ["$timestamp", "the_double"]
+    assert res["the_double"] == list(inserted_double_data[1])
+
+
+def test_query_rejects_invalid_format(qdbd_connection, table):
+    with pytest.raises(quasardb.InvalidArgumentError):
+        qdbd_connection.query('select * from "' + table.get_name() + '"', format="rows")
+
+
+def test_query_numpy_can_return_categorical_strings(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    inserted_string_data = _insert_string_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select "
+        + tslib._string_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    ((cname, (codes, categories)),) = qdbd_connection.query_numpy(
+        query, strings="categorical"
+    )
+
+    assert cname == "the_string"
+    assert codes.dtype == np.dtype("int32")
+    assert len(categories) == 10
+    np.testing.assert_array_equal(categories[codes], inserted_string_data[1])
+
+
+def test_query_numpy_can_return_plain_arrays(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    ((cname, masked),) = qdbd_connection.query_numpy(query)
+    ((_, plain),) = qdbd_connection.query_numpy(query, masked=False)
+
+    assert cname == "the_double"
+
+    # Nothing is null, so there is no need for a mask in either case
+    assert np.ma.isMA(masked)
+    assert masked.mask is np.ma.nomask
+
+    assert not np.ma.isMA(plain)
+    np.testing.assert_array_equal(plain, inserted_double_data[1])
+
+
+def test_stream_query_returns_chunks(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    (expected_idx, (expected,)) = qdbnp.query(qdbd_connection, query)
+    chunks = list(qdbnp.stream_query(qdbd_connection, query, chunk_rows=3))
+
+    assert [len(idx) for (idx, _) in chunks] == [3, 3, 3, 1]
+
+    # The generated index keeps counting across chunks
+    np.testing.assert_array_equal(
+        np.concatenate([idx for (idx, _) in chunks]), expected_idx
+    )
+    np.testing.assert_array_equal(
+        np.ma.concatenate([xs[0] for (_, xs) in chunks]), expected
+    )
+
+
+def test_stream_query_rejects_invalid_chunk_rows(qdbd_connection, table):
+    query = 'select * from "' + table.get_name() + '"'
+
+    with pytest.raises(ValueError):
+        next(qdbnp.stream_query(qdbd_connection, query, chunk_rows=0))
+
+
+def test_query_parallel_merges_slices_in_order(
+    qdbd_connection, qdbd_pool, table, intervals
+):
+    start_time = tslib._start_time(intervals)
+    (idx, values) = _insert_double_points(qdbd_connection, table, start_time, 10)
+
+    start = idx[0]
+    end = idx[-1] + np.timedelta64(1, "ns")
+    template = (
+        "select "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range({start}, {end})'
+    )
+
+    (res_idx, (res,)) = qdbnp.query_parallel(
+        qdbd_pool, template, start, end, (end - start) / 3, workers=3
+    )
+
+    np.testing.assert_array_equal(res_idx, np.arange(10))
+    np.testing.assert_array_equal(res, values)
+
+
+def test_query_parallel_computes_aggregates_per_slice(
+    qdbd_connection, qdbd_pool, table, intervals
+):
+    start_time = tslib._start_time(intervals)
+    (idx, _) = _insert_double_points(qdbd_connection, table, start_time, 10)
+
+    start = idx[0]
+    end = idx[-1] + np.timedelta64(1, "ns")
+    template = (
+        "select count("
+        + tslib._double_col_name(table)
+        + ') from "'
+        + table.get_name()
+        + '" in range({start}, {end})'
+    )
+
+    (_, (counts,)) = qdbnp.query_parallel(
+        qdbd_pool, template, start, end, (end - start) / 2
+    )
+
+    assert counts.sum() == 10
+
+    # A single connection only runs one slice at a time.
+    (_, (counts,)) = qdbnp.query_parallel(
+        qdbd_connection, template, start, end, (end - start) / 2, workers=1
+    )
+
+    assert counts.sum() == 10
+
+
+def test_query_parallel_rejects_invalid_workers(qdbd_connection, qdbd_pool, table):
+    template = 'select * from "' + table.get_name() + '" in range({start}, {end})'
+    start = np.datetime64("2017-01-01", "ns")
+    end = np.datetime64("2017-01-02", "ns")
+    delta = np.timedelta64(1, "h")
+
+    with pytest.raises(ValueError):
+        qdbnp.query_parallel(qdbd_pool, template, start, end, delta, workers=0)
+
+    with pytest.raises(ValueError):
+        qdbnp.query_parallel(qdbd_connection, template, start, end, delta, workers=2)
+
+
+def test_describe_query_returns_column_types(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select $timestamp, "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    res = qdbd_connection.describe_query(query)
+
+    assert res == [
+        ("$timestamp", quasardb.ColumnType.Timestamp, np.dtype("datetime64[ns]")),
+        ("the_double", quasardb.ColumnType.Double, np.dtype("float64")),
+    ]
+
+    # The dtypes are the ones query_numpy returns
+    for (cname, _, dtype), (cname_, xs) in zip(res, qdbd_connection.query_numpy(query)):
+        assert cname == cname_
+        assert xs.dtype == dtype
+
+    # Remembered per query text
+    assert qdbd_connection.describe_query(query) == res
+
+    qdbd_connection.clear_query_descriptions()
+    assert qdbd_connection.describe_query(query) == res
+
+    # A limit is appended to the query, which must not break a trailing semicolon.
+    assert qdbd_connection.describe_query(query + " ;") == res
+
+    # Nor a limit of the query itself.
+    assert qdbd_connection.describe_query(query + " LIMIT 5 ;") == res
+
+
+def test_describe_query_from_multiple_threads(qdbd_connection, table, intervals):
+    start_time = tslib._start_time(intervals)
+    _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select $timestamp, "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    qdbd_connection.clear_query_descriptions()
+
+    # The GIL is released while describing, so threads miss the cache concurrently.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        xs = list(
+            executor.map(lambda _: qdbd_connection.describe_query(query), range(32))
+        )
+
+    assert all(x == xs[0] for x in xs)
+    assert qdbd_connection.describe_query(query) == xs[0]
+
+
+def test_query_numpy_upcasts_mixed_numeric_columns(qdbd_connection, entry_name):
+    start_time = np.datetime64("2017-01-01", "ns")
+    idx = np.array(
+        [start_time + np.timedelta64(i, "s") for i in range(4)], dtype="datetime64[ns]"
+    )
+
+    t_int = qdbd_connection.table(entry_name + "_int")
+    t_int.create([quasardb.ColumnInfo(quasardb.ColumnType.Int64, "x")])
+    t_double = qdbd_connection.table(entry_name + "_double")
+    t_double.create([quasardb.ColumnInfo(quasardb.ColumnType.Double, "x")])
+
+    qdbnp.write_arrays(
+        {"x": np.array([1, 2, 3, 4], dtype=np.int64)}, qdbd_connection, t_int, index=idx
+    )
+    qdbnp.write_arrays(
+        {"x": np.array([0.5, 1.5, 2.5, 3.5])}, qdbd_connection, t_double, index=idx
+    )
+
+    query = 'select x from "{}", "{}"'.format(t_int.get_name(), t_double.get_name())
+    ((cname, xs),) = qdbd_connection.query_numpy(query)
+
+    # Rows of both tables end up in the same column, which would otherwise be read as
+    # the type of its first value.
+    assert cname == "x"
+    assert xs.dtype == np.dtype("float64")
+    np.testing.assert_array_equal(np.sort(xs), [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0])
+
+
+def test_query_arrow_upcasts_mixed_numeric_columns(qdbd_connection, entry_name):
+    pa = pytest.importorskip("pyarrow")
+
+    start_time = np.datetime64("2017-01-01", "ns")
+    idx = np.array(
+        [start_time + np.timedelta64(i, "s") for i in range(4)], dtype="datetime64[ns]"
+    )
+
+    t_int = qdbd_connection.table(entry_name + "_int")
+    t_int.create([quasardb.ColumnInfo(quasardb.ColumnType.Int64, "x")])
+    t_double = qdbd_connection.table(entry_name + "_double")
+    t_double.create([quasardb.ColumnInfo(quasardb.ColumnType.Double, "x")])
+
+    qdbnp.write_arrays(
+        {"x": np.array([1, 2, 3, 4], dtype=np.int64)}, qdbd_connection, t_int, index=idx
+    )
+    qdbnp.write_arrays(
+        {"x": np.array([0.5, 1.5, 2.5, 3.5])}, qdbd_connection, t_double, index=idx
+    )
+
+    query = 'select x from "{}", "{}"'.format(t_int.get_name(), t_double.get_name())
+    res = qdbd_connection.query_arrow(query)
+
+    # Same type as query_numpy() returns, rather than the type of the first value.
+    assert res.schema.field("x").type == pa.float64()
+    np.testing.assert_array_equal(
+        np.sort(res.column("x").to_numpy()), [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+    )
+
+
+def test_query_arrow_returns_record_batch(qdbd_connection, table, intervals):
+    pa = pytest.importorskip("pyarrow")
+
+    start_time = tslib._start_time(intervals)
+    inserted_double_data = _insert_double_points(qdbd_connection, table, start_time, 10)
+    query = (
+        "select $timestamp, "
+        + tslib._double_col_name(table)
+        + ' from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    res = qdbd_connection.query_arrow(query)
+
+    assert isinstance(res, pa.RecordBatch)
+    assert res.num_rows == 10
+    assert res.schema.field("$timestamp").type == pa.timestamp("ns")
+    assert res.schema.field("the_double").type == pa.float64()
+
+    np.testing.assert_array_equal(
+        res.column("$timestamp").to_numpy(), inserted_double_data[0]
+    )
+    np.testing.assert_array_equal(
+        res.column("the_double").to_numpy(), inserted_double_data[1]
+    )
+
+
+def test_query_arrow_returns_empty_record_batch(qdbd_connection, table):
+    pa = pytest.importorskip("pyarrow")
+
+    res = qdbd_connection.query_arrow(
+        'select * from "' + table.get_name() + '" in range(2016-01-01 , 2016-12-12)'
+    )
+
+    assert isinstance(res, pa.RecordBatch)
+    assert res.num_rows == 0
+
+
+def _query_arrays(qdbd_connection, table, intervals, points):
+    start_time = tslib._start_time(intervals)
+    _insert_double_points(qdbd_connection, table, start_time, points)
+
+    # The values of each row, aggregated into a single array per table.
+    query = (
+        "select array_agg("
+        + tslib._double_col_name(table)
+        + ') from "'
+        + table.get_name()
+        + '" in range('
+        + str(tslib._start_year(intervals))
+        + ", +100d)"
+    )
+
+    try:
+        xs = qdbd_connection.query_numpy(query)
+    except quasardb.InvalidQueryError:
+        pytest.skip("Server does not support array aggregation")
+
+    return (query, xs)
+
+
+def test_query_numpy_returns_arrays_as_list_columns(qdbd_connection, table, intervals):
+    (query, xs) = _query_arrays(qdbd_connection, table, intervals, 10)
+    ((_, values),) = xs
+
+    res = qdbnp._ensure_column(values)
+    assert isinstance(res, qdbnp.ListColumn)
+    assert res.size == 1
+    np.testing.assert_array_equal(res.offsets, [0, 10])
+    assert res.values.dtype == np.dtype("float64")
+    assert res.values.size == 10
+
+    (_, (res_,)) = qdbnp.query(qdbd_connection, query)
+    assert isinstance(res_, qdbnp.ListColumn)
+    np.testing.assert_array_equal(res_.values, res.values)
+
+
+def test_query_arrow_returns_arrays_as_lists(qdbd_connection, table, intervals):
+    pa = pytest.importorskip("pyarrow")
+
+    (query, xs) = _query_arrays(qdbd_connection, table, intervals, 10)
+    ((cname, values),) = xs
+
+    res = qdbd_connection.query_arrow(query)
+
+    assert isinstance(res, pa.RecordBatch)
+    assert res.num_rows == 1
+    assert res.schema.field(cname).type == pa.large_list(pa.float64())
+
+    np.testing.assert_array_equal(
+        res.column(cname).flatten().to_numpy(),
+        qdbnp._ensure_column(values).values,
+    )
+
+
 def test_returns_count_data_with_count_select(qdbd_connection, table, intervals):
     start_time = tslib._start_time(intervals)
     _ = _insert_double_points(qdbd_connection, table, start_time, 10)
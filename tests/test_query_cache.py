@@ -0,0 +1,111 @@
+# pylint: disable=C0103,C0111,C0302,W0212
+import time
+
+import numpy as np
+import pytest
+import quasardb
+import quasardb.numpy as qdbnp
+import quasardb.pandas as qdbpd
+from quasardb import metrics
+from quasardb.query_cache import QueryCache, normalize, tables_of
+
+
+def test_normalize_collapses_whitespace_outside_quotes():
+    q = "  select  *\n  from \"my  table\"   where x = 'a  b'  "
+    assert normalize(q) == "select * from \"my  table\" where x = 'a  b'"
+
+
+def test_tables_of_query():
+    assert tables_of('select * from "a""b", c') == ('a"b', "c")
+    assert tables_of("select * from t where s = 'from other'") == ("t",)
+    assert tables_of("select * from find(tag='x')") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = QueryCache(max_bytes=4096, ttl=None)
+
+    for i in range(10):
+        cache.cached(None, "select {}".format(i), lambda: list(range(32)))
+
+    assert 0 < len(cache) < 10
+    assert cache.nbytes <= 4096
+
+    # The most recent entry is still cached, and doesn't need computing again.
+    cache.cached(None, "select 9", lambda: 1 / 0)
+
+
+def test_cache_expires_entries():
+    cache = QueryCache(ttl=0.1)
+
+    assert cache.cached(None, "select 1", lambda: 1) == 1
+    assert cache.cached(None, "select 1", lambda: 2) == 1
+
+    time.sleep(0.2)
+    assert cache.cached(None, "select 1", lambda: 3) == 3
+
+
+def test_query_cache_records_hits_and_misses(
+    qdbpd_write_fn, df_with_table, qdbd_connection
+):
+    (_, _, df, table) = df_with_table
+    qdbpd_write_fn(df, qdbd_connection, table)
+
+    cache = QueryCache()
+    q = 'select * from "{}"'.format(table.get_name())
+
+    with metrics.Measure() as measure:
+        df1 = qdbpd.query(qdbd_connection, q, cache=cache)
+        df2 = qdbpd.query(qdbd_connection, q + "  ", cache=cache)
+
+        m = measure.get_counters()
+        assert m["query_cache_miss"] == 1
+        assert m["query_cache_hit"] == 1
+
+    assert df1.equals(df2)
+
+
+def test_query_cache_hit_with_index(qdbpd_write_fn, df_with_table, qdbd_connection):
+    (_, _, df, table) = df_with_table
+    qdbpd_write_fn(df, qdbd_connection, table)
+
+    cache = QueryCache()
+    q = 'select * from "{}"'.format(table.get_name())
+
+    df1 = qdbpd.query(qdbd_connection, q, index="$timestamp", cache=cache)
+    df2 = qdbpd.query(qdbd_connection, q, index="$timestamp", cache=cache)
+    assert df1.equals(df2)
+
+    # An integer index resolves the same column every time as well.
+    (idx1, xs1) = qdbnp.query(qdbd_connection, q, index=0, cache=cache)
+    (idx2, xs2) = qdbnp.query(qdbd_connection, q, index=0, cache=cache)
+    np.testing.assert_array_equal(idx1, idx2)
+    assert len(xs1) == len(xs2) == len(df1.columns)
+
+
+def test_query_cache_invalidates_on_firehose(
+    qdbpd_write_fn, df_with_table, qdbd_connection
+):
+    (_, _, df, table) = df_with_table
+
+    cache = QueryCache(ttl=None, invalidate=True, poll_interval=0)
+    q = 'select count($timestamp) from "{}"'.format(table.get_name())
+
+    before = cache.query(qdbd_connection, q)
+    assert cache.query(qdbd_connection, q) is before
+
+    qdbpd_write_fn(df, qdbd_connection, table)
+
+    # The firehose is not updated synchronously with the write.
+    deadline = time.monotonic() + 10
+    after = cache.query(qdbd_connection, q)
+    while after is before and time.monotonic() < deadline:
+        time.sleep(0.5)
+        after = cache.query(qdbd_connection, q)
+
+    assert after is not before
+    assert after == qdbd_connection.query(q)
+
+
+def test_query_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        QueryCache(max_bytes=0)
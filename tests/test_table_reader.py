@@ -1,7 +1,9 @@
 # pylint: disable=C0103,C0111,C0302,W0212
 import pytest
 import quasardb
+import conftest
 import numpy as np
+import pandas as pd
 
 
 def test_can_open_reader(qdbd_connection, table):
@@ -42,6 +44,22 @@ def test_can_set_batch_size_as_kwarg(qdbd_connection, table):
         assert reader.get_batch_size() == 128
 
 
+def test_reader_does_not_prefetch_by_default(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        assert reader.get_prefetch() == 0
+
+
+def test_can_set_prefetch_as_kwarg(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names, prefetch=2) as reader:
+        assert reader.get_prefetch() == 2
+        rows = list(reader)
+        assert len(rows) == 0
+
+
 def test_reader_returns_dicts(qdbpd_write_fn, df_with_table, qdbd_connection):
     (ctype, dtype, df, table) = df_with_table
 
@@ -123,3 +141,472 @@ def test_reader_can_iterate_batches(
 
             for column_name in column_names:
                 assert len(row[column_name]) == batch_size
+
+
+def test_reader_does_not_limit_batch_bytes_by_default(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        assert reader.get_max_batch_bytes() == 0
+
+
+def test_can_set_max_batch_bytes_as_kwarg(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names, max_batch_bytes=2**20) as reader:
+        assert reader.get_max_batch_bytes() == 2**20
+        rows = list(reader)
+        assert len(rows) == 0
+
+
+def test_reader_sizes_batches_by_max_batch_bytes(
+    qdbpd_write_fn, df_with_table, qdbd_connection, row_count
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    assert row_count % 4 == 0
+    batch_size = int(row_count / 4)
+    column_names = list(column.name for column in table.list_columns())
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        expected = list(reader)
+
+    # Every row exceeds a budget of a single byte, so after the first batch we
+    # only ever get a single row at a time.
+    with qdbd_connection.reader(
+        table_names, batch_size=batch_size, max_batch_bytes=1
+    ) as reader:
+        actual = list(reader)
+
+    assert len(actual[0]["$timestamp"]) == batch_size
+    assert all(len(x["$timestamp"]) == 1 for x in actual[1:])
+    assert len(actual) == 1 + row_count - batch_size
+
+    np.testing.assert_array_equal(
+        np.concatenate([x["$timestamp"] for x in actual]),
+        np.concatenate([x["$timestamp"] for x in expected]),
+    )
+
+    for column_name in column_names:
+        np.testing.assert_array_equal(
+            np.ma.concatenate([x[column_name] for x in actual]),
+            np.ma.concatenate([x[column_name] for x in expected]),
+        )
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 4])
+def test_reader_can_prefetch_batches(
+    qdbpd_write_fn, df_with_table, qdbd_connection, row_count, prefetch
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    assert row_count % 4 == 0
+    batch_size = int(row_count / 4)
+    column_names = list(column.name for column in table.list_columns())
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names, batch_size=batch_size) as reader:
+        expected = list(reader)
+
+    with qdbd_connection.reader(
+        table_names, batch_size=batch_size, prefetch=prefetch
+    ) as reader:
+        actual = list(reader)
+
+    assert len(actual) == len(expected) == 4
+
+    for lhs, rhs in zip(actual, expected):
+        np.testing.assert_array_equal(lhs["$timestamp"], rhs["$timestamp"])
+
+        for column_name in column_names:
+            np.testing.assert_array_equal(lhs[column_name], rhs[column_name])
+
+
+def test_reader_can_close_while_prefetching(
+    qdbpd_write_fn, df_with_table, qdbd_connection
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    # Only consume the first batch: closing the reader must stop the background
+    # thread and release all batches that were fetched but never consumed.
+    with qdbd_connection.reader(table_names, batch_size=1, prefetch=4) as reader:
+        for row in reader:
+            assert len(row["$timestamp"]) == 1
+            break
+
+
+def _array_owner(xs):
+    # Follows the chain of views, up to the object that owns the memory
+    while isinstance(xs, np.ndarray) and xs.base is not None:
+        xs = xs.base
+
+    return xs
+
+
+def test_reader_does_not_zero_copy_by_default(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        assert reader.get_zero_copy() is False
+
+
+def test_reader_returns_masked_arrays_by_default(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        assert reader.get_masked() is True
+
+    with qdbd_connection.reader(table_names, masked=False) as reader:
+        assert reader.get_masked() is False
+
+
+def test_reader_can_zero_copy_numeric_columns(
+    qdbpd_write_fn, df_with_table, qdbd_connection, row_count
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    assert row_count % 4 == 0
+    batch_size = int(row_count / 4)
+    column_names = list(column.name for column in table.list_columns())
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names, batch_size=batch_size) as reader:
+        expected = list(reader)
+
+    with qdbd_connection.reader(
+        table_names, batch_size=batch_size, zero_copy=True
+    ) as reader:
+        assert reader.get_zero_copy() is True
+        actual = list(reader)
+
+    assert len(actual) == len(expected) == 4
+
+    # The batches outlive the reader, they are released once the arrays are collected.
+    for lhs, rhs in zip(actual, expected):
+        np.testing.assert_array_equal(lhs["$timestamp"], rhs["$timestamp"])
+
+        for column_name in column_names:
+            np.testing.assert_array_equal(lhs[column_name], rhs[column_name])
+
+            if lhs[column_name].dtype in (np.dtype("int64"), np.dtype("float64")):
+                # A view over the native batch, rather than an array of its own
+                assert not isinstance(_array_owner(lhs[column_name]), np.ndarray)
+                assert isinstance(_array_owner(rhs[column_name]), np.ndarray)
+
+
+def test_reader_zero_copy_arrays_outlive_connection(
+    qdbpd_write_fn, qdbd_settings, qdbd_connection, table
+):
+    idx = np.array(
+        [np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s") for i in range(10)]
+    )
+    doubles = np.random.uniform(size=10)
+    df = pd.DataFrame(index=idx, data={"the_double": doubles})
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+
+    conn = conftest.create_qdbd_connection(qdbd_settings)
+    with conn.reader(
+        [table.get_name()], column_names=["the_double"], zero_copy=True
+    ) as reader:
+        xs = list(reader)
+
+    # The views are read-only, as they point into memory owned by the client.
+    assert xs[0]["the_double"].flags.writeable is False
+    with pytest.raises(ValueError):
+        xs[0]["the_double"][0] = 0.0
+
+    # Closing the connection defers releasing the batch until the views are gone.
+    conn.close()
+    np.testing.assert_array_equal(xs[0]["the_double"], doubles)
+
+
+def test_reader_can_read_all_batches_at_once(
+    qdbpd_write_fn, df_with_table, qdbd_connection, row_count
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    assert row_count % 4 == 0
+    batch_size = int(row_count / 4)
+    column_names = list(column.name for column in table.list_columns())
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names, batch_size=batch_size) as reader:
+        expected = list(reader)
+
+    with qdbd_connection.reader(table_names, batch_size=batch_size) as reader:
+        actual = reader.read_all()
+
+    assert len(expected) == 4
+    assert isinstance(actual, dict)
+    assert len(actual["$timestamp"]) == row_count
+
+    np.testing.assert_array_equal(
+        actual["$timestamp"], np.concatenate([x["$timestamp"] for x in expected])
+    )
+
+    for column_name in column_names:
+        assert isinstance(actual[column_name], np.ma.core.MaskedArray)
+        np.testing.assert_array_equal(
+            actual[column_name],
+            np.ma.concatenate([x[column_name] for x in expected]),
+        )
+
+
+def test_reader_read_all_returns_empty_index(qdbd_connection, table):
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        xs = reader.read_all()
+
+    assert list(xs.keys()) == ["$timestamp"]
+    assert len(xs["$timestamp"]) == 0
+
+
+def test_reader_can_read_into_preallocated_arrays(
+    qdbpd_write_fn, qdbd_connection, table
+):
+    row_count = 100
+    idx = np.array(
+        [
+            np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s")
+            for i in range(row_count)
+        ]
+    )
+    doubles = np.random.uniform(size=row_count)
+    doubles[::3] = np.nan
+    df = pd.DataFrame(index=idx, data={"the_double": doubles})
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+
+    timestamps = np.zeros(row_count * 2, dtype="datetime64[ns]")
+    values = np.zeros(row_count * 2, dtype=np.float64)
+    validity = np.zeros(row_count * 2, dtype=np.bool_)
+
+    with qdbd_connection.reader(
+        [table.get_name()], column_names=["the_double"], batch_size=30
+    ) as reader:
+        n = reader.read_into(
+            {"$timestamp": timestamps, "the_double": (values, validity)}
+        )
+
+    assert n == row_count
+    np.testing.assert_array_equal(timestamps[:n], idx)
+    np.testing.assert_array_equal(validity[:n], ~np.isnan(doubles))
+    np.testing.assert_array_equal(values[:n][validity[:n]], doubles[~np.isnan(doubles)])
+
+    # Anything past the rows read is left untouched
+    assert not validity[n:].any()
+
+
+def test_reader_read_into_rejects_too_small_arrays(
+    qdbpd_write_fn, qdbd_connection, table
+):
+    idx = np.array(
+        [np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s") for i in range(10)]
+    )
+    df = pd.DataFrame(index=idx, data={"the_double": np.random.uniform(size=10)})
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+
+    with qdbd_connection.reader([table.get_name()]) as reader:
+        with pytest.raises(quasardb.OutOfBoundsError):
+            reader.read_into({"the_double": np.zeros(5, dtype=np.float64)})
+
+
+def test_reader_read_into_rejects_incompatible_dtype(
+    qdbpd_write_fn, qdbd_connection, table
+):
+    idx = np.array(
+        [np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s") for i in range(10)]
+    )
+    df = pd.DataFrame(index=idx, data={"the_double": np.random.uniform(size=10)})
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+
+    with qdbd_connection.reader([table.get_name()]) as reader:
+        with pytest.raises(quasardb.IncompatibleTypeError):
+            reader.read_into({"the_double": np.zeros(10, dtype=np.int64)})
+
+
+def test_reader_has_no_checkpoint_before_reading(qdbd_connection, table):
+    with qdbd_connection.reader([table.get_name()]) as reader:
+        assert reader.checkpoint() is None
+
+
+def test_reader_can_resume_from_checkpoint(
+    qdbpd_write_fn, df_with_table, qdbd_connection, row_count
+):
+    (ctype, dtype, df, table) = df_with_table
+
+    assert row_count % 4 == 0
+    batch_size = int(row_count / 4)
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False, dtype=dtype)
+
+    table_names = [table.get_name()]
+
+    with qdbd_connection.reader(table_names) as reader:
+        expected = reader.read_all()
+
+    # Moving on to the second batch marks the first one as emitted.
+    with qdbd_connection.reader(table_names, batch_size=batch_size) as reader:
+        xs = iter(reader)
+        first = next(xs)
+        next(xs)
+
+        checkpoint = reader.checkpoint()
+
+    assert checkpoint["table"] == table.get_name()
+    assert checkpoint["timestamp"] == first["$timestamp"][-1]
+
+    with qdbd_connection.reader(
+        table_names, batch_size=batch_size, resume_from=checkpoint
+    ) as reader:
+        rest = reader.read_all()
+
+    np.testing.assert_array_equal(
+        np.concatenate([first["$timestamp"], rest["$timestamp"]]),
+        expected["$timestamp"],
+    )
+
+
+def _write_tables_for_resume(qdbpd_write_fn, qdbd_connection, entry_name, n):
+    idx = np.array(
+        [np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s") for i in range(10)]
+    )
+
+    ret = []
+    for i in range(n):
+        table = conftest._create_table(qdbd_connection, "{}_{}".format(entry_name, i))
+        df = pd.DataFrame(index=idx, data={"the_double": np.random.uniform(size=10)})
+        qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+        ret.append(table.get_name())
+
+    return ret
+
+
+def _rows_per_table(xs):
+    (tables, counts) = np.unique(xs["$table"].astype(str), return_counts=True)
+    return {str(t): int(c) for (t, c) in zip(tables, counts)}
+
+
+def test_reader_can_resume_from_checkpoint_over_multiple_tables(
+    qdbpd_write_fn, qdbd_connection, entry_name
+):
+    table_names = _write_tables_for_resume(
+        qdbpd_write_fn, qdbd_connection, entry_name, 3
+    )
+
+    with qdbd_connection.reader(table_names) as reader:
+        expected = _rows_per_table(reader.read_all())
+
+    assert expected == {x: 10 for x in table_names}
+
+    # Stop somewhere in the middle, after rows of more than one table were emitted.
+    with qdbd_connection.reader(table_names, batch_size=4) as reader:
+        xs = iter(reader)
+        emitted = [next(xs) for _ in range(4)]
+        next(xs)
+
+        checkpoint = reader.checkpoint()
+
+    # Only tables of which all rows were emitted are finished.
+    first = _rows_per_table(
+        {"$table": np.concatenate([x["$table"] for x in emitted]).astype(str)}
+    )
+    assert checkpoint["table"] not in checkpoint["finished"]
+    for x in checkpoint["finished"]:
+        assert first[x] == 10
+
+    with qdbd_connection.reader(
+        table_names, batch_size=4, resume_from=checkpoint
+    ) as reader:
+        rest = _rows_per_table(reader.read_all())
+
+    for x in table_names:
+        assert first.get(x, 0) + rest.get(x, 0) == 10
+
+
+def test_reader_resume_reads_tables_not_marked_finished(
+    qdbpd_write_fn, qdbd_connection, entry_name
+):
+    table_names = _write_tables_for_resume(
+        qdbpd_write_fn, qdbd_connection, entry_name, 3
+    )
+
+    # A checkpoint in the second table which doesn't list the first one as finished, e.g.
+    # because the tables were emitted in another order: nothing of it may be dropped.
+    checkpoint = {
+        "table": table_names[1],
+        "timestamp": np.datetime64("2017-01-01T00:00:05", "ns"),
+        "rows": 1,
+        "finished": [],
+    }
+
+    with qdbd_connection.reader(table_names, resume_from=checkpoint) as reader:
+        rest = _rows_per_table(reader.read_all())
+
+    assert rest == {table_names[0]: 10, table_names[1]: 4, table_names[2]: 10}
+
+
+def test_reader_rejects_checkpoint_of_unknown_table(qdbd_connection, table):
+    checkpoint = {
+        "table": "this_table_does_not_exist",
+        "timestamp": np.datetime64(0, "ns"),
+    }
+
+    with pytest.raises(quasardb.InvalidArgumentError):
+        with qdbd_connection.reader([table.get_name()], resume_from=checkpoint):
+            pass
+
+
+def test_reader_can_filter_rows(qdbpd_write_fn, qdbd_connection, table):
+    row_count = 100
+    idx = np.array(
+        [
+            np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s")
+            for i in range(row_count)
+        ]
+    )
+    ints = np.arange(row_count, dtype=np.int64)
+    strings = np.array(["a", "b", "c", "d"] * (row_count // 4), dtype=np.str_)
+    df = pd.DataFrame(index=idx, data={"the_int64": ints, "the_string": strings})
+
+    qdbpd_write_fn(df, qdbd_connection, table, infer_types=False)
+
+    with qdbd_connection.reader(
+        [table.get_name()],
+        column_names=["the_int64", "the_string"],
+        batch_size=30,
+        filter=[("the_int64", ">=", 50), ("the_string", "in", ["a", "c"])],
+    ) as reader:
+        xs = reader.read_all()
+
+    expected = (ints >= 50) & np.isin(strings, ["a", "c"])
+
+    np.testing.assert_array_equal(xs["$timestamp"], idx[expected])
+    np.testing.assert_array_equal(xs["the_int64"], ints[expected])
+    np.testing.assert_array_equal(xs["the_string"], strings[expected])
+
+
+def test_reader_filter_rejects_unknown_operator(qdbd_connection, table):
+    with pytest.raises(quasardb.InvalidArgumentError):
+        qdbd_connection.reader([table.get_name()], filter=[("the_int64", "~", 1)])
@@ -2,10 +2,12 @@
 from builtins import range as xrange, int as long  # pylint: disable=W0622
 from functools import reduce  # pylint: disable=W0622
 import datetime
+import threading
 import test_table as tslib
 from time import sleep
 
 import pytest
+import conftest
 import quasardb
 import numpy as np
 import quasardb.numpy as qdbnp
@@ -340,6 +342,199 @@ def test_write_through_flag_throws_when_incorrect(qdbd_connection, table):
         writer.push(write_through="wrong!")
 
 
+def test_concurrent_push_from_multiple_threads(qdbd_connection, entry_name):
+    # One writer per thread, each pushing to its own table. The native push runs
+    # without the GIL, so this exercises the pushes actually overlapping.
+    thread_count = 4
+    row_count = 10000
+
+    tables = []
+    for i in range(thread_count):
+        t = qdbd_connection.table("{}_{}".format(entry_name, i))
+        t.create([quasardb.ColumnInfo(quasardb.ColumnType.Int64, "the_int64")])
+        tables.append(t)
+
+    idx = np.array(
+        [
+            np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s")
+            for i in range(row_count)
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    values = np.arange(row_count, dtype=np.int64)
+    errors = []
+
+    def _push(table):
+        try:
+            qdbnp.write_arrays(
+                {"the_int64": values},
+                qdbd_connection,
+                table,
+                index=idx,
+                writer=qdbd_connection.writer(),
+            )
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_push, args=(t,)) for t in tables]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+
+    for t in tables:
+        idx_, xs = _read_column(qdbd_connection, t, "the_int64")
+        np.testing.assert_array_equal(idx_, idx)
+        np.testing.assert_array_equal(xs, values)
+
+
+def _int64_writer_data(table, idx, values):
+    data = quasardb.WriterData()
+    data.append(
+        table, idx, [np.ma.masked_array(values, mask=np.zeros(len(values), bool))]
+    )
+    return data
+
+
+def _int64_data(count):
+    idx = tslib._generate_dates(np.datetime64("2017-01-01", "ns"), count)
+    values = np.random.randint(-100, 100, count).astype(np.int64)
+    return (idx, values)
+
+
+def _int64_table(conn, name):
+    t = conn.table(name)
+    t.create([quasardb.ColumnInfo(quasardb.ColumnType.Int64, "the_int64")])
+    return t
+
+
+def test_push_nowait_returns_future(qdbd_connection, entry_name):
+    table = _int64_table(qdbd_connection, entry_name)
+    idx, values = _int64_data(100)
+
+    writer = qdbd_connection.writer()
+    future = writer.push_nowait(_int64_writer_data(table, idx, values))
+    assert isinstance(future, quasardb.WriterPushFuture)
+
+    future.result()
+    assert future.done() is True
+
+    writer.flush()
+
+    idx_, xs = _read_column(qdbd_connection, table, "the_int64")
+    np.testing.assert_array_equal(idx_, idx)
+    np.testing.assert_array_equal(xs, values)
+
+
+@pytest.mark.parametrize("max_pending", [1, 4])
+def test_push_nowait_preserves_order_under_backpressure(
+    qdbd_connection, entry_name, max_pending
+):
+    table = _int64_table(qdbd_connection, entry_name)
+    batch_count = 8
+    batch_size = 1000
+
+    idx = np.array(
+        [
+            np.datetime64("2017-01-01", "ns") + np.timedelta64(i, "s")
+            for i in range(batch_count * batch_size)
+        ],
+        dtype=np.dtype("datetime64[ns]"),
+    )
+    values = np.arange(batch_count * batch_size, dtype=np.int64)
+
+    writer = qdbd_connection.writer(max_pending=max_pending)
+
+    futures = []
+    for i in range(0, len(idx), batch_size):
+        data = _int64_writer_data(
+            table, idx[i : i + batch_size], values[i : i + batch_size]
+        )
+        futures.append(writer.push_nowait(data))
+
+    writer.close()
+
+    for future in futures:
+        assert future.done() is True
+        future.result()
+
+    idx_, xs = _read_column(qdbd_connection, table, "the_int64")
+    np.testing.assert_array_equal(idx_, idx)
+    np.testing.assert_array_equal(xs, values)
+
+
+def test_push_nowait_raises_after_close(qdbd_connection, entry_name):
+    table = _int64_table(qdbd_connection, entry_name)
+    idx, values = _int64_data(10)
+
+    writer = qdbd_connection.writer()
+    writer.close()
+
+    with pytest.raises(quasardb.InvalidArgumentError):
+        writer.push_nowait(_int64_writer_data(table, idx, values))
+
+    # Regular pushes are not affected
+    writer.push(_int64_writer_data(table, idx, values))
+
+
+def test_push_nowait_survives_closing_the_connection(
+    qdbd_settings, qdbd_connection, entry_name
+):
+    table = _int64_table(qdbd_connection, entry_name)
+    idx, values = _int64_data(1000)
+
+    conn = conftest.create_qdbd_connection(qdbd_settings)
+    writer = conn.writer(max_pending=4)
+
+    futures = [
+        writer.push_nowait(
+            _int64_writer_data(
+                conn.table(entry_name), idx[i : i + 100], values[i : i + 100]
+            )
+        )
+        for i in range(0, len(idx), 100)
+    ]
+
+    # Pushes still queued keep the handle alive until they have been performed.
+    conn.close()
+    writer.close()
+
+    for future in futures:
+        future.result()
+
+    idx_, xs = _read_column(qdbd_connection, table, "the_int64")
+    np.testing.assert_array_equal(idx_, idx)
+    np.testing.assert_array_equal(xs, values)
+
+
+@pytest.mark.parametrize("staging_threads", [1, 0, 3])
+def test_push_with_staging_threads(qdbd_connection, table, staging_threads):
+    # Every column (and the index) is converted by a separate staging task, with
+    # 0 meaning one thread per CPU.
+    intervals = tslib._generate_dates(np.datetime64("2017-01-01", "ns"), 10000)
+    data = _generate_data(len(intervals))
+    (doubles, integers, blobs, strings, timestamps, symbols) = data
+
+    qdbnp.write_arrays(
+        {
+            tslib._double_col_name(table): doubles,
+            tslib._blob_col_name(table): blobs,
+            tslib._string_col_name(table): strings,
+            tslib._int64_col_name(table): integers,
+            tslib._ts_col_name(table): timestamps,
+            tslib._symbol_col_name(table): symbols,
+        },
+        qdbd_connection,
+        table,
+        index=intervals,
+        writer=qdbd_connection.writer(staging_threads=staging_threads),
+    )
+
+    _assert_results(qdbd_connection, table, intervals, data)
+
+
 # generative tests
 
 